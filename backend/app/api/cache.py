@@ -0,0 +1,148 @@
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from app.api.responses import JSON, serializer
+from app.services.entity_versions import entity_versions
+from app.services.response_cache import response_cache
+
+# Clients may keep responses but must revalidate them (cheaply, via ETag) before reuse
+CACHE_CONTROL = "no-cache"
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header (other than *) against an ETag."""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _validators(entities: List[Hashable], media_type: Optional[str] = None) -> Tuple[int, float, Dict[str, str]]:
+    """Return (version, modified time, validator headers) of a response built from entities."""
+    version, modified = entity_versions.version(entities)
+    etag = f"{entity_versions.epoch}-{version}"
+    headers = {
+        "Last-Modified": formatdate(modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+    if media_type is not None:
+        # Each representation of a negotiated route needs its own strong ETag
+        if media_type != JSON:
+            etag = f"{etag}-{media_type.rsplit('/', 1)[-1]}"
+        headers["Vary"] = "Accept"
+    headers["ETag"] = f'"{etag}"'
+    return version, modified, headers
+
+
+def _not_modified(
+    request: Request,
+    etag: str,
+    modified: float,
+    exists: Optional[Callable[[], bool]] = None,
+) -> bool:
+    """
+    Whether the client's copy is current: If-None-Match, or without one If-Modified-Since.
+
+    If-None-Match: * matches any current representation, so it only counts
+    when exists confirms there is one; a missing entity must still get its 404.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return exists is not None and exists()
+        return _matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # Last-Modified has whole-second precision
+    return int(modified) <= since
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    entities: List[Hashable],
+    media_type: Optional[str] = None,
+    exists: Optional[Callable[[], bool]] = None,
+) -> Optional[Response]:
+    """
+    Validate a GET against the versions of the entities its response is built from.
+
+    Sets ETag, Last-Modified and Cache-Control on the response. If the client's
+    copy is current, returns a 304 to send instead, before any service call.
+
+    Args:
+        request: The incoming request
+        response: The endpoint's response, which receives the validators
+        entities: Entity keys (see app.services.entity_versions)
+        media_type: Negotiated media type, for routes that serve several
+            formats (see app.api.responses.negotiate)
+        exists: Whether the requested entity exists, checked only for
+            If-None-Match: *. Without it that header never yields a 304 and
+            the response is built normally
+
+    Returns:
+        A 304 Response, or None to build the response normally
+    """
+    _, modified, headers = _validators(entities, media_type)
+    response.headers.update(headers)
+    if _not_modified(request, headers["ETag"], modified, exists):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def cached_json(
+    request: Request,
+    route: str,
+    params: Dict[str, Any],
+    entities: List[Hashable],
+    compute: Callable[[], Any],
+    model: Any,
+    not_found: str,
+) -> Response:
+    """
+    Serve a JSON response from the response cache, computing it on a miss.
+
+    The client's copy is revalidated first (see conditional_get); for
+    If-None-Match: * that waits until the response is known to exist. A cache hit
+    returns the stored bytes directly, skipping both the service call and
+    Pydantic. The X-Cache header reports HIT, STALE or MISS.
+
+    Args:
+        request: The incoming request
+        route: Route name (a response_cache.ROUTE_TTL key)
+        params: The endpoint's query parameters
+        entities: Entity keys the response is built from
+        compute: Service call returning the result, or None when not found
+        model: Response model the result is serialized with (and validated
+            with, unless compute already returns a model instance)
+        not_found: 404 detail when compute returns None
+
+    Returns:
+        JSON Response (304 when the client's copy is current)
+    """
+    version, modified, headers = _validators(entities)
+    adapter = serializer(model)
+
+    def serialize() -> Optional[bytes]:
+        result = compute()
+        if result is None:
+            return None
+        # Models the services built are trusted; only plain dicts are validated
+        if not isinstance(result, BaseModel):
+            result = adapter.validate_python(result)
+        return adapter.dump_json(result)
+
+    # If-None-Match: * matches only a response that exists, so that one is looked up first
+    wildcard = request.headers.get("if-none-match", "").strip() == "*"
+    if not wildcard and _not_modified(request, headers["ETag"], modified):
+        return Response(status_code=304, headers=headers)
+    body, state = response_cache.get_or_compute(route, params, version, serialize)
+    if body is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    if wildcard:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": state})
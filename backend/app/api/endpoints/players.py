@@ -1,32 +1,105 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional
-from app.models.player import Player, PlayerCreate, PlayerUpdate, PlayerStats, PlayerValuation
-from app.services.player_service import get_player, get_players, create_player, update_player, delete_player
+from app.models.player import Player, PlayerCreate, PlayerUpdate, PlayerStats, PlayerValuation, PlayerSearchResult
+from app.services.player_service import get_player, get_players_page, create_player, update_player, delete_player, search_players, export_players
 from app.services.stats_service import get_player_stats
-from app.services.valuation_service import get_player_valuation, get_similar_players
+from app.services.valuation_service import get_player_valuation
+from app.services.prediction_service import get_similar_players
+from app.services.entity_versions import PLAYERS, player_key
+from app.api.cache import conditional_get
+from app.api.responses import PLAYER_LIST, BULK_RESPONSES, serialized, negotiate, negotiated, model_columns, export_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Player])
+@router.get("/", response_model=List[Player], responses=BULK_RESPONSES)
 async def read_players(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
     name: Optional[str] = None,
     team: Optional[str] = None,
     position: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    order_by: str = Query("id", pattern="^(id|name)$", description="Sort order: id or name"),
 ):
     """
     Retrieve players with optional filtering.
+    
+    When more results are available, the X-Next-Cursor response header holds
+    a cursor that resumes the listing after the last returned player.
+    
+    Send Accept: application/vnd.apache.arrow.stream for an Arrow IPC stream
+    (one column per field) or Accept: application/msgpack for MessagePack.
+    """
+    media_type = negotiate(request)
+    # The listing exists even when no player matches, so If-None-Match: * always matches
+    not_modified = conditional_get(request, response, [PLAYERS], media_type, exists=lambda: True)
+    if not_modified is not None:
+        return not_modified
+    
+    try:
+        players, next_cursor = get_players_page(
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            name=name,
+            team=team,
+            position=position,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return negotiated(
+        media_type,
+        response,
+        json_body=lambda: PLAYER_LIST.dump_json(players),
+        document=lambda: PLAYER_LIST.dump_python(players, mode="json"),
+        columns=lambda: model_columns(players, Player),
+    )
+
+
+@router.get("/search", response_model=List[PlayerSearchResult])
+async def search_players_endpoint(
+    q: str = Query(..., min_length=1, description="Name or partial name to search for"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
+):
     """
-    return get_players(skip=skip, limit=limit, name=name, team=team, position=position)
+    Autocomplete player names, ranked by match quality.
+    """
+    return search_players(q, limit)
+
+
+@router.get("/export")
+async def export_players_endpoint(
+    name: Optional[str] = None,
+    team: Optional[str] = None,
+    position: Optional[str] = None,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+):
+    """
+    Stream every matching player, in ID order, as NDJSON or CSV.
+    
+    Players are read a page at a time while the response is sent, so the
+    full list is never held in memory.
+    """
+    chunks = (PLAYER_LIST.dump_python(players, mode="json") for players in export_players(name, team, position))
+    return export_response(chunks, list(Player.model_fields), export_format, "players")
 
 
 @router.get("/{player_id}", response_model=Player)
-async def read_player(player_id: int):
+async def read_player(player_id: int, request: Request, response: Response):
     """
     Retrieve a specific player by ID.
     """
+    not_modified = conditional_get(request, response, [player_key(player_id)], exists=lambda: get_player(player_id) is not None)
+    if not_modified is not None:
+        return not_modified
+    
     player = get_player(player_id)
     if player is None:
         raise HTTPException(status_code=404, detail="Player not found")
@@ -65,12 +138,23 @@ async def delete_player_endpoint(player_id: int):
 
 @router.get("/{player_id}/stats", response_model=PlayerStats)
 async def read_player_stats(
+    request: Request,
+    response: Response,
     player_id: int,
     season: Optional[int] = Query(None, description="Season year (e.g., 2022)"),
 ):
     """
     Retrieve statistics for a specific player.
     """
+    not_modified = conditional_get(
+        request,
+        response,
+        [player_key(player_id)],
+        exists=lambda: get_player_stats(player_id, season) is not None,
+    )
+    if not_modified is not None:
+        return not_modified
+    
     stats = get_player_stats(player_id, season)
     if stats is None:
         raise HTTPException(status_code=404, detail="Player stats not found")
@@ -91,7 +175,11 @@ async def read_player_valuation(player_id: int):
 @router.get("/{player_id}/similar", response_model=List[Player])
 async def read_similar_players(
     player_id: int,
-    limit: int = Query(5, description="Number of similar players to return"),
+    limit: int = Query(5, ge=1, description="Number of similar players to return"),
+    season: Optional[int] = Query(None, description="Season whose profile is matched (defaults to the latest)"),
+    position: Optional[str] = Query(None, description="Only return players at this position"),
+    seasons: Optional[List[int]] = Query(None, description="Only match against these seasons"),
+    metric: str = Query("cosine", pattern="^(cosine|euclidean)$", description="Distance metric: cosine or euclidean"),
 ):
     """
     Find players with similar statistical profiles.
@@ -100,5 +188,5 @@ async def read_similar_players(
     if player is None:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    similar_players = get_similar_players(player_id, limit)
-    return similar_players
+    similar_players = get_similar_players(player_id, limit, season, position, seasons, metric)
+    return serialized(PLAYER_LIST, similar_players)
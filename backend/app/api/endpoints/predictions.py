@@ -1,11 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-from app.models.prediction import PerformancePrediction, ValuationPrediction
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any, Iterator
+from app.models.prediction import PerformancePrediction, ValuationPrediction, BatchPredictionRequest, ModelInfo, ContractRecommendation, PosteriorSummary
 from app.services.prediction_service import (
     predict_player_performance,
+    predict_players_performance,
+    get_model_stats,
+    activate_model,
     predict_player_valuation,
     predict_team_performance,
+    get_season_odds,
+    get_posterior_summary,
+    CONTRACT_SEED,
 )
+from app.services.contract_optimizer import price_free_agent_class
+from app.api.responses import PERFORMANCE_PREDICTION, BULK_RESPONSES, dumps, serialized, negotiate, negotiated, record_columns
 
 router = APIRouter()
 
@@ -22,11 +31,64 @@ async def predict_player_performance_endpoint(
     prediction = predict_player_performance(player_id, season, include_uncertainty)
     if prediction is None:
         raise HTTPException(status_code=404, detail="Player not found or insufficient data for prediction")
-    return prediction
+    return serialized(PERFORMANCE_PREDICTION, prediction)
+
+
+def _ndjson_lines(
+    player_ids: List[int],
+    predictions: List[Optional[Dict[str, Any]]],
+    chunk_size: int = 100,
+) -> Iterator[bytes]:
+    """Yield predictions as newline-delimited JSON, a chunk of lines at a time."""
+    for start in range(0, len(predictions), chunk_size):
+        lines = []
+        for player_id, prediction in zip(player_ids[start : start + chunk_size], predictions[start : start + chunk_size]):
+            if prediction is None:
+                prediction = {
+                    "player_id": player_id,
+                    "error": "Player not found or insufficient data for prediction",
+                }
+            lines.append(dumps(prediction))
+        yield b"\n".join(lines) + b"\n"
 
 
+@router.get("/player/{player_id}/posterior", response_model=PosteriorSummary)
+async def read_player_posterior(
+    player_id: int,
+    season: int = Query(..., description="Season year to predict (e.g., 2023)"),
+    quantiles: List[float] = Query([], description="Quantiles to report, e.g. quantiles=0.1&quantiles=0.9"),
+    credible: float = Query(0.9, gt=0, lt=1, description="Mass of the central credible interval"),
+):
+    """
+    Posterior mean, credible interval and quantiles from the stored draws.
+    """
+    if any(q < 0 or q > 1 for q in quantiles):
+        raise HTTPException(status_code=400, detail="Quantiles must be between 0 and 1")
+    summary = get_posterior_summary(player_id, season, quantiles, credible)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No posterior draws stored for this player and season")
+    return summary
+
+
+@router.post("/player/batch")
+async def predict_players_performance_endpoint(request: BatchPredictionRequest):
+    """
+    Predict performance metrics for many players in one model pass.
+    
+    Results stream back as newline-delimited JSON, one PerformancePrediction per
+    line in request order; players that cannot be predicted get a line with
+    player_id and error instead.
+    """
+    predictions = predict_players_performance(request.player_ids, request.season, request.include_uncertainty)
+    return StreamingResponse(
+        _ndjson_lines(request.player_ids, predictions),
+        media_type="application/x-ndjson"
+    )
+
+
+# Valuation and contract pricing are CPU-bound; as plain functions they run in FastAPI's threadpool
 @router.get("/player/{player_id}/valuation", response_model=ValuationPrediction)
-async def predict_player_valuation_endpoint(
+def predict_player_valuation_endpoint(
     player_id: int,
     season: int = Query(..., description="Season year to predict (e.g., 2023)"),
 ):
@@ -39,15 +101,71 @@ async def predict_player_valuation_endpoint(
     return prediction
 
 
+@router.get("/free-agents", response_model=List[ContractRecommendation])
+def read_free_agent_contracts(
+    season: int = Query(..., description="Season just completed; contracts start the next season"),
+):
+    """
+    Recommend surplus-maximizing contracts for the free-agent class after a season.
+    """
+    return price_free_agent_class(season, seed=CONTRACT_SEED)
+
+
+# Simulation routes are plain functions, so FastAPI runs them in its threadpool off the event loop
 @router.get("/team/{team_id}/performance")
-async def predict_team_performance_endpoint(
+def predict_team_performance_endpoint(
     team_id: str,
     season: int = Query(..., description="Season year to predict (e.g., 2023)"),
+    simulations: int = Query(10000, ge=1000, le=100000, description="Number of simulated seasons"),
 ):
     """
-    Predict team performance for a future season.
+    Predict team performance for a season by simulating the remaining schedule.
     """
-    prediction = predict_team_performance(team_id, season)
+    prediction = predict_team_performance(team_id, season, simulations)
     if prediction is None:
         raise HTTPException(status_code=404, detail="Team not found or insufficient data for prediction")
     return prediction
+
+
+@router.get("/season/{season}/odds", responses=BULK_RESPONSES)
+def read_season_odds(
+    request: Request,
+    season: int,
+    simulations: int = Query(10000, ge=1000, le=100000, description="Number of simulated seasons"),
+):
+    """
+    Projected records and postseason odds for every team from one simulation run.
+    
+    Arrow and MessagePack are served on request (see the Accept header); the
+    Arrow table has one row per team, keyed by team_id.
+    """
+    odds = get_season_odds(season, simulations)
+    return negotiated(
+        negotiate(request),
+        json_body=lambda: dumps(odds),
+        document=lambda: odds,
+        columns=lambda: record_columns(odds, "team_id"),
+    )
+
+
+@router.get("/models", response_model=List[ModelInfo])
+async def read_models():
+    """
+    List registered prediction models with load time, memory footprint and
+    inference latency.
+    """
+    return get_model_stats()
+
+
+@router.post("/models/{name}/activate", response_model=ModelInfo)
+async def activate_model_endpoint(
+    name: str,
+    version: str = Query(..., description="Model version to activate"),
+):
+    """
+    Load a model version and make it active without restarting the server.
+    """
+    model = activate_model(name, version)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Model version not found")
+    return model
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Query
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import List, Optional, Dict, Any
 from app.models.statistics import (
     LeagueAverages,
@@ -9,59 +10,116 @@ from app.models.statistics import (
 from app.services.stats_service import (
     get_league_averages,
     get_statcast_metrics,
+    get_statcast_table,
     get_advanced_metrics,
-    get_statistical_leaders
+    get_statistical_leaders,
+    export_player_seasons,
+    export_statcast_pitches,
+    season_stats,
+    STATCAST_EXPORT_FIELDS,
 )
+from app.services.response_cache import response_cache
+from app.services.entity_versions import PLAYERS, player_key, team_key, season_key
+from app.services.leaderboard import LEADER_CATEGORIES
+from app.api.cache import cached_json, conditional_get
+from app.api.responses import ARROW_STREAM, BULK_RESPONSES, serializer, negotiate, negotiated, export_response
 
 router = APIRouter()
 
 
 @router.get("/league-averages", response_model=LeagueAverages)
 async def read_league_averages(
+    request: Request,
     season: int = Query(..., description="Season year (e.g., 2022)"),
     category: str = Query("batting", description="Category: batting, pitching, or fielding"),
 ):
     """
     Retrieve league average statistics for a specific season and category.
     """
-    averages = get_league_averages(season, category)
-    if averages is None:
-        raise HTTPException(status_code=404, detail="League averages not found")
-    return averages
+    return cached_json(
+        request,
+        "league-averages",
+        {"season": season, "category": category},
+        [season_key(season, category)],
+        lambda: get_league_averages(season, category),
+        LeagueAverages,
+        "League averages not found",
+    )
 
 
-@router.get("/statcast", response_model=StatcastMetrics)
+@router.get("/statcast", response_model=StatcastMetrics, responses=BULK_RESPONSES)
 async def read_statcast_metrics(
+    request: Request,
+    response: Response,
     player_id: Optional[int] = None,
     team_id: Optional[str] = None,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     season: Optional[int] = Query(None, description="Season year (e.g., 2022)"),
     metric_type: str = Query("batting", description="Metric type: batting or pitching"),
+    last_n_days: Optional[int] = Query(None, description="Rolling window of 7, 15 or 30 days ending at end_date or the latest game day"),
 ):
     """
     Retrieve Statcast metrics with various filtering options.
+    
+    With Accept: application/vnd.apache.arrow.stream the metrics rows come back
+    as an Arrow IPC stream built from the pitch columns, with the other fields
+    JSON-encoded in the schema metadata; application/msgpack returns the JSON
+    document as MessagePack.
     """
     if player_id is None and team_id is None and season is None:
         raise HTTPException(status_code=400, detail="At least one of player_id, team_id, or season must be provided")
     
-    metrics = get_statcast_metrics(
-        player_id=player_id,
-        team_id=team_id,
-        start_date=start_date,
-        end_date=end_date,
-        season=season,
-        metric_type=metric_type
-    )
+    media_type = negotiate(request)
+    covered = _statcast_season(season, start_date, end_date)
+    if covered is not None:
+        # Rows carry player names, so player edits change the response too
+        not_modified = conditional_get(request, response, [season_key(covered, "statcast"), PLAYERS], media_type)
+        if not_modified is not None:
+            return not_modified
+    
+    query = get_statcast_table if media_type == ARROW_STREAM else get_statcast_metrics
+    try:
+        metrics = query(
+            player_id=player_id,
+            team_id=team_id,
+            start_date=start_date,
+            end_date=end_date,
+            season=season,
+            metric_type=metric_type,
+            last_n_days=last_n_days
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     if metrics is None:
         raise HTTPException(status_code=404, detail="Statcast metrics not found")
     
-    return metrics
+    if media_type == ARROW_STREAM:
+        fields, columns = metrics
+        return negotiated(media_type, response, columns=lambda: columns, metadata=fields)
+    # The model holds plain rows already, so MessagePack packs its fields directly
+    return negotiated(
+        media_type,
+        response,
+        json_body=lambda: serializer(StatcastMetrics).dump_json(metrics),
+        document=lambda: dict(metrics),
+    )
+
+
+def _statcast_season(season: Optional[int], start_date: Optional[str], end_date: Optional[str]) -> Optional[int]:
+    """Return the season a Statcast request reads, or None if it depends on the latest ingested season."""
+    if season:
+        return season
+    try:
+        return date.fromisoformat(start_date or end_date).year if (start_date or end_date) else None
+    except ValueError:
+        return None
 
 
 @router.get("/advanced-metrics", response_model=AdvancedMetrics)
 async def read_advanced_metrics(
+    request: Request,
     player_id: Optional[int] = None,
     team_id: Optional[str] = None,
     season: int = Query(..., description="Season year (e.g., 2022)"),
@@ -73,29 +131,83 @@ async def read_advanced_metrics(
     if player_id is None and team_id is None:
         raise HTTPException(status_code=400, detail="Either player_id or team_id must be provided")
     
-    metrics = get_advanced_metrics(
-        player_id=player_id,
-        team_id=team_id,
-        season=season,
-        metric_type=metric_type
+    entity = player_key(player_id) if player_id is not None else team_key(team_id)
+    return cached_json(
+        request,
+        "advanced-metrics",
+        {"player_id": player_id, "team_id": team_id, "season": season, "metric_type": metric_type},
+        [entity, season_key(season, metric_type)],
+        lambda: get_advanced_metrics(
+            player_id=player_id,
+            team_id=team_id,
+            season=season,
+            metric_type=metric_type
+        ),
+        AdvancedMetrics,
+        "Advanced metrics not found",
     )
-    
-    if metrics is None:
-        raise HTTPException(status_code=404, detail="Advanced metrics not found")
-    
-    return metrics
 
 
 @router.get("/leaders", response_model=StatisticalLeaders)
 async def read_statistical_leaders(
+    request: Request,
     season: int = Query(..., description="Season year (e.g., 2022)"),
     category: str = Query(..., description="Statistical category (e.g., HR, AVG, ERA, K)"),
-    limit: int = Query(10, description="Number of leaders to return"),
+    limit: int = Query(10, ge=1, description="Number of leaders to return"),
 ):
     """
     Retrieve statistical leaders for a specific category and season.
     """
-    leaders = get_statistical_leaders(season, category, limit)
-    if leaders is None:
-        raise HTTPException(status_code=404, detail="Statistical leaders not found")
-    return leaders
+    stat_category = LEADER_CATEGORIES[category][0] if category in LEADER_CATEGORIES else category
+    return cached_json(
+        request,
+        "leaders",
+        {"season": season, "category": category, "limit": limit},
+        [season_key(season, stat_category), PLAYERS],
+        lambda: get_statistical_leaders(season, category, limit),
+        StatisticalLeaders,
+        "Statistical leaders not found",
+    )
+
+
+@router.get("/export/player-seasons")
+async def export_player_seasons_endpoint(
+    season: Optional[int] = Query(None, description="Only export this season (default: all seasons)"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+):
+    """
+    Stream every player-season line as NDJSON or CSV.
+    
+    Each record is flat: player_id, season, team_id, war, then one
+    "<category>.<field>" key per stat (null when the player has no line in
+    that category).
+    """
+    filename = f"player-seasons-{season}" if season is not None else "player-seasons"
+    return export_response(export_player_seasons(season), season_stats.record_fields(), export_format, filename)
+
+
+@router.get("/export/statcast")
+async def export_statcast_endpoint(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+):
+    """
+    Stream every pitch in a date range, in date order, as NDJSON or CSV.
+    
+    Records hold the stored pitch columns with teams, pitch types, events and
+    dates decoded.
+    """
+    try:
+        chunks = export_statcast_pitches(start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return export_response(chunks, STATCAST_EXPORT_FIELDS, export_format, f"statcast-{start_date}-{end_date}")
+
+
+@router.get("/cache")
+async def read_cache_stats() -> Dict[str, Any]:
+    """
+    Report response cache hits, stale hits, misses, evictions and size.
+    """
+    return response_cache.stats()
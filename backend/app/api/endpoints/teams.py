@@ -1,30 +1,61 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import List, Optional
 from app.models.team import Team, TeamStats, TeamRoster
-from app.services.team_service import get_team, get_teams, get_team_roster
+from app.services.team_service import get_team, get_teams_page, get_team_roster
 from app.services.stats_service import get_team_stats
+from app.services.entity_versions import TEAMS, team_key
+from app.api.cache import cached_json, conditional_get
+from app.api.responses import TEAM_ROSTER, serialized
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Team])
 async def read_teams(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 30,  # MLB has 30 teams
+    limit: int = Query(30, ge=1),  # MLB has 30 teams
     division: Optional[str] = None,
     league: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
 ):
     """
     Retrieve teams with optional filtering by division or league.
+    
+    When more results are available, the X-Next-Cursor response header holds
+    a cursor that resumes the listing after the last returned team.
     """
-    return get_teams(skip=skip, limit=limit, division=division, league=league)
+    # The listing exists even when no team matches, so If-None-Match: * always matches
+    not_modified = conditional_get(request, response, [TEAMS], exists=lambda: True)
+    if not_modified is not None:
+        return not_modified
+    
+    try:
+        teams, next_cursor = get_teams_page(
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            division=division,
+            league=league,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return teams
 
 
 @router.get("/{team_id}", response_model=Team)
-async def read_team(team_id: str):
+async def read_team(team_id: str, request: Request, response: Response):
     """
     Retrieve a specific team by ID.
     """
+    not_modified = conditional_get(request, response, [team_key(team_id)], exists=lambda: get_team(team_id) is not None)
+    if not_modified is not None:
+        return not_modified
+    
     team = get_team(team_id)
     if team is None:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -33,27 +64,44 @@ async def read_team(team_id: str):
 
 @router.get("/{team_id}/stats", response_model=TeamStats)
 async def read_team_stats(
+    request: Request,
     team_id: str,
     season: Optional[int] = Query(None, description="Season year (e.g., 2022)"),
 ):
     """
     Retrieve statistics for a specific team.
     """
-    stats = get_team_stats(team_id, season)
-    if stats is None:
-        raise HTTPException(status_code=404, detail="Team stats not found")
-    return stats
+    return cached_json(
+        request,
+        "team-stats",
+        {"team_id": team_id, "season": season},
+        [team_key(team_id)],
+        lambda: get_team_stats(team_id, season),
+        TeamStats,
+        "Team stats not found",
+    )
 
 
 @router.get("/{team_id}/roster", response_model=TeamRoster)
 async def read_team_roster(
+    request: Request,
+    response: Response,
     team_id: str,
     season: Optional[int] = Query(None, description="Season year (e.g., 2022)"),
 ):
     """
     Retrieve the roster for a specific team.
     """
+    not_modified = conditional_get(
+        request,
+        response,
+        [team_key(team_id)],
+        exists=lambda: get_team_roster(team_id, season) is not None,
+    )
+    if not_modified is not None:
+        return not_modified
+    
     roster = get_team_roster(team_id, season)
     if roster is None:
         raise HTTPException(status_code=404, detail="Team roster not found")
-    return roster
+    return serialized(TEAM_ROSTER, roster, response)
@@ -0,0 +1,300 @@
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import csv
+import io
+import json
+import numpy as np
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from app.models.player import Player
+from app.models.team import TeamRoster
+from app.models.prediction import PerformancePrediction
+
+try:
+    import orjson
+except ImportError:  # json renders the same output, only slower
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow is then not offered and clients get JSON
+    pa = None
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is then not offered and clients get JSON
+    msgpack = None
+
+# Media types of the bulk routes; JSON is the default
+JSON = "application/json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+# Rows per Arrow record batch
+ARROW_BATCH_ROWS = 65536
+
+# OpenAPI description of the extra formats, for the routes' responses= argument
+BULK_RESPONSES = {
+    200: {
+        "description": "JSON by default; Arrow IPC stream or MessagePack when requested with Accept",
+        "content": {ARROW_STREAM: {}, MSGPACK: {}},
+    }
+}
+
+# Streaming export formats
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# orjson options: numpy scalars/arrays and non-string dict keys, as the services produce them
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize plain Python content (dicts, lists, numbers) to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (falls back to json when not installed).
+
+    The app's default response class (see app.main), so routes without a
+    response_model skip jsonable_encoder and json.dumps. Routes with a
+    response_model still take FastAPI's pydantic-core path, which a default
+    response class leaves in place.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def serializer(model: Any) -> TypeAdapter:
+    """Return a TypeAdapter for a response type, built once per type."""
+    return TypeAdapter(model)
+
+
+# Precompiled serializers for the heavy list responses and the performance prediction
+PLAYER_LIST = serializer(List[Player])
+TEAM_ROSTER = serializer(TeamRoster)
+PERFORMANCE_PREDICTION = serializer(PerformancePrediction)
+
+
+def serialized(adapter: TypeAdapter, content: Any, response: Optional[Response] = None) -> Response:
+    """
+    Serialize trusted content with a precompiled adapter, skipping validation.
+
+    Use only with objects the services built as instances of the adapter's
+    type; FastAPI's response_model validation is bypassed.
+
+    Args:
+        adapter: Serializer from serializer() or one of the module constants
+        content: Model instance(s) to serialize
+        response: The endpoint's injected response, whose headers are kept
+
+    Returns:
+        JSON Response
+    """
+    headers = dict(response.headers) if response is not None else None
+    if headers:
+        headers.pop("content-length", None)
+    return Response(content=adapter.dump_json(content), media_type="application/json", headers=headers)
+
+
+def bulk_formats() -> List[str]:
+    """Media types the bulk routes can produce with the installed libraries."""
+    formats = [JSON]
+    if pa is not None:
+        formats.append(ARROW_STREAM)
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    return formats
+
+
+def negotiate(request: Request) -> str:
+    """
+    Pick the response media type of a bulk route from the Accept header.
+
+    Media ranges are tried by descending q-value, then in header order. JSON
+    is returned for a missing header, a wildcard, or when nothing requested
+    can be produced (including Arrow or MessagePack without their library).
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        JSON, ARROW_STREAM or MSGPACK
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return JSON
+    offered = bulk_formats()
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            media_type = media_type.lower()
+            ranges.append((-q, position, MEDIA_TYPE_ALIASES.get(media_type, media_type)))
+    for _, _, media_type in sorted(ranges):
+        if media_type in offered:
+            return media_type
+        if media_type in ("*/*", "application/*"):
+            return JSON
+    return JSON
+
+
+def model_columns(items: List[Any], model: Any) -> Dict[str, List[Any]]:
+    """Transpose model instances into one list per field, in field order."""
+    return {name: [getattr(item, name) for item in items] for name in model.model_fields}
+
+
+def record_columns(records: Dict[Any, Dict[str, Any]], key: str) -> Dict[str, List[Any]]:
+    """Transpose a dict of records keyed by ID into columns, the IDs first under key."""
+    fields = list(next(iter(records.values()), {}))
+    columns = {key: list(records)}
+    for field in fields:
+        columns[field] = [record.get(field) for record in records.values()]
+    return columns
+
+
+def arrow_stream(columns: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Encode columns as an Arrow IPC stream.
+
+    Args:
+        columns: Column name -> NumPy array or list; a (codes, values) pair
+            becomes a dictionary-encoded column
+        metadata: Response fields outside the table, stored JSON-encoded in
+            the schema metadata
+
+    Returns:
+        The stream bytes, in record batches of up to ARROW_BATCH_ROWS rows
+    """
+    arrays = {}
+    for name, column in columns.items():
+        if isinstance(column, tuple):
+            codes, values = column
+            arrays[name] = pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(values, type=pa.string()))
+        else:
+            arrays[name] = pa.array(column)
+    schema_metadata = {name: dumps(value) for name, value in (metadata or {}).items()}
+    table = pa.table(arrays, metadata=schema_metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=ARROW_BATCH_ROWS):
+            writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def packb(content: Any) -> bytes:
+    """Encode plain Python content (as a JSON body would hold it) as MessagePack."""
+    return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+
+def negotiated(
+    media_type: str,
+    response: Optional[Response] = None,
+    json_body: Optional[Callable[[], bytes]] = None,
+    document: Optional[Callable[[], Any]] = None,
+    columns: Optional[Callable[[], Dict[str, Any]]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    Build a bulk route's response in the negotiated format.
+
+    Only the producer for the chosen format is called.
+
+    Args:
+        media_type: Result of negotiate()
+        response: The endpoint's injected response, whose headers are kept
+        json_body: Returns the JSON body
+        document: Returns the body as plain Python content, for MessagePack
+        columns: Returns the table as columns (see arrow_stream), for Arrow
+        metadata: Fields outside the table, for Arrow
+
+    Returns:
+        Response with Vary: Accept
+    """
+    if media_type == ARROW_STREAM:
+        body = arrow_stream(columns(), metadata)
+    elif media_type == MSGPACK:
+        body = packb(document())
+    else:
+        body = json_body()
+    headers = {}
+    if response is not None:
+        headers = {name: value for name, value in response.headers.items() if name not in ("content-length", "vary")}
+    headers["Vary"] = "Accept"
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def ndjson_stream(chunks: Iterable[List[Any]]) -> Iterator[bytes]:
+    """Encode chunks of records as newline-delimited JSON, one body part per chunk."""
+    for records in chunks:
+        if records:
+            yield b"\n".join(dumps(record) for record in records) + b"\n"
+
+
+def csv_stream(chunks: Iterable[List[Dict[str, Any]]], fields: List[str]) -> Iterator[bytes]:
+    """Encode chunks of records as CSV, the header first; None becomes an empty cell."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode("utf-8")
+    for records in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(records)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(
+    chunks: Iterable[List[Dict[str, Any]]],
+    fields: List[str],
+    export_format: str,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Stream an export as NDJSON or CSV while its chunks are produced.
+
+    The chunk generator runs in the threadpool and is only advanced after the
+    previous body part has been sent, so a slow client holds back production
+    instead of buffering it, and memory stays at about one chunk.
+
+    Args:
+        chunks: Iterator over lists of JSON-compatible records
+        fields: Record keys, which are the CSV columns
+        export_format: "ndjson" or "csv"
+        filename: Download name without extension
+
+    Returns:
+        StreamingResponse with a Content-Disposition attachment header
+    """
+    body = csv_stream(chunks, fields) if export_format == "csv" else ndjson_stream(chunks)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
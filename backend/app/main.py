@@ -1,11 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from app.api.responses import ORJSONResponse
 
 app = FastAPI(
     title="MLB Analytics Platform API",
     description="API for MLB player performance analysis and prediction",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -27,6 +29,13 @@ app.include_router(predictions.router, prefix="/api/predictions", tags=["predict
 app.include_router(statistics.router, prefix="/api/statistics", tags=["statistics"])
 
 
+@app.on_event("startup")
+async def schedule_precompute():
+    """Start the nightly precompute of bootstrap prediction intervals."""
+    from app.services.uncertainty import start_nightly_precompute
+    start_nightly_precompute()
+
+
 @app.get("/", tags=["root"])
 async def root():
     """Root endpoint that returns API information."""
@@ -46,6 +46,16 @@ class Player(PlayerBase):
         orm_mode = True
 
 
+class PlayerSearchResult(BaseModel):
+    """Model for a ranked player name search result."""
+    id: int
+    name: str
+    team_id: str
+    position: str
+    score: float
+    match_type: str  # exact, prefix, token_prefix, substring, or fuzzy
+
+
 class BattingStats(BaseModel):
     """Model for batting statistics."""
     games: int
@@ -135,6 +145,7 @@ class PlayerStats(BaseModel):
     """Model for player statistics."""
     player_id: int
     season: int
+    team_id: Optional[str] = None
     batting: Optional[BattingStats] = None
     pitching: Optional[PitchingStats] = None
     fielding: Optional[FieldingStats] = None
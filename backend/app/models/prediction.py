@@ -4,9 +4,9 @@ from typing import Optional, List, Dict, Any
 
 class PerformancePredictionInterval(BaseModel):
     """Model for prediction intervals."""
-    lower: float
+    lower: Optional[float] = None
     mean: float
-    upper: float
+    upper: Optional[float] = None
 
 
 class PerformancePrediction(BaseModel):
@@ -34,11 +34,51 @@ class PerformancePrediction(BaseModel):
     war: Optional[PerformancePredictionInterval] = None
     
     # Prediction metadata
+    model_name: Optional[str] = None
     model_version: str
     features_used: List[str]
     prediction_date: str
 
 
+class PosteriorStatSummary(BaseModel):
+    """Model for one stat reduced from posterior draws."""
+    mean: float
+    lower: float
+    upper: float
+    quantiles: Dict[str, float]
+
+
+class PosteriorSummary(BaseModel):
+    """Model for a player's posterior predictive summary."""
+    player_id: int
+    season: int
+    method: str
+    draws: int
+    credible_mass: float
+    fitted_at: str
+    stats: Dict[str, PosteriorStatSummary]
+
+
+class BatchPredictionRequest(BaseModel):
+    """Model for a batch performance prediction request."""
+    player_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    season: int
+    include_uncertainty: bool = True
+
+
+class ContractRecommendation(BaseModel):
+    """Model for a recommended free-agent contract."""
+    player_id: int
+    name: Optional[str] = None
+    season: int
+    projected_war: float
+    age: Optional[int] = None
+    contract_years: int
+    annual_value: float
+    total_value: float
+    expected_surplus: float
+
+
 class ValuationPrediction(BaseModel):
     """Model for player valuation predictions."""
     player_id: int
@@ -58,7 +98,24 @@ class ValuationPrediction(BaseModel):
     # Comparable players
     comparable_players: List[Dict[str, Any]]
     
-    # Prediction metadata
+    # Prediction metadata (the registered performance model behind projected_war)
+    model_name: Optional[str] = None
     model_version: str
     prediction_date: str
     confidence_score: float
+
+
+class ModelInfo(BaseModel):
+    """Model for the status of a registered prediction model version."""
+    name: str
+    version: str
+    loaded: bool
+    active: bool
+    source: Optional[str] = None
+    load_seconds: Optional[float] = None
+    memory_bytes: Optional[int] = None
+    calls: int = 0
+    rows: int = 0
+    mean_latency_ms: Optional[float] = None
+    p50_latency_ms: Optional[float] = None
+    p95_latency_ms: Optional[float] = None
@@ -0,0 +1,253 @@
+from typing import List, Optional, Dict, Any, Tuple
+import numpy as np
+from app.services.valuation_service import market_value
+from app.services.player_age import season_age
+
+# Contract lengths considered (years)
+MAX_CONTRACT_YEARS = 10
+
+# Simulated WAR paths per player
+CONTRACT_PATHS = 1000
+
+# Yearly WAR change by age: (first age of the band, change per year)
+AGING_CURVE = [(0, 0.3), (26, 0.15), (27, 0.0), (30, -0.3), (33, -0.5), (36, -0.7)]
+
+# Age assumed for players without a birth date
+DEFAULT_AGE = 28
+
+# Year-to-year WAR volatility by age (random-walk step, one sigma); declines are less predictable
+AGING_VOLATILITY = [(0, 0.5), (27, 0.6), (30, 0.8), (33, 1.0), (36, 1.2)]
+
+# Error of the first-year WAR projection (one sigma)
+PROJECTION_SD = 1.0
+
+# Weights of the platform seasons' WAR in a free agent's asking price, most recent first
+PLATFORM_WEIGHTS = (5.0, 4.0, 3.0)
+
+# Team discount rate applied to future wins and salary
+DISCOUNT_RATE = 0.05
+
+# AAV a player gives up per guaranteed year beyond the first, for the security
+LENGTH_DISCOUNT = 0.02
+
+# Penalty on the variance of a contract's surplus, relative to the player's one-year price
+RISK_AVERSION = 0.3
+
+
+def _by_age(curve: List[Tuple[int, float]], ages: np.ndarray) -> np.ndarray:
+    """Look up an age-banded curve of (first age of the band, value)."""
+    starts = np.array([start for start, _ in curve])
+    values = np.array([value for _, value in curve])
+    return values[np.searchsorted(starts, ages, side="right") - 1]
+
+
+def aging_deltas(ages: np.ndarray) -> np.ndarray:
+    """Return the expected WAR change going from each age to the next."""
+    return _by_age(AGING_CURVE, ages)
+
+
+def expected_war(war: np.ndarray, age: np.ndarray, years: int = MAX_CONTRACT_YEARS) -> np.ndarray:
+    """Return the (players, years) expected WAR path: first-year WAR plus the cumulative aging changes."""
+    war = np.asarray(war, dtype=np.float64)
+    ages = np.asarray(age, dtype=np.float64)[:, None] + np.arange(years - 1)
+    drift = np.concatenate([np.zeros((len(war), 1)), np.cumsum(aging_deltas(ages), axis=1)], axis=1)
+    return war[:, None] + drift
+
+
+def war_noise(
+    age: np.ndarray,
+    paths: int = CONTRACT_PATHS,
+    years: int = MAX_CONTRACT_YEARS,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Simulate deviations of future WAR from its expected path.
+
+    The first year carries the projection error and later years add a random
+    walk whose step grows with age (AGING_VOLATILITY), so uncertainty widens
+    with the horizon and more so for older players.
+
+    Args:
+        age: Age in the first contract year, per player
+        paths: Paths per player
+        years: Contract years to simulate
+        rng: Random generator
+
+    Returns:
+        (players, paths, years) WAR deviations
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    ages = np.asarray(age, dtype=np.float64)[:, None] + np.arange(years)
+    step_sd = _by_age(AGING_VOLATILITY, ages)
+    step_sd[:, 0] = PROJECTION_SD
+    steps = rng.standard_normal(size=(len(ages), paths, years), dtype=np.float32) * step_sd[:, None, :]
+    return np.cumsum(steps, axis=2, dtype=np.float64)
+
+
+def war_paths(war: np.ndarray, age: np.ndarray, noise: np.ndarray) -> np.ndarray:
+    """Return (players, paths, years) simulated WAR: the aged expected path plus war_noise() deviations."""
+    return expected_war(war, age, noise.shape[-1])[:, None, :] + noise
+
+
+def yearly_value(war: np.ndarray, season: int) -> np.ndarray:
+    """
+    Price WAR along the last axis as consecutive seasons starting at season.
+
+    Years below replacement are worth nothing to the team.
+    """
+    values = np.empty(war.shape, dtype=np.float64)
+    for t in range(war.shape[-1]):
+        values[..., t] = market_value(war[..., t], season + t)
+    return np.where(war > 0, values, 0.0)
+
+
+def platform_war(player_ids: np.ndarray, season: int) -> np.ndarray:
+    """
+    Return the WAR each player's market price is set from.
+
+    Free agents are priced on what they have done, not on a team's
+    projection: the PLATFORM_WEIGHTS average of their WAR over the seasons
+    up to and including season, over the seasons they played.
+
+    Args:
+        player_ids: Player IDs
+        season: Last completed season
+
+    Returns:
+        Platform WAR per player (NaN for players without WAR in those seasons)
+    """
+    from app.services.stats_service import season_stats
+
+    total = np.zeros(len(player_ids), dtype=np.float64)
+    weight = np.zeros(len(player_ids), dtype=np.float64)
+    for i, player_id in enumerate(np.asarray(player_ids).tolist()):
+        for back, season_weight in enumerate(PLATFORM_WEIGHTS):
+            row = season_stats.row(player_id, season - back)
+            if row is None or np.isnan(season_stats.war[row]):
+                continue
+            total[i] += season_weight * float(season_stats.war[row])
+            weight[i] += season_weight
+    return np.divide(total, weight, out=np.full(len(total), np.nan), where=weight > 0)
+
+
+def optimize_contracts(
+    war: np.ndarray,
+    asking_war: np.ndarray,
+    age: np.ndarray,
+    season: int,
+    paths: int = CONTRACT_PATHS,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Find the surplus-maximizing contract length for each player.
+
+    Every length from 1 to MAX_CONTRACT_YEARS is priced at once. As on the
+    free-agent market, the asking AAV of an L-year deal is the expected
+    market value of the player's asking WAR (see platform_war) aged along
+    AGING_CURVE, averaged over the term and reduced by LENGTH_DISCOUNT per
+    extra guaranteed year for the security. The ask does not depend on the
+    team's projection: the team's value of each year is the market value of
+    its own projected WAR over the same simulated deviations (nothing once a
+    player falls below replacement).
+
+    A length's score is its mean discounted surplus less RISK_AVERSION / 2
+    times the surplus variance over the player's one-year price. Each extra
+    year adds security discount but, with the volatility rising with age,
+    more variance, so stars and younger players get longer terms and players
+    asking more than their projection get one year.
+
+    Args:
+        war: Projected WAR for the first contract year, per player
+        asking_war: Platform-season WAR the player's asking price is set from, per player
+        age: Age in the first contract year, per player (NaN for unknown)
+        season: First contract season
+        paths: Simulated WAR paths per player
+        seed: Random seed
+
+    Returns:
+        Dictionary of per-player arrays: years, annual_value, total_value,
+        surplus (mean discounted surplus of the chosen length) and the
+        (players, lengths) surplus and annual_value_by_length tables
+    """
+    war = np.asarray(war, dtype=np.float64)
+    asking_war = np.asarray(asking_war, dtype=np.float64)
+    age = np.nan_to_num(np.asarray(age, dtype=np.float64), nan=DEFAULT_AGE)
+    years = MAX_CONTRACT_YEARS
+    rng = np.random.default_rng(seed)
+
+    discount = (1 + DISCOUNT_RATE) ** -np.arange(years)
+    cumulative_discount = np.cumsum(discount)
+
+    # Both sides price the same deviations; the ask starts from the asking WAR
+    noise = war_noise(age, paths, years, rng)
+
+    # Asking price: expected market value of the asking WAR, aged from the platform season on
+    asked = yearly_value(war_paths(asking_war + aging_deltas(age - 1), age, noise), season).mean(axis=1)
+    ask_pv = np.cumsum(asked * discount, axis=1)
+    lengths = np.arange(1, years + 1)
+    annual_value = ask_pv / cumulative_discount * (1 - LENGTH_DISCOUNT * (lengths - 1))
+
+    # Team value over simulated paths: (players, paths, lengths) of discounted surplus
+    simulated = yearly_value(war_paths(war, age, noise), season)
+    value_pv = np.cumsum(simulated * discount, axis=2)
+    surplus = value_pv - (annual_value * cumulative_discount)[:, None, :]
+    mean_surplus = surplus.mean(axis=1)
+    score = mean_surplus - RISK_AVERSION / 2 * surplus.var(axis=1) / ask_pv[:, :1]
+
+    best = np.argmax(score, axis=1)
+    players = np.arange(len(war))
+    return {
+        "years": lengths[best],
+        "annual_value": annual_value[players, best],
+        "total_value": annual_value[players, best] * lengths[best],
+        "surplus": mean_surplus[players, best],
+        "surplus_by_length": mean_surplus,
+        "annual_value_by_length": annual_value,
+    }
+
+
+def price_free_agent_class(season: int, paths: int = CONTRACT_PATHS, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Recommend contracts for every player reaching free agency after a season.
+
+    Args:
+        season: Season just completed; contracts start the following season
+        paths: Simulated WAR paths per player
+        seed: Random seed
+
+    Returns:
+        Contract recommendations, largest expected surplus first
+    """
+    from app.services.player_service import players_db
+    from app.services.valuation_service import value_league, FREE_AGENCY_YEARS
+
+    valuation = value_league(season)
+    eligible = np.flatnonzero(
+        (valuation["service_years"] + 1 >= FREE_AGENCY_YEARS) & ~np.isnan(valuation["projected_war"])
+    )
+    player_ids = valuation["player_id"][eligible]
+    war = valuation["projected_war"][eligible]
+    asking_war = platform_war(player_ids, season)
+    asking_war = np.where(np.isnan(asking_war), war, asking_war)
+    age = np.array([
+        season_age(players_db[pid].birth_date, season + 1) if pid in players_db else np.nan
+        for pid in player_ids.tolist()
+    ])
+    contracts = optimize_contracts(war, asking_war, age, season + 1, paths, seed)
+
+    recommendations = [
+        {
+            "player_id": int(player_ids[i]),
+            "name": players_db[int(player_ids[i])].name if int(player_ids[i]) in players_db else None,
+            "season": season + 1,
+            "projected_war": round(float(war[i]), 1),
+            "age": None if np.isnan(age[i]) else int(age[i]),
+            "contract_years": int(contracts["years"][i]),
+            "annual_value": round(float(contracts["annual_value"][i])),
+            "total_value": round(float(contracts["total_value"][i])),
+            "expected_surplus": round(float(contracts["surplus"][i])),
+        }
+        for i in range(len(player_ids))
+    ]
+    recommendations.sort(key=lambda r: -r["expected_surplus"])
+    return recommendations
@@ -0,0 +1,67 @@
+from typing import Dict, Tuple, Hashable, Iterable
+import os
+import threading
+import time
+
+# Entity keys: the player collection, one player, one team, one (season, stat category)
+PLAYERS = ("players",)
+TEAMS = ("teams",)
+
+
+def player_key(player_id: int) -> Tuple[str, int]:
+    return ("player", player_id)
+
+
+def team_key(team_id: str) -> Tuple[str, str]:
+    return ("team", team_id)
+
+
+def season_key(season: int, category: str) -> Tuple[str, int, str]:
+    return ("season", season, category)
+
+
+class EntityVersions:
+    """
+    Monotonic version counters per entity.
+
+    Every change takes the next value of one process-wide sequence and stamps
+    it (with the wall-clock time) on each entity it touched. A response built
+    from a fixed set of entities is therefore unchanged exactly while the
+    largest stamp among them is unchanged, which gives it a strong ETag and a
+    Last-Modified time without building the response.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        # Distinguishes this process's counters from another process's or a restart's
+        self.epoch = f"{int(self.started * 1000):x}{os.getpid():x}"
+        self._sequence = 0
+        self._versions: Dict[Hashable, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *keys: Hashable) -> int:
+        """Record a change to entities; returns the new sequence number."""
+        with self._lock:
+            self._sequence += 1
+            stamp = (self._sequence, time.time())
+            for key in keys:
+                self._versions[key] = stamp
+            return self._sequence
+
+    def version(self, keys: Iterable[Hashable]) -> Tuple[int, float]:
+        """
+        Return (version, modified time) of a set of entities.
+
+        Entities never changed since startup have version 0 and the start time.
+        """
+        versions = self._versions
+        return max((versions.get(key, (0, self.started)) for key in keys), default=(0, self.started))
+
+    def etag(self, keys: Iterable[Hashable]) -> str:
+        """Return the strong ETag of a response built from these entities."""
+        return f'"{self.epoch}-{self.version(keys)[0]}"'
+
+
+# Change counters behind ETags, Last-Modified and response cache keys
+entity_versions = EntityVersions()
+
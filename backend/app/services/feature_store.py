@@ -0,0 +1,389 @@
+from pathlib import Path
+from typing import List, Optional, Dict, Iterable, Set
+import hashlib
+import json
+import os
+import shutil
+import threading
+import warnings
+import numpy as np
+from app.services.stats_store import SeasonStatsTable, innings_to_outs
+from app.services.player_age import season_age
+
+# Root of the materialized matrices: <FEATURE_DIR>/season=<year>/<version>/
+FEATURE_DIR = Path(os.environ.get("MLB_FEATURE_DIR", Path(__file__).resolve().parents[2] / "data" / "features"))
+
+# File naming the most recently published version of a season
+CURRENT_FILE = "CURRENT"
+
+# Materialized versions kept per season, the current one included (older ones may still be mapped by workers)
+KEEP_VERSIONS = 2
+
+# Stored feature columns: (category, field, per) where per names a field to divide by.
+# Category None marks a derived column (war, age, service_years, outs).
+FEATURE_COLUMNS = [
+    ("batting", "games", None),
+    ("batting", "plate_appearances", None),
+    ("batting", "batting_average", None),
+    ("batting", "on_base_percentage", None),
+    ("batting", "slugging_percentage", None),
+    ("batting", "isolated_power", None),
+    ("batting", "batting_average_on_balls_in_play", None),
+    ("batting", "walk_percentage", None),
+    ("batting", "strikeout_percentage", None),
+    ("batting", "weighted_runs_created_plus", None),
+    ("batting", "home_runs", None),
+    ("batting", "runs_batted_in", None),
+    ("batting", "stolen_bases", None),
+    ("batting", "home_runs", "plate_appearances"),
+    ("batting", "stolen_bases", "plate_appearances"),
+    ("pitching", "earned_run_average", None),
+    ("pitching", "fielding_independent_pitching", None),
+    ("pitching", "walks_and_hits_per_inning_pitched", None),
+    ("pitching", "strikeouts_per_nine", None),
+    ("pitching", "walks_per_nine", None),
+    ("pitching", "home_runs_per_nine", None),
+    ("pitching", "strikeout_percentage", None),
+    ("pitching", "walk_percentage", None),
+    ("pitching", "ground_ball_percentage", None),
+    ("pitching", "strikeouts", None),
+    ("pitching", "wins", None),
+    ("pitching", "games_started", "games"),
+    ("statcast", "average_exit_velocity", None),
+    ("statcast", "average_launch_angle", None),
+    ("statcast", "barrel_percentage", None),
+    ("statcast", "hard_hit_percentage", None),
+    ("statcast", "average_sprint_speed", None),
+    ("statcast", "average_fastball_velocity", None),
+    ("statcast", "spin_rate_fastball", None),
+    ("statcast", "spin_rate_breaking", None),
+    ("statcast", "whiff_percentage", None),
+    ("statcast", "chase_percentage", None),
+    (None, "war", None),
+    (None, "age", None),
+    (None, "service_years", None),
+    (None, "outs", None),
+]
+
+# Positions coded in the position array; other positions are -1
+FEATURE_POSITIONS = ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH", "SP", "RP", "P"]
+
+# Standardization groups: rows with a pitching line are pitchers, the rest hitters
+HITTERS, PITCHERS = 0, 1
+
+
+def feature_name(category: Optional[str], field: str, per: Optional[str] = None) -> str:
+    """Return the column name of a feature, e.g. "batting.home_runs/plate_appearances"."""
+    name = field if category is None else f"{category}.{field}"
+    return f"{name}/{per}" if per else name
+
+
+FEATURE_NAMES = [feature_name(*column) for column in FEATURE_COLUMNS]
+
+
+class FeatureMatrix:
+    """
+    Materialized features of one season, ordered by player ID.
+
+    "raw" holds the values as recorded (NaN when missing) and "features" the
+    same columns z-scored against the season's hitters or pitchers, with
+    missing values at the mean. Both are read-only memory maps.
+    """
+
+    def __init__(self, path: Path, season: int, version: str):
+        self.path = path
+        self.season = season
+        self.version = version
+        self.player_id = np.load(path / "player_id.npy")
+        self.rows = np.load(path / "rows.npy")
+        self.row_version = np.load(path / "row_version.npy")
+        self.position = np.load(path / "position.npy")
+        self.group = np.load(path / "group.npy")
+        self.raw = np.load(path / "raw.npy", mmap_mode="r")
+        self.features = np.load(path / "features.npy", mmap_mode="r")
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+        self.names: List[str] = meta["names"]
+        self.mean = np.array(meta["mean"], dtype=np.float64)
+        self.std = np.array(meta["std"], dtype=np.float64)
+        self._columns = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.player_id)
+
+    def columns(self, names: List[str]) -> List[int]:
+        """Return the column indices of feature names."""
+        return [self._columns[name] for name in names]
+
+    def index(self, player_ids: np.ndarray) -> np.ndarray:
+        """Return the matrix row of each player ID (-1 for players without a line)."""
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        i = np.searchsorted(self.player_id, player_ids)
+        i = np.minimum(i, max(len(self.player_id) - 1, 0))
+        found = (self.player_id[i] == player_ids) if len(self.player_id) else np.zeros(len(player_ids), dtype=bool)
+        return np.where(found, i, -1)
+
+    def raw_columns(self, names: List[str], index: Optional[np.ndarray] = None) -> np.ndarray:
+        """Gather raw columns (float64, NaN when missing) for matrix rows (default: all)."""
+        values = self.raw if index is None else self.raw[index]
+        return np.asarray(values[:, self.columns(names)], dtype=np.float64)
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process exists; assumed alive where it cannot be checked."""
+    if pid == os.getpid() or os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class FeatureStore:
+    """
+    Versioned per-season feature matrices shared by the prediction,
+    similarity and valuation services.
+
+    A season is materialized on first use into .npy files that readers map
+    read-only, and rebuilt only after a write to that season's rows or an
+    update to one of its players. Only rows whose row_version moved (or
+    whose player was updated) are re-extracted; the others are copied from
+    the previous version, and the cheap column standardization is redone
+    over the whole season.
+
+    Versions are named by a fingerprint of their inputs, so uvicorn workers
+    holding the same rows map one shared copy: a worker first looks for its
+    fingerprint on disk and only builds when it is missing. A build is
+    written to a scratch directory, renamed into place and published by
+    replacing the season's CURRENT file, as in the posterior store.
+    """
+
+    def __init__(self, table: SeasonStatsTable, root: Path = FEATURE_DIR):
+        self.table = table
+        self.root = Path(root)
+        self.player_version = 0
+        self._player_versions: Dict[int, int] = {}
+        self._matrices: Dict[int, FeatureMatrix] = {}
+        self._built_at: Dict[int, tuple] = {}
+        self._dirty: Dict[int, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def invalidate_players(self, player_ids: Iterable[int]) -> None:
+        """Mark players whose attributes (birth date, debut, position) changed."""
+        player_ids = set(player_ids)
+        with self._lock:
+            for season in self._matrices:
+                if any(self.table.row(pid, season) is not None for pid in player_ids):
+                    self._dirty.setdefault(season, set()).update(player_ids)
+                    self._player_versions[season] = self._player_versions.get(season, 0) + 1
+            self.player_version += 1
+
+    def matrix(self, season: int) -> FeatureMatrix:
+        """
+        Return the current feature matrix of a season, refreshing it if stale.
+
+        Args:
+            season: Season year
+
+        Returns:
+            FeatureMatrix (possibly with no rows)
+        """
+        state = (self.table.season_version(season), self._player_versions.get(season, 0))
+        current = self._matrices.get(season)
+        if current is not None and self._built_at.get(season) == state:
+            return current
+        with self._lock:
+            current = self._matrices.get(season)
+            if current is None or self._built_at.get(season) != state:
+                current = self._refresh(season, current, self._dirty.pop(season, set()))
+                self._matrices[season] = current
+                self._built_at[season] = state
+        return current
+
+    def _season_rows(self, season: int) -> np.ndarray:
+        """Return a season's table rows ordered by player ID."""
+        rows = self.table.season_rows(season)
+        order = np.argsort(self.table.player_id[rows].astype(np.int64), kind="stable")
+        return rows[order]
+
+    def _fingerprint(self, season: int, rows: np.ndarray) -> str:
+        """Hash every input of a season's matrix: its rows, their stats and their players' attributes."""
+        from app.services.player_service import players_db
+
+        table = self.table
+        digest = hashlib.sha1(json.dumps([season, FEATURE_NAMES]).encode())
+        player_id = table.player_id[rows].astype(np.int64)
+        for array in (player_id, rows.astype(np.int64), table.row_version[rows], table.war[rows]):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        for category in sorted(table.present):
+            digest.update(table.present[category][rows].tobytes())
+            for field in sorted(table.columns[category]):
+                digest.update(np.ascontiguousarray(table.columns[category][field][rows]).tobytes())
+        for pid in player_id.tolist():
+            player = players_db.get(pid)
+            attributes = None if player is None else (
+                player.birth_date, player.mlb_debut, player.mlb_service_time, player.position
+            )
+            digest.update(repr(attributes).encode())
+        return digest.hexdigest()
+
+    def _refresh(self, season: int, previous: Optional[FeatureMatrix], dirty: Set[int]) -> FeatureMatrix:
+        """Return the matrix of a season's current inputs, mapping a published copy when one exists."""
+        rows = self._season_rows(season)
+        version = self._fingerprint(season, rows)
+        if previous is not None and previous.version == version:
+            return previous
+        path = self.root / f"season={season}" / version
+        if (path / "meta.json").exists():
+            try:
+                return FeatureMatrix(path, season, version)
+            except FileNotFoundError:
+                pass  # pruned by another worker between the check and the load
+        return self._materialize(season, rows, version, previous, dirty)
+
+    def _extract(self, season: int, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Compute raw feature values, positions and groups of table rows."""
+        from app.services.player_service import players_db
+        from app.services.valuation_service import service_years
+
+        table = self.table
+        player_id = table.player_id[rows].astype(np.int64)
+        players = [players_db.get(pid) for pid in player_id.tolist()]
+        innings = table.column("pitching", "innings_pitched")[rows].astype(np.float64)
+        outs = innings_to_outs(np.nan_to_num(innings)).astype(np.float64)
+        derived = {
+            "war": table.war[rows].astype(np.float64),
+            "age": np.array([season_age(p.birth_date, season) if p else np.nan for p in players], dtype=np.float64),
+            "service_years": service_years(player_id, season),
+            "outs": np.where(table.present["pitching"][rows] & ~np.isnan(innings), outs, np.nan),
+        }
+
+        raw = np.empty((len(rows), len(FEATURE_COLUMNS)), dtype=np.float32)
+        for c, (category, field, per) in enumerate(FEATURE_COLUMNS):
+            if category is None:
+                raw[:, c] = derived[field]
+                continue
+            values = table.column(category, field)[rows].astype(np.float64)
+            if per is not None:
+                denominator = table.column(category, per)[rows].astype(np.float64)
+                values = np.divide(values, denominator, out=np.full(len(rows), np.nan), where=denominator > 0)
+            values[~table.present[category][rows]] = np.nan
+            raw[:, c] = values
+
+        position = np.array(
+            [FEATURE_POSITIONS.index(p.position) if p and p.position in FEATURE_POSITIONS else -1 for p in players],
+            dtype=np.int8,
+        )
+        group = np.where(table.present["pitching"][rows], PITCHERS, HITTERS).astype(np.int8)
+        return {"raw": raw, "position": position, "group": group}
+
+    def _materialize(
+        self, season: int, rows: np.ndarray, version: str, previous: Optional[FeatureMatrix], dirty: Set[int]
+    ) -> FeatureMatrix:
+        table = self.table
+        player_id = table.player_id[rows].astype(np.int64)
+        row_version = table.row_version[rows]
+        n = len(rows)
+
+        raw = np.empty((n, len(FEATURE_COLUMNS)), dtype=np.float32)
+        position = np.empty(n, dtype=np.int8)
+        group = np.empty(n, dtype=np.int8)
+        reuse = np.zeros(n, dtype=bool)
+        if previous is not None and previous.names == FEATURE_NAMES and len(previous):
+            old = previous.index(player_id)
+            reuse = (old >= 0) & (previous.row_version[np.maximum(old, 0)] == row_version)
+            if dirty:
+                reuse &= ~np.isin(player_id, list(dirty))
+            kept = old[reuse]
+            raw[reuse] = previous.raw[kept]
+            position[reuse] = previous.position[kept]
+            group[reuse] = previous.group[kept]
+        changed = np.flatnonzero(~reuse)
+        if len(changed):
+            extracted = self._extract(season, rows[changed])
+            raw[changed] = extracted["raw"]
+            position[changed] = extracted["position"]
+            group[changed] = extracted["group"]
+
+        # Standardize each column within the season's hitters and pitchers
+        features = np.zeros_like(raw)
+        mean = np.full((2, raw.shape[1]), np.nan)
+        std = np.full((2, raw.shape[1]), np.nan)
+        for g in (HITTERS, PITCHERS):
+            members = group == g
+            if not members.any():
+                continue
+            values = raw[members].astype(np.float64)
+            with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                mean[g] = np.nanmean(values, axis=0)
+                std[g] = np.nanstd(values, axis=0)
+                z = (values - mean[g]) / np.where(std[g] > 0, std[g], 1)
+            features[members] = np.nan_to_num(z, nan=0.0)
+
+        season_dir = self.root / f"season={season}"
+        path = season_dir / version
+        scratch = season_dir / f".{version}-{os.getpid()}.tmp"
+        shutil.rmtree(scratch, ignore_errors=True)
+        scratch.mkdir(parents=True)
+        for name, array in (
+            ("player_id", player_id),
+            ("rows", rows.astype(np.int64)),
+            ("row_version", row_version),
+            ("position", position),
+            ("group", group),
+            ("raw", raw),
+            ("features", features),
+        ):
+            np.save(scratch / f"{name}.npy", array)
+        with open(scratch / "meta.json", "w") as f:
+            json.dump({
+                "names": FEATURE_NAMES,
+                "mean": np.where(np.isnan(mean), None, mean).tolist(),
+                "std": np.where(np.isnan(std), None, std).tolist(),
+                "reused_rows": int(reuse.sum()),
+            }, f)
+        try:
+            os.rename(scratch, path)
+        except OSError:
+            # Another worker published the same version first
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        pointer = season_dir / f"{CURRENT_FILE}.{os.getpid()}.tmp"
+        pointer.write_text(version)
+        os.replace(pointer, season_dir / CURRENT_FILE)
+        self._prune(season_dir)
+        return FeatureMatrix(path, season, version)
+
+    @staticmethod
+    def _prune(season_dir: Path) -> None:
+        """
+        Drop a season's older versions and the scratch directories of exited processes.
+
+        The current version and the newest others up to KEEP_VERSIONS are
+        kept. Mapped files stay readable after unlink, so pruning is safe for
+        workers still reading an older version.
+        """
+        try:
+            current = (season_dir / CURRENT_FILE).read_text().strip()
+        except FileNotFoundError:
+            current = None
+        versions = []
+        for path in season_dir.iterdir():
+            if not path.is_dir():
+                continue
+            if path.name.startswith("."):
+                pid = path.name[:-len(".tmp")].rpartition("-")[2]
+                if path.name.endswith(".tmp") and pid.isdigit() and not _process_alive(int(pid)):
+                    shutil.rmtree(path, ignore_errors=True)
+            elif path.name != current:
+                try:
+                    versions.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+        keep = KEEP_VERSIONS - (current is not None)
+        for _, stale in sorted(versions, reverse=True)[max(keep, 0):]:
+            shutil.rmtree(stale, ignore_errors=True)
@@ -0,0 +1,278 @@
+from bisect import bisect_left, insort
+from datetime import date
+from typing import List, Optional, Dict, Tuple
+import numpy as np
+from app.services.stats_store import SeasonStatsTable, innings_to_outs
+
+# Leaderboard categories: name -> (stat category, field, lower is better)
+LEADER_CATEGORIES = {
+    "HR": ("batting", "home_runs", False),
+    "AVG": ("batting", "batting_average", False),
+    "RBI": ("batting", "runs_batted_in", False),
+    "R": ("batting", "runs", False),
+    "SB": ("batting", "stolen_bases", False),
+    "H": ("batting", "hits", False),
+    "OBP": ("batting", "on_base_percentage", False),
+    "SLG": ("batting", "slugging_percentage", False),
+    "OPS": ("batting", "on_base_plus_slugging", False),
+    "wOBA": ("batting", "weighted_on_base_average", False),
+    "ERA": ("pitching", "earned_run_average", True),
+    "K": ("pitching", "strikeouts", False),
+    "W": ("pitching", "wins", False),
+    "SV": ("pitching", "saves", False),
+    "WHIP": ("pitching", "walks_and_hits_per_inning_pitched", True),
+    "FIP": ("pitching", "fielding_independent_pitching", True),
+    "K/9": ("pitching", "strikeouts_per_nine", False),
+}
+
+# Rate categories rank only players meeting the playing-time qualifier
+RATE_CATEGORIES = {"AVG", "OBP", "SLG", "OPS", "wOBA", "ERA", "WHIP", "FIP", "K/9"}
+
+# Qualifiers: 3.1 plate appearances / 1 inning pitched (3 outs) per team game
+PA_PER_TEAM_GAME = 3.1
+OUTS_PER_TEAM_GAME = 3
+
+# Games credited to every team in seasons without tracked game counts
+FULL_SEASON_GAMES = 162
+
+# Entries kept per leaderboard; larger requests fall back to a full scan
+LEADERBOARD_SIZE = 100
+
+
+class TeamGamesPlayed:
+    """
+    Games played to date per team, tracked for in-progress seasons.
+
+    Counts are kept in one array per season indexed by the stats table's team
+    codes, so the games of every player's team are gathered in a single take.
+    Seasons without tracked games are treated as complete.
+    """
+
+    def __init__(self, table: SeasonStatsTable):
+        self.table = table
+        self._games: Dict[int, np.ndarray] = {}
+        self.version: Dict[int, int] = {}
+
+    def _season_counts(self, season: int) -> np.ndarray:
+        counts = self._games.get(season, np.zeros(0, dtype=np.int16))
+        if len(counts) < len(self.table.teams):
+            counts = np.concatenate([counts, np.zeros(len(self.table.teams) - len(counts), dtype=np.int16)])
+        self._games[season] = counts
+        return counts
+
+    def record_games(self, season: int, team_ids: List[str]) -> None:
+        """
+        Credit one game played to each listed team.
+
+        Args:
+            season: Season year
+            team_ids: Teams that played (a team appears once per game it played)
+        """
+        codes = [self.table.team_code(team_id) for team_id in team_ids]
+        counts = self._season_counts(season)
+        np.add.at(counts, codes, 1)
+        self.version[season] = self.version.get(season, 0) + 1
+
+    def set_games(self, season: int, team_id: str, games: int) -> None:
+        """Set a team's games played outright (e.g., when loading standings)."""
+        code = self.table.team_code(team_id)
+        self._season_counts(season)[code] = games
+        self.version[season] = self.version.get(season, 0) + 1
+
+    def games(self, season: int, codes: np.ndarray) -> np.ndarray:
+        """
+        Return games played for an array of team codes.
+
+        Lines without a team are held to the most games any team has played.
+
+        Args:
+            season: Season year
+            codes: Team codes (-1 for unknown)
+
+        Returns:
+            Array of games played, aligned with codes
+        """
+        if season not in self._games:
+            return np.full(len(codes), FULL_SEASON_GAMES)
+        counts = self._season_counts(season).astype(np.int64)
+        most = counts.max() if len(counts) else 0
+        # Code -1 picks the appended maximum
+        return np.append(counts, most)[codes]
+
+
+class TopK:
+    """
+    Bounded, sorted top-K list for one (season, category) leaderboard.
+
+    Entries are (score, player_id) pairs where a lower score ranks higher, so
+    descending stats are stored negated. Once the board has dropped entries
+    past its capacity it can no longer tell who should fill a vacated spot;
+    such updates mark it stale so the next read rebuilds it.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        entries: List[Tuple[float, int]],
+        complete: bool,
+        games_version: int = 0,
+    ):
+        self.capacity = capacity
+        self.games_version = games_version
+        self.entries = sorted(entries)
+        self.scores = {pid: score for score, pid in self.entries}
+        self.complete = complete
+        self.stale = False
+        self.last_updated = date.today().isoformat()
+
+    def update(self, player_id: int, score: Optional[float]) -> None:
+        """
+        Apply a changed line for one player.
+
+        Args:
+            player_id: The player's ID
+            score: New ranking score, or None if the player no longer qualifies
+        """
+        old = self.scores.pop(player_id, None)
+        if old is not None:
+            del self.entries[bisect_left(self.entries, (old, player_id))]
+        self.last_updated = date.today().isoformat()
+
+        entry = None if score is None else (score, player_id)
+        if old is not None and not self.complete:
+            # Players outside the board may now outrank the updated one
+            if entry is None or not self.entries or entry > self.entries[-1]:
+                self.stale = True
+                return
+
+        if entry is None:
+            return
+        if len(self.entries) < self.capacity or entry < self.entries[-1]:
+            insort(self.entries, entry)
+            self.scores[player_id] = score
+            if len(self.entries) > self.capacity:
+                _, dropped = self.entries.pop()
+                del self.scores[dropped]
+                self.complete = False
+        else:
+            self.complete = False
+
+
+class LeaderboardIndex:
+    """
+    Maintained per-(season, category) leaderboards over a SeasonStatsTable.
+
+    Boards are built on first request with an argpartition top-K over the
+    season's column and afterwards follow every upserted line, so reads only
+    slice an already sorted list. Rate boards also depend on team games played,
+    so they are rebuilt on the first read after the season's game counts move.
+    """
+
+    def __init__(self, table: SeasonStatsTable, capacity: int = LEADERBOARD_SIZE):
+        self.table = table
+        self.capacity = capacity
+        self.team_games = TeamGamesPlayed(table)
+        self._boards: Dict[Tuple[int, str], TopK] = {}
+
+    def qualified(self, season: int, stat_category: str, rows: np.ndarray) -> np.ndarray:
+        """
+        Vectorized playing-time qualification check.
+
+        Args:
+            season: Season year
+            stat_category: Stat category, batting or pitching
+            rows: Table rows to check (all from the season)
+
+        Returns:
+            Boolean array aligned with rows
+        """
+        games = self.team_games.games(season, self.table.team[rows])
+        present = self.table.present[stat_category][rows]
+        if stat_category == "batting":
+            plate_appearances = self.table.column("batting", "plate_appearances")[rows]
+            return present & (plate_appearances >= PA_PER_TEAM_GAME * games)
+        innings = self.table.column("pitching", "innings_pitched")[rows].astype(np.float64)
+        outs = innings_to_outs(np.nan_to_num(innings))
+        return present & (outs >= OUTS_PER_TEAM_GAME * games)
+
+    def _mask(self, season: int, category: str) -> Optional[np.ndarray]:
+        """Qualification mask over the table's filled rows, or None for counting stats."""
+        if category not in RATE_CATEGORIES:
+            return None
+        rows = self.table.season_rows(season)
+        mask = np.zeros(self.table.n_rows, dtype=bool)
+        mask[rows] = self.qualified(season, LEADER_CATEGORIES[category][0], rows)
+        return mask
+
+    def _score(self, row: int, category: str) -> Optional[float]:
+        """Return the ranking score of a row in a category, or None if it has no value."""
+        stat_category, field, ascending = LEADER_CATEGORIES[category]
+        if not self.table.present[stat_category][row]:
+            return None
+        if category in RATE_CATEGORIES:
+            season = int(self.table.season[row])
+            if not self.qualified(season, stat_category, np.array([row]))[0]:
+                return None
+        value = float(self.table.column(stat_category, field)[row])
+        if np.isnan(value):
+            return None
+        return value if ascending else -value
+
+    def _build(self, season: int, category: str) -> TopK:
+        stat_category, field, ascending = LEADER_CATEGORIES[category]
+        games_version = self.team_games.version.get(season, 0)
+        top = self.table.leaders(
+            season, stat_category, field, k=self.capacity, ascending=ascending,
+            mask=self._mask(season, category)
+        )
+        entries = [(value if ascending else -value, pid) for pid, value in top]
+        board = TopK(self.capacity, entries, len(entries) < self.capacity, games_version)
+        self._boards[(season, category)] = board
+        return board
+
+    def record(self, row: int) -> None:
+        """
+        Fold an upserted table row into the built leaderboards of its season.
+
+        Args:
+            row: Row index returned by SeasonStatsTable.upsert
+        """
+        season = int(self.table.season[row])
+        player_id = int(self.table.player_id[row])
+        for category in LEADER_CATEGORIES:
+            board = self._boards.get((season, category))
+            if board is not None:
+                board.update(player_id, self._score(row, category))
+
+    def top(self, season: int, category: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Return the leaders of a category.
+
+        Args:
+            season: Season year
+            category: Leaderboard category (key of LEADER_CATEGORIES)
+            k: Number of leaders to return
+
+        Returns:
+            List of (player_id, value) tuples, best first
+        """
+        stat_category, field, ascending = LEADER_CATEGORIES[category]
+        if k > self.capacity:
+            return self.table.leaders(
+                season, stat_category, field, k=k, ascending=ascending,
+                mask=self._mask(season, category)
+            )
+
+        board = self._boards.get((season, category))
+        if (
+            board is None
+            or board.stale
+            or (category in RATE_CATEGORIES and board.games_version != self.team_games.version.get(season, 0))
+        ):
+            board = self._build(season, category)
+        return [(pid, score if ascending else -score) for score, pid in board.entries[:k]]
+
+    def last_updated(self, season: int, category: str) -> str:
+        """Return the date a leaderboard last changed."""
+        board = self._boards.get((season, category))
+        return board.last_updated if board is not None else date.today().isoformat()
@@ -0,0 +1,276 @@
+from collections import deque
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple
+import os
+import pickle
+import sys
+import threading
+import time
+import numpy as np
+
+try:
+    import joblib
+except ImportError:  # joblib ships with scikit-learn; plain pickles work without it
+    joblib = None
+
+# Default location of serialized models: <MODEL_DIR>/<name>/<version>/model.{joblib,pkl}
+MODEL_DIR = Path(os.environ.get("MLB_MODEL_DIR", Path(__file__).resolve().parents[2] / "data" / "models"))
+
+# Artifact file names tried in order inside a version directory
+ARTIFACT_NAMES = ("model.joblib", "model.pkl")
+
+# File inside a model directory naming its active version
+ACTIVE_FILE = "ACTIVE"
+
+# Inference calls kept per model for latency percentiles
+LATENCY_WINDOW = 1024
+
+
+def _deep_nbytes(obj: Any, seen: Optional[set] = None, depth: int = 0) -> int:
+    """Estimate the memory held by a model object and the arrays it references."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or depth > 8:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + (_deep_nbytes(obj.base, seen, depth + 1) if obj.base is not None else 0)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_nbytes(k, seen, depth + 1) + _deep_nbytes(v, seen, depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_nbytes(item, seen, depth + 1) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_nbytes(vars(obj), seen, depth + 1)
+    return size
+
+
+class LoadedModel:
+    """A resident model version with its load cost and inference latency record."""
+
+    def __init__(self, name: str, version: str, model: Any, source: str, load_seconds: float):
+        self.name = name
+        self.version = version
+        self.model = model
+        self.source = source
+        self.load_seconds = load_seconds
+        self.memory_bytes = _deep_nbytes(model)
+        self.calls = 0
+        self.rows = 0
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def predict(self, *args, rows: int = 1, **kwargs) -> Any:
+        """
+        Run the model's predict method and record its latency.
+
+        Args:
+            rows: Number of players scored by the call (for per-row throughput)
+
+        Returns:
+            Whatever the model's predict returns
+        """
+        start = time.perf_counter()
+        result = self.model.predict(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.calls += 1
+            self.rows += rows
+            self._latencies.append(elapsed)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load time, memory footprint and latency percentiles."""
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+        return {
+            "name": self.name,
+            "version": self.version,
+            "source": self.source,
+            "load_seconds": round(self.load_seconds, 6),
+            "memory_bytes": self.memory_bytes,
+            "calls": self.calls,
+            "rows": self.rows,
+            "mean_latency_ms": round(float(latencies.mean()), 4) if len(latencies) else None,
+            "p50_latency_ms": round(float(np.percentile(latencies, 50)), 4) if len(latencies) else None,
+            "p95_latency_ms": round(float(np.percentile(latencies, 95)), 4) if len(latencies) else None,
+        }
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of prediction models.
+
+    Serialized models are loaded from the model directory on first use and kept
+    resident, so every request shares one instance per version. Built-in models
+    can be registered in memory as fallbacks. Activating a version loads it
+    first and then swaps the active reference in one assignment, so in-flight
+    requests finish on the version they started with.
+    """
+
+    def __init__(self, model_dir: Path = MODEL_DIR):
+        self.model_dir = Path(model_dir)
+        self._builtin: Dict[Tuple[str, str], Any] = {}
+        self._loaded: Dict[Tuple[str, str], LoadedModel] = {}
+        self._active: Dict[str, LoadedModel] = {}
+        self._defaults: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, version: str, model: Any, default: bool = False) -> None:
+        """
+        Register an in-memory model version.
+
+        Args:
+            name: Model name (e.g., "performance")
+            version: Version label
+            model: Object with a predict method
+            default: Use this version when no version has been activated
+        """
+        with self._lock:
+            self._builtin[(name, version)] = model
+            if default:
+                self._defaults[name] = version
+
+    def _artifact(self, name: str, version: str) -> Optional[Path]:
+        for filename in ARTIFACT_NAMES:
+            path = self.model_dir / name / version / filename
+            if path.is_file():
+                return path
+        return None
+
+    def versions(self, name: str) -> List[str]:
+        """Return the known versions of a model, on disk and built in."""
+        on_disk = set()
+        model_path = self.model_dir / name
+        if model_path.is_dir():
+            on_disk = {p.name for p in model_path.iterdir() if p.is_dir() and self._artifact(name, p.name)}
+        built_in = {v for n, v in self._builtin if n == name}
+        return sorted(on_disk | built_in)
+
+    def names(self) -> List[str]:
+        """Return the names of all known models."""
+        on_disk = set()
+        if self.model_dir.is_dir():
+            on_disk = {p.name for p in self.model_dir.iterdir() if p.is_dir()}
+        return sorted(on_disk | {n for n, _ in self._builtin})
+
+    def load(self, name: str, version: str) -> LoadedModel:
+        """
+        Return a resident model version, loading it on first use.
+
+        Raises:
+            KeyError: If the version is neither on disk nor built in
+        """
+        key = (name, version)
+        loaded = self._loaded.get(key)
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            loaded = self._loaded.get(key)
+            if loaded is not None:
+                return loaded
+
+            start = time.perf_counter()
+            path = self._artifact(name, version)
+            if path is not None:
+                if path.suffix == ".joblib":
+                    if joblib is None:
+                        raise RuntimeError(f"joblib is required to load {path}")
+                    model = joblib.load(path)
+                else:
+                    with open(path, "rb") as f:
+                        model = pickle.load(f)
+                source = str(path)
+            elif key in self._builtin:
+                model = self._builtin[key]
+                source = "builtin"
+            else:
+                raise KeyError(f"Unknown model version {name}:{version}")
+
+            loaded = LoadedModel(name, version, model, source, time.perf_counter() - start)
+            self._loaded[key] = loaded
+            return loaded
+
+    def _active_file(self, name: str) -> Path:
+        return self.model_dir / name / ACTIVE_FILE
+
+    def active(self, name: str) -> LoadedModel:
+        """
+        Return the active version of a model.
+
+        The version named in the model directory's ACTIVE file wins, then the
+        built-in default, then the newest version on disk.
+
+        Raises:
+            KeyError: If the model has no versions
+        """
+        loaded = self._active.get(name)
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            if name in self._active:
+                return self._active[name]
+            version = None
+            active_file = self._active_file(name)
+            if active_file.is_file():
+                version = active_file.read_text().strip() or None
+            if version is None:
+                version = self._defaults.get(name)
+            if version is None:
+                versions = self.versions(name)
+                if not versions:
+                    raise KeyError(f"Unknown model {name}")
+                version = versions[-1]
+            self._active[name] = self.load(name, version)
+            return self._active[name]
+
+    def activate(self, name: str, version: str, persist: bool = True) -> LoadedModel:
+        """
+        Make a version the active one without restarting the server.
+
+        The version is loaded (warmed) before the swap, and the choice is written
+        to the ACTIVE file by rename so it survives restarts.
+
+        Args:
+            name: Model name
+            version: Version to activate
+            persist: Record the choice in the model directory
+
+        Returns:
+            The newly active model
+
+        Raises:
+            KeyError: If the version does not exist
+        """
+        loaded = self.load(name, version)
+        with self._lock:
+            if persist and (self.model_dir / name).is_dir():
+                active_file = self._active_file(name)
+                scratch = active_file.with_name(ACTIVE_FILE + ".tmp")
+                scratch.write_text(version)
+                os.replace(scratch, active_file)
+            self._active[name] = loaded
+        return loaded
+
+    def unload(self, name: str, version: str) -> bool:
+        """Drop a resident version unless it is active. Returns True if it was dropped."""
+        with self._lock:
+            active = self._active.get(name)
+            if active is not None and active.version == version:
+                return False
+            return self._loaded.pop((name, version), None) is not None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-version status and statistics for every known model."""
+        report = []
+        for name in self.names():
+            active = self._active.get(name)
+            for version in self.versions(name):
+                loaded = self._loaded.get((name, version))
+                entry = loaded.stats() if loaded else {"name": name, "version": version}
+                entry["loaded"] = loaded is not None
+                entry["active"] = active is not None and active.version == version
+                report.append(entry)
+        return report
@@ -0,0 +1,272 @@
+from bisect import bisect_left, insort
+from collections import Counter
+import heapq
+from typing import List, Dict, Optional, Set, Tuple
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Match types in ranking order, with the base score reported for each
+MATCH_SCORES = {
+    "exact": 1.0,
+    "prefix": 0.9,
+    "token_prefix": 0.8,
+    "substring": 0.6,
+    "fuzzy": 0.5,
+}
+
+# Query tokens shorter than this are too short for typo tolerance and must prefix a name token
+MIN_FUZZY_TOKEN = 3
+
+# Trigram similarity a fuzzy token match needs at least, however short the tokens
+MIN_TOKEN_SIMILARITY = 0.25
+
+
+def fold_name(text: str) -> str:
+    """
+    Normalize a name for searching: strip accents, case-fold and collapse punctuation.
+
+    Args:
+        text: Raw name or query text
+
+    Returns:
+        Folded text, e.g. "Acuña Jr." -> "acuna jr"
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def _trigrams(folded: str) -> Set[str]:
+    """Return the trigrams of a folded name, padded so word starts count."""
+    padded = f"  {folded} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameSearchIndex:
+    """
+    In-memory search index over player names.
+
+    Names are folded once when indexed. Prefix lookups bisect a sorted token list,
+    substring lookups intersect trigram posting sets, and typo-tolerant lookups
+    compare each query token with the distinct name tokens by trigram Dice
+    similarity.
+    """
+
+    def __init__(
+        self,
+        fuzzy_threshold: float = 0.45,
+        max_prefix_candidates: int = 500,
+    ):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_prefix_candidates = max_prefix_candidates
+        self._names: Dict[int, str] = {}
+        self._tokens: List[Tuple[str, int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        # Distinct name tokens: their owners, trigram counts, and trigram postings
+        self._token_owners: Dict[str, Set[int]] = {}
+        self._token_gram_counts: Dict[str, int] = {}
+        self._token_postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, player_id: int, name: str) -> None:
+        """Index (or re-index) a player's name."""
+        if player_id in self._names:
+            self.remove(player_id)
+
+        folded = fold_name(name)
+        grams = _trigrams(folded)
+        self._names[player_id] = folded
+        for token in set(folded.split()):
+            insort(self._tokens, (token, player_id))
+            owners = self._token_owners.setdefault(token, set())
+            if not owners:
+                token_grams = _trigrams(token)
+                self._token_gram_counts[token] = len(token_grams)
+                for gram in token_grams:
+                    self._token_postings.setdefault(gram, set()).add(token)
+            owners.add(player_id)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(player_id)
+
+    def remove(self, player_id: int) -> None:
+        """Drop a player from the index if present."""
+        folded = self._names.pop(player_id, None)
+        if folded is None:
+            return
+
+        for token in set(folded.split()):
+            pos = bisect_left(self._tokens, (token, player_id))
+            if pos < len(self._tokens) and self._tokens[pos] == (token, player_id):
+                del self._tokens[pos]
+            owners = self._token_owners[token]
+            owners.discard(player_id)
+            if not owners:
+                del self._token_owners[token], self._token_gram_counts[token]
+                for gram in _trigrams(token):
+                    tokens = self._token_postings[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._token_postings[gram]
+        for gram in _trigrams(folded):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(player_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Return the slice of the token list whose tokens start with prefix."""
+        lo = bisect_left(self._tokens, (prefix,))
+        hi = bisect_left(self._tokens, (prefix + "\uffff",))
+        return lo, hi
+
+    def _token_prefix_ids(self, tokens: List[str]) -> Set[int]:
+        """IDs whose name has a token starting with each of the query tokens."""
+        # Expand the most selective token from the token list, verify the rest
+        ranges = sorted(
+            ((self._prefix_range(t), t) for t in tokens),
+            key=lambda r: r[0][1] - r[0][0],
+        )
+        (lo, hi), _ = ranges[0]
+        # One- or two-letter prefixes can cover much of the league; rank a bounded sample
+        hi = min(hi, lo + self.max_prefix_candidates)
+        ids = {pid for _, pid in self._tokens[lo:hi]}
+        for _, token in ranges[1:]:
+            ids = {
+                pid for pid in ids
+                if any(t.startswith(token) for t in self._names[pid].split())
+            }
+        return ids
+
+    def substring_ids(self, query: str) -> Set[int]:
+        """
+        Return the IDs of all names containing the query (after folding).
+
+        Args:
+            query: Raw query text
+
+        Returns:
+            Set of matching player IDs
+        """
+        folded = fold_name(query)
+        if not folded:
+            return set(self._names)
+        if len(folded) < 3:
+            return {pid for pid, name in self._names.items() if folded in name}
+
+        grams = [folded[i : i + 3] for i in range(len(folded) - 2)]
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        if not postings[0]:
+            return set()
+        candidates = set.intersection(*postings)
+        return {pid for pid in candidates if folded in self._names[pid]}
+
+    def _token_threshold(self, length: int) -> float:
+        """
+        Trigram similarity two tokens need when the longer has length characters.
+
+        One adjacent transposition inside a word of length L leaves a Dice
+        similarity of (L - 3) / (L + 1), so that is accepted; long tokens are
+        capped at fuzzy_threshold, which also admits a second typo.
+        """
+        return max(MIN_TOKEN_SIMILARITY, min(self.fuzzy_threshold, (length - 3) / (length + 1)))
+
+    def _similar_tokens(self, token: str) -> Dict[str, float]:
+        """Return the name tokens within typo distance of a query token, with their Dice similarity."""
+        grams = _trigrams(token)
+        counts: Counter = Counter()
+        for gram in grams:
+            counts.update(self._token_postings.get(gram, ()))
+
+        similar = {}
+        for name_token, shared in counts.items():
+            dice = 2 * shared / (len(grams) + self._token_gram_counts[name_token])
+            # Tolerance for float rounding at the exact one-transposition similarity
+            if dice >= self._token_threshold(max(len(token), len(name_token))) - 1e-9:
+                similar[name_token] = dice
+        return similar
+
+    def _fuzzy(self, folded: str, exclude: Set[int], limit: int) -> List[Tuple[float, int]]:
+        """
+        Rank names whose tokens match every query token up to typos.
+
+        Each query token is scored against each distinct name token by trigram
+        Dice similarity. A name matches when every query token has a similar
+        token in it (short query tokens must prefix one instead). Its score is
+        the mean of the best similarity per query token.
+        """
+        tokens = folded.split()
+        fuzzy_tokens = [t for t in tokens if len(t) >= MIN_FUZZY_TOKEN]
+        if not fuzzy_tokens:
+            return []
+
+        totals: Optional[Dict[int, float]] = None
+        for token in fuzzy_tokens:
+            best: Dict[int, float] = {}
+            for name_token, similarity in self._similar_tokens(token).items():
+                for pid in self._token_owners[name_token]:
+                    if similarity > best.get(pid, 0.0):
+                        best[pid] = similarity
+            if totals is None:
+                totals = best
+            else:
+                totals = {pid: totals[pid] + similarity for pid, similarity in best.items() if pid in totals}
+            if not totals:
+                return []
+
+        short = [t for t in tokens if len(t) < MIN_FUZZY_TOKEN]
+        scored = []
+        for pid, total in totals.items():
+            if pid in exclude:
+                continue
+            name_tokens = self._names[pid].split()
+            if all(any(n.startswith(t) for n in name_tokens) for t in short):
+                scored.append(((total + len(short)) / len(tokens), pid))
+        names = self._names
+        return heapq.nsmallest(limit, scored, key=lambda s: (-s[0], len(names[s[1]]), s[1]))
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float, str]]:
+        """
+        Search names ranked by match quality.
+
+        Exact matches rank first, then full-name prefixes, token prefixes,
+        substrings and finally typo-tolerant trigram matches.
+
+        Args:
+            query: Raw query text
+            limit: Maximum number of results
+
+        Returns:
+            List of (player_id, score, match_type) tuples, best first
+        """
+        folded = fold_name(query)
+        if not folded or limit <= 0:
+            return []
+
+        ranked: List[Tuple[int, float, str]] = []
+        seen: Set[int] = set()
+
+        def take(ids, match_type: str) -> None:
+            names = self._names
+            tier = [pid for pid in ids if pid not in seen]
+            best = heapq.nsmallest(limit - len(ranked), tier, key=lambda pid: (len(names[pid]), pid))
+            for pid in best:
+                ranked.append((pid, MATCH_SCORES[match_type], match_type))
+                seen.add(pid)
+
+        prefix_ids = self._token_prefix_ids(folded.split())
+        take((pid for pid in prefix_ids if self._names[pid] == folded), "exact")
+        take((pid for pid in prefix_ids if self._names[pid].startswith(folded)), "prefix")
+        if len(ranked) < limit:
+            take(prefix_ids, "token_prefix")
+        if len(ranked) < limit:
+            take(self.substring_ids(folded), "substring")
+        if len(ranked) < limit:
+            for similarity, pid in self._fuzzy(folded, seen, limit - len(ranked)):
+                ranked.append((pid, round(MATCH_SCORES["fuzzy"] * similarity, 4), "fuzzy"))
+
+        return ranked[:limit]
@@ -0,0 +1,44 @@
+from typing import Any
+import base64
+import binascii
+import json
+
+
+def encode_cursor(order_by: str, key: Any) -> str:
+    """
+    Encode the sort key of the last returned item as an opaque cursor.
+
+    Args:
+        order_by: Sort order the cursor belongs to (e.g., "id" or "name")
+        key: Sort key of the last item on the page (JSON-serializable)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([order_by, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, order_by: str) -> Any:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        order_by: Sort order of the current request
+
+    Returns:
+        The sort key stored in the cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if cursor_order != order_by:
+        raise ValueError(f"Cursor was issued for order_by={cursor_order}")
+    return key
@@ -0,0 +1,197 @@
+from typing import Optional, Dict, Any, Tuple
+import numpy as np
+from app.services.stats_store import SeasonStatsTable
+from app.services.leaderboard import LeaderboardIndex
+
+# Advanced metrics per metric type: name -> (stat category, field)
+ADVANCED_METRICS = {
+    "batting": {
+        "wOBA": ("batting", "weighted_on_base_average"),
+        "wRC+": ("batting", "weighted_runs_created_plus"),
+        "OPS": ("batting", "on_base_plus_slugging"),
+        "ISO": ("batting", "isolated_power"),
+        "BABIP": ("batting", "batting_average_on_balls_in_play"),
+        "BB%": ("batting", "walk_percentage"),
+        "K%": ("batting", "strikeout_percentage"),
+        "EV": ("statcast", "average_exit_velocity"),
+        "Barrel%": ("statcast", "barrel_percentage"),
+        "Hard%": ("statcast", "hard_hit_percentage"),
+        "Sprint Speed": ("statcast", "average_sprint_speed"),
+    },
+    "pitching": {
+        "ERA": ("pitching", "earned_run_average"),
+        "FIP": ("pitching", "fielding_independent_pitching"),
+        "xFIP": ("pitching", "expected_fielding_independent_pitching"),
+        "WHIP": ("pitching", "walks_and_hits_per_inning_pitched"),
+        "K/9": ("pitching", "strikeouts_per_nine"),
+        "BB/9": ("pitching", "walks_per_nine"),
+        "HR/9": ("pitching", "home_runs_per_nine"),
+        "K%": ("pitching", "strikeout_percentage"),
+        "BB%": ("pitching", "walk_percentage"),
+        "GB%": ("pitching", "ground_ball_percentage"),
+        "LOB%": ("pitching", "left_on_base_percentage"),
+        "Velo": ("statcast", "average_fastball_velocity"),
+        "Whiff%": ("statcast", "whiff_percentage"),
+        "Chase%": ("statcast", "chase_percentage"),
+    },
+    "fielding": {
+        "DRS": ("fielding", "defensive_runs_saved"),
+        "UZR": ("fielding", "ultimate_zone_rating"),
+        "OAA": ("fielding", "outs_above_average"),
+        "FLD%": ("fielding", "fielding_percentage"),
+        "E": ("fielding", "errors"),
+    },
+}
+
+# Metrics where a lower value earns a higher percentile
+LOWER_IS_BETTER = {
+    "batting": {"K%"},
+    "pitching": {"ERA", "FIP", "xFIP", "WHIP", "BB/9", "HR/9", "BB%"},
+    "fielding": {"E"},
+}
+
+# Playing-time qualifier per metric type (fielding ranks every fielder)
+QUALIFIERS = {"batting": "batting", "pitching": "pitching", "fielding": None}
+
+
+class PercentileIndex:
+    """
+    League percentile ranks from sorted per-(season, metric_type, metric) arrays.
+
+    Each array holds the values of every qualified player, sorted ascending, so a
+    percentile rank is the binary-searched count of players a value beats. Arrays
+    are built on first use and dropped individually when an ingested line changes
+    that metric (or a player's qualification), so only touched metrics rebuild.
+    """
+
+    def __init__(self, table: SeasonStatsTable, leaders: LeaderboardIndex):
+        self.table = table
+        self.leaders = leaders
+        self._sorted: Dict[Tuple[int, str, str], Tuple[np.ndarray, int]] = {}
+
+    def _qualified(self, season: int, metric_type: str, rows: np.ndarray) -> np.ndarray:
+        qualifier = QUALIFIERS[metric_type]
+        if qualifier is None:
+            return self.table.present[metric_type][rows]
+        return self.leaders.qualified(season, qualifier, rows)
+
+    def sorted_values(self, season: int, metric_type: str, metric: str) -> np.ndarray:
+        """
+        Return the ascending values of a metric over the season's qualified players.
+
+        Args:
+            season: Season year
+            metric_type: batting, pitching, or fielding
+            metric: Metric name (key of ADVANCED_METRICS[metric_type])
+
+        Returns:
+            Sorted float64 array
+        """
+        key = (season, metric_type, metric)
+        games_version = self.leaders.team_games.version.get(season, 0)
+        cached = self._sorted.get(key)
+        if cached is not None and cached[1] == games_version:
+            return cached[0]
+
+        category, field = ADVANCED_METRICS[metric_type][metric]
+        rows = self.table.season_rows(season)
+        rows = rows[self._qualified(season, metric_type, rows) & self.table.present[category][rows]]
+        values = self.table.column(category, field)[rows].astype(np.float64)
+        values = np.sort(values[~np.isnan(values)])
+        self._sorted[key] = (values, games_version)
+        return values
+
+    def percentile_ranks(
+        self,
+        season: int,
+        metric_type: str,
+        metric: str,
+        values: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Rank many values against the league with one searchsorted call per side.
+
+        The percentile rank is the share of qualified players a value beats,
+        counting ties as half: (worse + 0.5 * tied) / n.
+
+        Args:
+            season: Season year
+            metric_type: batting, pitching, or fielding
+            metric: Metric name
+            values: Values to rank
+
+        Returns:
+            Float array of percentiles in [0, 100], NaN where a value is missing
+            or the league has no qualified players
+        """
+        population = self.sorted_values(season, metric_type, metric)
+        values = np.asarray(values, dtype=np.float64)
+        n = len(population)
+        if not n:
+            return np.full(values.shape, np.nan)
+
+        left = np.searchsorted(population, values, side="left")
+        right = np.searchsorted(population, values, side="right")
+        worse = n - right if metric in LOWER_IS_BETTER[metric_type] else left
+        ranks = 100.0 * (worse + 0.5 * (right - left)) / n
+        return np.where(np.isnan(values), np.nan, ranks)
+
+    def player_percentiles(self, row: int, metric_type: str) -> Dict[str, int]:
+        """
+        Return the percentile of every available metric for one table row.
+
+        Args:
+            row: Table row of the player-season
+            metric_type: batting, pitching, or fielding
+
+        Returns:
+            Dictionary of metric name to integer percentile
+        """
+        season = int(self.table.season[row])
+        percentiles = {}
+        for metric, (category, field) in ADVANCED_METRICS[metric_type].items():
+            if not self.table.present[category][row]:
+                continue
+            value = self.table.columns[category][field][row]
+            rank = self.percentile_ranks(season, metric_type, metric, np.array([value]))[0]
+            if not np.isnan(rank):
+                percentiles[metric] = int(round(rank))
+        return percentiles
+
+    def snapshot(self, player_id: int, season: int) -> Optional[Dict[Any, Any]]:
+        """Capture a stored line's qualification and metric values before it is replaced."""
+        row = self.table.row(player_id, season)
+        return None if row is None else self._state(row)
+
+    def _state(self, row: int) -> Dict[Any, Any]:
+        season = int(self.table.season[row])
+        state: Dict[Any, Any] = {}
+        for metric_type, metrics in ADVANCED_METRICS.items():
+            state[metric_type] = bool(self._qualified(season, metric_type, np.array([row]))[0])
+            for metric, (category, field) in metrics.items():
+                present = self.table.present[category][row]
+                state[(metric_type, metric)] = float(self.table.columns[category][field][row]) if present else np.nan
+        return state
+
+    def record(self, row: int, before: Optional[Dict[Any, Any]]) -> None:
+        """
+        Drop the sorted arrays an upserted line touched.
+
+        Args:
+            row: Row index returned by SeasonStatsTable.upsert
+            before: snapshot() of the line taken before the upsert, or None if it is new
+        """
+        season = int(self.table.season[row])
+        after = self._state(row)
+        for metric_type, metrics in ADVANCED_METRICS.items():
+            was_qualified = before is not None and before[metric_type]
+            if not (was_qualified or after[metric_type]):
+                continue
+            for metric in metrics:
+                old = np.nan if before is None else before[(metric_type, metric)]
+                new = after[(metric_type, metric)]
+                changed = was_qualified != after[metric_type] or not (
+                    old == new or (np.isnan(old) and np.isnan(new))
+                )
+                if changed:
+                    self._sorted.pop((season, metric_type, metric), None)
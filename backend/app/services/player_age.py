@@ -0,0 +1,10 @@
+from datetime import date
+from typing import Optional
+import numpy as np
+
+
+def season_age(birth_date: Optional[date], season: int) -> float:
+    """Return a player's baseball age (age on June 30) in a season, NaN if unknown."""
+    if birth_date is None:
+        return np.nan
+    return season - birth_date.year - ((birth_date.month, birth_date.day) > (6, 30))
@@ -1,11 +1,194 @@
-from typing import List, Optional, Dict, Any
-from app.models.player import Player, PlayerCreate, PlayerUpdate
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import List, Optional, Dict, Any, Set, Tuple, Callable, Iterator
+import threading
+from app.models.player import Player, PlayerCreate, PlayerUpdate, PlayerSearchResult
+from app.services.name_index import NameSearchIndex, fold_name
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.entity_versions import entity_versions, PLAYERS, player_key, team_key
 
 # This is a mock implementation. In a real application, you would connect to a database.
 # For now, we'll use an in-memory dictionary to store player data.
 players_db = {}
 next_player_id = 1
 
+# Sort orders for keyset pagination: all IDs, and (folded name, ID) pairs
+player_ids: List[int] = []
+players_by_name: List[Tuple[str, int]] = []
+
+# Secondary indexes over players_db. Each maps a key to a sorted list of player IDs,
+# so filtered listings only touch the players that match.
+players_by_team: Dict[str, List[int]] = {}
+players_by_position: Dict[str, List[int]] = {}
+players_by_team_position: Dict[Tuple[str, str], List[int]] = {}
+
+# The same indexes in (folded name, ID) order, for name-ordered listings
+names_by_team: Dict[str, List[Tuple[str, int]]] = {}
+names_by_position: Dict[str, List[Tuple[str, int]]] = {}
+names_by_team_position: Dict[Tuple[str, str], List[Tuple[str, int]]] = {}
+
+# Accent-folded name index used for name filters and autocomplete
+name_index = NameSearchIndex()
+
+# Name filters recently used by listings, so paging through one runs its substring search once
+NAME_FILTER_CACHE_SIZE = 64
+_name_filters: Dict[str, Tuple[int, Set[int], List[int], List[Tuple[str, int]]]] = {}
+_name_filters_lock = threading.Lock()
+
+
+def _index_keys(player: Player) -> List[Tuple[Dict[Any, List[int]], Dict[Any, List[Tuple[str, int]]], Any]]:
+    """Return the (ID-ordered index, name-ordered index, key) triples a player is filed under."""
+    return [
+        (players_by_team, names_by_team, player.team_id),
+        (players_by_position, names_by_position, player.position),
+        (players_by_team_position, names_by_team_position, (player.team_id, player.position)),
+    ]
+
+
+def _index_player(player: Player) -> None:
+    """Add a player to the secondary indexes."""
+    for ids, names, key in _index_keys(player):
+        insort(ids.setdefault(key, []), player.id)
+        insort(names.setdefault(key, []), (fold_name(player.name), player.id))
+
+
+def _remove_sorted(items: List[Any], item: Any) -> None:
+    """Remove an item from a sorted list if present."""
+    pos = bisect_left(items, item)
+    if pos < len(items) and items[pos] == item:
+        del items[pos]
+
+
+def _unindex_player(player: Player) -> None:
+    """Remove a player from the secondary indexes."""
+    for ids_index, names_index, key in _index_keys(player):
+        for index, entry in ((ids_index, player.id), (names_index, (fold_name(player.name), player.id))):
+            entries = index.get(key)
+            if entries is None:
+                continue
+            _remove_sorted(entries, entry)
+            if not entries:
+                del index[key]
+
+
+def _name_filter(name: str) -> Tuple[Set[int], List[int], List[Tuple[str, int]]]:
+    """
+    Return the players whose name contains name: as a set, in ID order and in name order.
+
+    Results are cached per folded filter until the player list changes.
+    """
+    folded = fold_name(name)
+    version = entity_versions.version([PLAYERS])[0]
+    with _name_filters_lock:
+        cached = _name_filters.get(folded)
+    if cached is not None and cached[0] == version:
+        return cached[1:]
+    
+    ids = name_index.substring_ids(folded)
+    cached = (version, ids, sorted(ids), sorted((fold_name(players_db[pid].name), pid) for pid in ids))
+    with _name_filters_lock:
+        _name_filters.pop(folded, None)
+        _name_filters[folded] = cached
+        while len(_name_filters) > NAME_FILTER_CACHE_SIZE:
+            del _name_filters[next(iter(_name_filters))]
+    return cached[1:]
+
+
+def _page(
+    sequence: List[Any],
+    start: int,
+    skip: int,
+    limit: int,
+    keep: Callable[[Any], bool],
+) -> Tuple[List[Any], bool]:
+    """Collect up to limit matching entries from sequence[start:], after skipping skip of them."""
+    entries = (sequence[i] for i in range(start, len(sequence)))
+    matching = islice((entry for entry in entries if keep(entry)), skip, skip + limit + 1)
+    page = list(matching)
+    return page[:limit], len(page) > limit
+
+
+def get_players_page(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    name: Optional[str] = None,
+    team: Optional[str] = None,
+    position: Optional[str] = None,
+) -> Tuple[List[Player], Optional[str]]:
+    """
+    Retrieve a page of players with optional filtering and keyset pagination.
+    
+    A cursor resumes the listing right after the last player of the previous
+    page by binary search on the sort key, so deep pages cost the same as the
+    first one and results do not shift when players are added or removed.
+    
+    Args:
+        skip: Number of players to skip (applied after the cursor position)
+        limit: Maximum number of players to return
+        cursor: Opaque cursor returned with the previous page
+        order_by: Sort order, "id" or "name" (name ties broken by ID)
+        name: Filter by player name (partial match, accent-insensitive)
+        team: Filter by team ID
+        position: Filter by position
+        
+    Returns:
+        Tuple of (list of Player objects, cursor for the next page or None)
+        
+    Raises:
+        ValueError: If the cursor is invalid or order_by is unknown
+    """
+    if order_by not in ("id", "name"):
+        raise ValueError(f"Unknown order_by: {order_by}")
+    by_name = order_by == "name"
+    
+    # Pick the narrowest index for the team/position filters, kept in the requested order
+    if team and position:
+        candidates = (names_by_team_position if by_name else players_by_team_position).get((team, position), [])
+    elif team:
+        candidates = (names_by_team if by_name else players_by_team).get(team, [])
+    elif position:
+        candidates = (names_by_position if by_name else players_by_position).get(position, [])
+    else:
+        candidates = players_by_name if by_name else player_ids
+    
+    pid_of = (lambda entry: entry[1]) if by_name else (lambda entry: entry)
+    name_ids = None
+    if name:
+        name_ids, ids_in_order, names_in_order = _name_filter(name)
+    
+    # Walk whichever of the name matches and the index candidates is smaller
+    if name_ids is not None and len(name_ids) <= len(candidates):
+        sequence = names_in_order if by_name else ids_in_order
+        keep = lambda entry: (
+            (not team or players_db[pid_of(entry)].team_id == team)
+            and (not position or players_db[pid_of(entry)].position == position)
+        )
+    else:
+        sequence = candidates
+        keep = lambda entry: name_ids is None or pid_of(entry) in name_ids
+    
+    start = 0
+    if cursor:
+        key = decode_cursor(cursor, order_by)
+        if by_name:
+            if not (isinstance(key, list) and len(key) == 2
+                    and isinstance(key[0], str) and isinstance(key[1], int)):
+                raise ValueError("Invalid cursor")
+            key = tuple(key)
+        elif not isinstance(key, int):
+            raise ValueError("Invalid cursor")
+        start = bisect_right(sequence, key)
+    entries, has_more = _page(sequence, start, skip, limit, keep)
+    page = [players_db[pid_of(entry)] for entry in entries]
+    next_key = None
+    if entries:
+        next_key = list(entries[-1]) if by_name else entries[-1]
+    
+    next_cursor = encode_cursor(order_by, next_key) if has_more and next_key is not None else None
+    return page, next_cursor
+
 
 def get_players(
     skip: int = 0,
@@ -20,25 +203,74 @@ def get_players(
     Args:
         skip: Number of players to skip
         limit: Maximum number of players to return
-        name: Filter by player name (partial match)
+        name: Filter by player name (partial match, accent-insensitive)
         team: Filter by team ID
         position: Filter by position
         
     Returns:
         List of Player objects
     """
-    filtered_players = list(players_db.values())
+    players, _ = get_players_page(skip=skip, limit=limit, name=name, team=team, position=position)
+    return players
+
+
+def export_players(
+    name: Optional[str] = None,
+    team: Optional[str] = None,
+    position: Optional[str] = None,
+    chunk_size: int = 1000,
+) -> Iterator[List[Player]]:
+    """
+    Yield every matching player in ID order, a page at a time.
     
-    if name:
-        filtered_players = [p for p in filtered_players if name.lower() in p.name.lower()]
+    Pages are read with the keyset cursor of get_players_page, so each step
+    is a binary search and players added or removed during the export do not
+    shift the pages after them.
     
-    if team:
-        filtered_players = [p for p in filtered_players if p.team_id == team]
+    Args:
+        name: Filter by name (partial match)
+        team: Filter by team ID
+        position: Filter by position
+        chunk_size: Players per yielded page
+        
+    Yields:
+        Lists of up to chunk_size players
+    """
+    cursor = None
+    while True:
+        players, cursor = get_players_page(limit=chunk_size, cursor=cursor, name=name, team=team, position=position)
+        if players:
+            yield players
+        if not cursor:
+            return
+
+
+def search_players(query: str, limit: int = 10) -> List[PlayerSearchResult]:
+    """
+    Search players by name for autocomplete.
     
-    if position:
-        filtered_players = [p for p in filtered_players if p.position == position]
+    Matching ignores case and accents, tolerates typos, and results are ranked
+    exact match first, then prefix, substring and fuzzy matches.
     
-    return filtered_players[skip : skip + limit]
+    Args:
+        query: Name or partial name to search for
+        limit: Maximum number of results to return
+        
+    Returns:
+        List of PlayerSearchResult objects, best match first
+    """
+    results = []
+    for player_id, score, match_type in name_index.search(query, limit):
+        player = players_db[player_id]
+        results.append(PlayerSearchResult(
+            id=player.id,
+            name=player.name,
+            team_id=player.team_id,
+            position=player.position,
+            score=score,
+            match_type=match_type
+        ))
+    return results
 
 
 def get_player(player_id: int) -> Optional[Player]:
@@ -84,7 +316,12 @@ def create_player(player: PlayerCreate) -> Player:
     
     # Add to database
     players_db[next_player_id] = db_player
+    _index_player(db_player)
+    name_index.add(db_player.id, db_player.name)
+    player_ids.append(db_player.id)
+    insort(players_by_name, (fold_name(db_player.name), db_player.id))
     next_player_id += 1
+    entity_versions.bump(PLAYERS, player_key(db_player.id), team_key(db_player.team_id))
     
     return db_player
 
@@ -105,14 +342,28 @@ def update_player(player_id: int, player_update: PlayerUpdate) -> Optional[Playe
     
     # Get current player data
     db_player = players_db[player_id]
+    previous_team = db_player.team_id
+    _unindex_player(db_player)
+    _remove_sorted(players_by_name, (fold_name(db_player.name), player_id))
     
     # Update fields that are provided
     update_data = player_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_player, field, value)
     
+    _index_player(db_player)
+    insort(players_by_name, (fold_name(db_player.name), player_id))
+    if "name" in update_data:
+        name_index.add(player_id, db_player.name)
+    
     # Update the player in the database
     players_db[player_id] = db_player
+    entity_versions.bump(PLAYERS, player_key(player_id), team_key(previous_team), team_key(db_player.team_id))
+    
+    # Position is the only feature input PlayerUpdate can change
+    if "position" in update_data:
+        from app.services.stats_service import feature_store
+        feature_store.invalidate_players([player_id])
     
     return db_player
 
@@ -130,7 +381,15 @@ def delete_player(player_id: int) -> bool:
     if player_id not in players_db:
         return False
     
-    del players_db[player_id]
+    db_player = players_db.pop(player_id)
+    _unindex_player(db_player)
+    _remove_sorted(player_ids, player_id)
+    _remove_sorted(players_by_name, (fold_name(db_player.name), player_id))
+    name_index.remove(player_id)
+    entity_versions.bump(PLAYERS, player_key(player_id), team_key(db_player.team_id))
+    
+    from app.services.stats_service import feature_store
+    feature_store.invalidate_players([player_id])
     return True
 
 
@@ -0,0 +1,384 @@
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+import numpy as np
+from app.services.projection_model import (
+    COUNTING_TARGETS,
+    TARGET_CAPS,
+    TARGET_DECIMALS,
+    MarcelProjectionModel,
+    target_names,
+)
+from app.services.uncertainty import SAMPLING_SD, MIN_PLAYING_TIME
+
+try:
+    import pymc as pm
+except ImportError:  # the conjugate empirical-Bayes fit needs only NumPy
+    pm = None
+
+# Root of the stored draws: <POSTERIOR_DIR>/season=<year>/<group>/<version>/
+POSTERIOR_DIR = Path(os.environ.get("MLB_POSTERIOR_DIR", Path(__file__).resolve().parents[2] / "data" / "posterior"))
+
+# File inside a group directory naming its current version
+CURRENT_FILE = "CURRENT"
+
+# Stored versions kept per season and group (older ones may still be mapped by workers)
+KEEP_VERSIONS = 2
+
+# Posterior draws stored per player
+POSTERIOR_DRAWS = 1000
+
+# Smallest between-player spread allowed, as a share of the league rate
+MIN_TALENT_SPREAD = 0.01
+
+
+def _season_rates(group: str, features: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return observed per-season rates and their precision weights.
+
+    Counting stats become rates per PA/out. The weight of a season is its
+    playing time over the per-unit sampling variance, scaled by the Marcel
+    season weight so recent seasons count more.
+
+    Returns:
+        (rates, weights) arrays of shape (n, seasons, targets); weight 0 where missing
+    """
+    targets = target_names(group)
+    counting = np.array([t in COUNTING_TARGETS for t in targets])
+    playing_time = np.nan_to_num(features["playing_time"])[:, :, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = np.where(counting, features["history"] / playing_time, features["history"])
+    season_weights = np.array(MarcelProjectionModel.WEIGHTS[group]) / MarcelProjectionModel.WEIGHTS[group][0]
+    unit_variance = np.array([SAMPLING_SD[group][t] for t in targets]) ** 2
+    weights = season_weights[None, :, None] * playing_time / unit_variance
+    weights = np.where(np.isfinite(rates) & (playing_time > 0), weights, 0.0)
+    return np.nan_to_num(rates), weights
+
+
+def conjugate_talent_draws(
+    group: str,
+    features: Dict[str, np.ndarray],
+    draws: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Draw true-talent rates from a normal-normal hierarchical model.
+
+    Players' rates are centred on the league rate with a between-player
+    spread estimated from the data (empirical Bayes), so each player's
+    posterior is a closed-form normal.
+
+    Returns:
+        (n, draws, targets) rate draws
+    """
+    rates, weights = _season_rates(group, features)
+    league = features["league_rate"]
+    precision = weights.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        observed = np.where(precision > 0, (rates * weights).sum(axis=1) / precision, league)
+
+    # Between-player variance: spread of observed rates less their sampling variance
+    seen = precision > 0
+    talent_variance = np.empty(len(league[0]) if len(league) else 0)
+    for j in range(len(talent_variance)):
+        column = observed[seen[:, j], j]
+        noise = 1 / precision[seen[:, j], j]
+        floor = (MIN_TALENT_SPREAD * np.nanmean(np.abs(league[:, j]))) ** 2 if len(league) else 0.0
+        estimate = np.var(column) - noise.mean() if len(column) > 1 else 0.0
+        talent_variance[j] = max(estimate, floor, 1e-12)
+
+    posterior_precision = 1 / talent_variance + precision
+    posterior_mean = (league / talent_variance + (rates * weights).sum(axis=1)) / posterior_precision
+    noise = rng.standard_normal((len(league), draws, len(talent_variance)))
+    return posterior_mean[:, None, :] + noise / np.sqrt(posterior_precision)[:, None, :]
+
+
+def pymc_talent_draws(
+    group: str,
+    features: Dict[str, np.ndarray],
+    draws: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Draw true-talent rates by sampling the hierarchical model with PyMC.
+
+    Same model as the conjugate fit, with the league mean and between-player
+    spread given priors instead of point estimates.
+
+    Returns:
+        (n, draws, targets) rate draws
+    """
+    if pm is None:
+        raise RuntimeError("PyMC is not installed; use the conjugate fit")
+    rates, weights = _season_rates(group, features)
+    league = features["league_rate"]
+    n, _, n_targets = rates.shape
+    result = np.empty((n, draws, n_targets))
+    chains = 2
+    for j in range(n_targets):
+        player, season = np.nonzero(weights[:, :, j] > 0)
+        observed = rates[player, season, j]
+        sigma = 1 / np.sqrt(weights[player, season, j])
+        centre = float(np.nanmean(league[:, j]))
+        scale = float(np.std(observed)) if len(observed) > 1 else abs(centre) or 1.0
+        with pm.Model():
+            mu = pm.Normal("mu", mu=centre, sigma=scale)
+            tau = pm.HalfNormal("tau", sigma=scale)
+            offset = pm.Normal("offset", mu=0.0, sigma=1.0, shape=n)
+            theta = pm.Deterministic("theta", mu + tau * offset)
+            pm.Normal("y", mu=theta[player], sigma=sigma, observed=observed)
+            trace = pm.sample(
+                draws=-(-draws // chains),
+                chains=chains,
+                tune=500,
+                progressbar=False,
+                random_seed=int(rng.integers(2**31)),
+            )
+        samples = trace.posterior["theta"].values.reshape(-1, n)[:draws]
+        result[:, :, j] = samples.T
+    return result
+
+
+def predictive_draws(
+    group: str,
+    features: Dict[str, np.ndarray],
+    draws: int = POSTERIOR_DRAWS,
+    method: str = "auto",
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Posterior predictive draws of next season's stat lines.
+
+    Talent draws are aged with the Marcel age curve, scaled to projected
+    playing time for counting stats, and given next season's sampling noise.
+
+    Args:
+        group: batting or pitching
+        features: Feature arrays from build_feature_matrix
+        draws: Draws per player
+        method: "pymc", "conjugate" or "auto" (PyMC when installed)
+        seed: Random seed
+
+    Returns:
+        (n, draws, targets) float32 array
+    """
+    rng = np.random.default_rng(seed)
+    use_pymc = method == "pymc" or (method == "auto" and pm is not None)
+    sampler = pymc_talent_draws if use_pymc else conjugate_talent_draws
+    talent = sampler(group, features, draws, rng)
+
+    marcel = MarcelProjectionModel()
+    targets = target_names(group)
+    counting = np.array([t in COUNTING_TARGETS for t in targets])
+    rates = marcel.age_adjust(group, talent, features["age"])
+    projected_time = marcel.projected_playing_time(group, np.nan_to_num(features["playing_time"]))
+    lines = np.where(counting, rates * projected_time[:, None, None], rates)
+
+    sd = np.array([SAMPLING_SD[group][t] for t in targets])
+    time_next = np.maximum(projected_time, MIN_PLAYING_TIME[group])[:, None, None]
+    lines = lines + rng.standard_normal(lines.shape) * np.where(counting, sd * np.sqrt(time_next), sd / np.sqrt(time_next))
+    caps = np.array([TARGET_CAPS.get(t, np.inf) for t in targets])
+    return np.clip(lines, 0.0, caps).astype(np.float32)
+
+
+class PosteriorDraws:
+    """Memory-mapped draws of one season and group."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.player_ids = np.load(path / "player_ids.npy")
+        # Read-only mapping: no copy, and workers share the page cache
+        self.draws = np.load(path / "draws.npy", mmap_mode="r")
+        with open(path / "meta.json") as f:
+            self.meta = json.load(f)
+
+    def index(self, player_id: int) -> Optional[int]:
+        i = int(np.searchsorted(self.player_ids, player_id))
+        if i < len(self.player_ids) and self.player_ids[i] == player_id:
+            return i
+        return None
+
+
+class PosteriorStore:
+    """
+    Posterior predictive draws per player, stored as float32 .npy files.
+
+    An offline fit writes a new version directory and then swaps the group's
+    CURRENT file by rename. Readers map the current version's draws on first
+    use and remap when CURRENT changes.
+    """
+
+    def __init__(self, root: Path = POSTERIOR_DIR):
+        self.root = Path(root)
+        self._open: Dict[Tuple[int, str], Tuple[float, PosteriorDraws]] = {}
+        self._lock = threading.Lock()
+
+    def _group_dir(self, season: int, group: str) -> Path:
+        return self.root / f"season={season}" / group
+
+    def save(
+        self,
+        season: int,
+        group: str,
+        player_ids: np.ndarray,
+        draws: np.ndarray,
+        meta: Dict[str, Any],
+    ) -> Path:
+        """
+        Write a new version of a season's draws and make it current.
+
+        Args:
+            season: Projected season
+            group: batting or pitching
+            player_ids: Sorted player IDs
+            draws: (players, draws, targets) array
+            meta: Description of the fit (method, targets, ...)
+
+        Returns:
+            Directory of the new version
+        """
+        group_dir = self._group_dir(season, group)
+        version = time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+        path = group_dir / version
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "player_ids.npy", np.asarray(player_ids, dtype=np.int64))
+        np.save(path / "draws.npy", np.ascontiguousarray(draws, dtype=np.float32))
+        with open(path / "meta.json", "w") as f:
+            json.dump(meta, f)
+
+        scratch = group_dir / (CURRENT_FILE + ".tmp")
+        scratch.write_text(version)
+        os.replace(scratch, group_dir / CURRENT_FILE)
+
+        # Mapped files stay readable after unlink, so pruning is safe for live workers
+        versions = sorted(p for p in group_dir.iterdir() if p.is_dir())
+        for old in versions[:-KEEP_VERSIONS]:
+            shutil.rmtree(old, ignore_errors=True)
+        return path
+
+    def load(self, season: int, group: str) -> Optional[PosteriorDraws]:
+        """Return the current draws of a season and group, or None if none are stored."""
+        current = self._group_dir(season, group) / CURRENT_FILE
+        try:
+            stamp = current.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        cached = self._open.get((season, group))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with self._lock:
+            version = current.read_text().strip()
+            draws = PosteriorDraws(current.parent / version)
+            self._open[(season, group)] = (stamp, draws)
+            return draws
+
+    def summarize(
+        self,
+        player_id: int,
+        season: int,
+        group: str,
+        quantiles: List[float],
+        credible: float = 0.9,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Reduce a player's stored draws to means, credible intervals and quantiles.
+
+        Args:
+            player_id: The player's ID
+            season: Projected season
+            group: batting or pitching
+            quantiles: Quantiles to report (each in [0, 1])
+            credible: Mass of the central credible interval
+
+        Returns:
+            Summary dictionary, or None if the player has no stored draws
+        """
+        stored = self.load(season, group)
+        if stored is None:
+            return None
+        i = stored.index(player_id)
+        if i is None:
+            return None
+
+        player_draws = np.asarray(stored.draws[i], dtype=np.float64)
+        tail = (1 - credible) / 2
+        levels = [tail, 1 - tail] + list(quantiles)
+        reduced = np.quantile(player_draws, levels, axis=0)
+        means = player_draws.mean(axis=0)
+
+        stats = {}
+        for j, target in enumerate(stored.meta["targets"]):
+            decimals = TARGET_DECIMALS.get(target, 1) + 1
+            stats[target] = {
+                "mean": round(float(means[j]), decimals),
+                "lower": round(float(reduced[0, j]), decimals),
+                "upper": round(float(reduced[1, j]), decimals),
+                "quantiles": {str(q): round(float(v), decimals) for q, v in zip(quantiles, reduced[2:, j])},
+            }
+        return {
+            "player_id": player_id,
+            "season": season,
+            "method": stored.meta["method"],
+            "draws": int(stored.draws.shape[1]),
+            "credible_mass": credible,
+            "fitted_at": stored.meta["fitted_at"],
+            "stats": stats,
+        }
+
+
+# Process-wide store; each worker process maps the same files
+posterior_store = PosteriorStore()
+
+
+def fit_posteriors(
+    season: int,
+    draws: int = POSTERIOR_DRAWS,
+    method: str = "auto",
+    seed: Optional[int] = None,
+    store: PosteriorStore = posterior_store,
+) -> Dict[str, int]:
+    """
+    Fit the hierarchical model for a season and store every player's draws.
+
+    Args:
+        season: The season year to project
+        draws: Draws per player
+        method: "pymc", "conjugate" or "auto"
+        seed: Random seed
+        store: Destination store
+
+    Returns:
+        Number of players stored per group
+    """
+    from app.services.prediction_service import build_feature_matrix
+
+    stored = {}
+    for group in ("batting", "pitching"):
+        player_ids, features = build_feature_matrix(group, season)
+        if not len(player_ids):
+            continue
+        group_draws = predictive_draws(group, features, draws, method, seed)
+        store.save(season, group, player_ids, group_draws, {
+            "method": "pymc" if method == "pymc" or (method == "auto" and pm is not None) else "conjugate",
+            "targets": target_names(group),
+            "fitted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        stored[group] = len(player_ids)
+    return stored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the hierarchical player model and store posterior draws")
+    parser.add_argument("--season", type=int, required=True, help="Season to project")
+    parser.add_argument("--draws", type=int, default=POSTERIOR_DRAWS, help="Draws per player")
+    parser.add_argument("--method", choices=["auto", "pymc", "conjugate"], default="auto")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    counts = fit_posteriors(args.season, args.draws, args.method, args.seed)
+    print(f"Stored draws for {counts} in {time.perf_counter() - started:.1f}s under {posterior_store.root}")
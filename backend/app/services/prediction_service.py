@@ -1,10 +1,302 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+import threading
+import numpy as np
 from app.models.prediction import PerformancePrediction, ValuationPrediction
+from app.services.projection_model import (
+    BaselineProjectionModel,
+    MarcelProjectionModel,
+    PREDICTION_TARGETS,
+    COUNTING_TARGETS,
+    TARGET_DECIMALS,
+    prediction_intervals,
+    target_names,
+)
+from app.services.model_registry import ModelRegistry, LoadedModel
+from app.services.feature_store import FeatureMatrix, feature_name
+from app.services.uncertainty import lookup_intervals
+from app.services.similarity import SimilarityIndex
+from app.services.player_age import season_age
+from app.services.contract_optimizer import optimize_contracts, platform_war
+from app.services.season_simulator import SeasonState, SeasonSimulator, runs_from_strength
 from datetime import datetime
 
 # Mock implementation for demonstration purposes
 # In a real application, these functions would use trained ML models
 
+# Resident prediction models; serialized versions load from the model directory
+model_registry = ModelRegistry()
+model_registry.register("performance", BaselineProjectionModel.version, BaselineProjectionModel())
+model_registry.register("performance", MarcelProjectionModel.version, MarcelProjectionModel(), default=True)
+model_registry.register("season", SeasonSimulator.version, SeasonSimulator(), default=True)
+
+# Seasons of history fed to the projection models, most recent first
+HISTORY_SEASONS = 3
+
+# Feature store column holding each group's playing time (PA or outs recorded)
+PLAYING_TIME_FEATURES = {"batting": "batting.plate_appearances", "pitching": "outs"}
+
+# League (means, rates) of the projected stats per (group, season, table version)
+_league_mean_cache: Dict[Tuple[str, int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+# League-wide projections per (group, season, table version, model name, model version)
+_projection_cache: Dict[Tuple[str, int, int, str, str], Dict[str, np.ndarray]] = {}
+
+# Guards the module's caches, which request threads and the nightly precompute both write
+_cache_lock = threading.Lock()
+
+# Strength of a team with league-average WAR, and the win share of one WAR
+AVERAGE_STRENGTH = 0.5
+WINS_PER_WAR = 1.0
+
+# Bounds on projected team strength (winning percentage)
+STRENGTH_RANGE = (0.3, 0.7)
+
+# Season simulations per (season, simulations, standings version, stats version, model version)
+_season_odds_cache: Dict[Tuple[int, int, int, int, str], Dict[str, Dict[str, Any]]] = {}
+
+# Runs one season simulation at a time; each already uses every core
+_simulation_lock = threading.Lock()
+
+# Comparable players reported with a valuation
+COMPARABLE_PLAYERS = 3
+
+# Seed of the contract optimizer's WAR paths, so repeated requests get the same contract
+CONTRACT_SEED = 0
+
+# Nearest-neighbour index over player-season profiles, created on first use
+similarity_index: Optional[SimilarityIndex] = None
+
+
+def _target_names(group: str) -> List[str]:
+    """Return the feature store columns of a group's projected stats."""
+    return [feature_name(category, field) for _, category, field in PREDICTION_TARGETS[group]]
+
+
+def _target_columns(group: str, matrix: FeatureMatrix, index: np.ndarray) -> np.ndarray:
+    """Gather the projected stats of feature matrix rows into an (n, targets) matrix."""
+    return matrix.raw_columns(_target_names(group), index)
+
+
+def _playing_time(group: str, matrix: FeatureMatrix, index: np.ndarray) -> np.ndarray:
+    """Return plate appearances (hitters) or outs recorded (pitchers) of feature matrix rows."""
+    return np.nan_to_num(matrix.raw_columns([PLAYING_TIME_FEATURES[group]], index)[:, 0])
+
+
+def _league_means(group: str, season: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    League mean and league rate of each projected stat in a season.
+    
+    The rate is per PA/out for counting stats and playing-time weighted for
+    rate stats. Both are cached per table version.
+    """
+    from app.services.stats_service import season_stats, feature_store
+    
+    key = (group, season, season_stats.version)
+    cached = _league_mean_cache.get(key)
+    if cached is None:
+        matrix = feature_store.matrix(season)
+        index = np.flatnonzero(season_stats.present[group][matrix.rows])
+        values = _target_columns(group, matrix, index)
+        playing_time = _playing_time(group, matrix, index)[:, None]
+        counting = np.array([t in COUNTING_TARGETS for t in target_names(group)])
+        finite = np.isfinite(values)
+        time = (playing_time * finite).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(finite.any(axis=0), np.nansum(values, axis=0) / finite.sum(axis=0), np.nan)
+            totals = np.where(counting, np.nansum(values, axis=0), np.nansum(values * playing_time, axis=0))
+            rates = np.where(time > 0, totals / time, means)
+        with _cache_lock:
+            if len(_league_mean_cache) > 64:
+                _league_mean_cache.clear()
+            cached = _league_mean_cache[key] = (means, rates)
+    return cached
+
+
+def _player_group(player_id: int) -> Optional[str]:
+    """Return the projection group of a known player."""
+    from app.services.player_service import players_db
+    
+    player = players_db.get(player_id)
+    if player is None:
+        return None
+    return "pitching" if player.position.startswith('P') else "batting"
+
+
+def build_feature_matrix(group: str, season: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Assemble model inputs for every player of a group with a recent season.
+    
+    Args:
+        group: batting or pitching
+        season: The season to project; its previous HISTORY_SEASONS seasons are used
+        
+    Returns:
+        (player_ids, features) where player_ids is sorted and features holds one
+        row per player: "history" (n, seasons, targets), "playing_time"
+        (n, seasons), "previous" and "league" (n, targets) for the latest season
+        played, "league_rate" (n, targets) and "age" (n,)
+    """
+    from app.services.stats_service import feature_store
+    
+    targets = len(PREDICTION_TARGETS[group])
+    window = []
+    for k in range(HISTORY_SEASONS):
+        matrix = feature_store.matrix(season - 1 - k)
+        in_group = [_player_group(int(pid)) == group for pid in matrix.player_id.tolist()]
+        window.append((matrix, np.flatnonzero(np.array(in_group, dtype=bool))))
+    
+    player_ids = np.unique(np.concatenate([matrix.player_id[index] for matrix, index in window]).astype(np.int64))
+    n = len(player_ids)
+    history = np.full((n, HISTORY_SEASONS, targets), np.nan)
+    playing_time = np.zeros((n, HISTORY_SEASONS))
+    played = np.zeros((n, HISTORY_SEASONS), dtype=bool)
+    ages = np.full((n, HISTORY_SEASONS), np.nan)
+    for k, (matrix, index) in enumerate(window):
+        at = np.searchsorted(player_ids, matrix.player_id[index])
+        history[at, k] = _target_columns(group, matrix, index)
+        playing_time[at, k] = _playing_time(group, matrix, index)
+        played[at, k] = True
+        # Age in the projected season from the age stored with a past season
+        ages[at, k] = matrix.raw_columns(["age"], index)[:, 0] + k + 1
+    
+    # The latest season played supplies the single-season inputs
+    latest = np.argmax(played, axis=1)
+    league = np.empty((n, targets))
+    league_rate = np.empty((n, targets))
+    for k in np.unique(latest).tolist():
+        league[latest == k], league_rate[latest == k] = _league_means(group, season - 1 - k)
+    age = ages[np.arange(n), latest]
+    
+    return player_ids, {
+        "history": history,
+        "playing_time": playing_time,
+        "previous": history[np.arange(n), latest],
+        "league": league,
+        "league_rate": league_rate,
+        "age": age,
+    }
+
+
+def league_projections(group: str, season: int, model: LoadedModel) -> Dict[str, np.ndarray]:
+    """
+    Project every player of a group for a season in one model pass.
+    
+    Results are cached per (group, season, table version, model version), so
+    single-player requests are lookups. Intervals come from the precomputed
+    bootstrap when available, otherwise from the model's spread.
+    
+    Args:
+        group: batting or pitching
+        season: The season year to predict
+        model: Model to project with
+        
+    Returns:
+        Dictionary with sorted "player_ids" and per-player "mean", "lower" and
+        "upper" arrays of shape (n, targets)
+    """
+    from app.services.stats_service import season_stats
+    
+    key = (group, season, season_stats.version, model.name, model.version)
+    projections = _projection_cache.get(key)
+    if projections is not None:
+        return projections
+    
+    player_ids, features = build_feature_matrix(group, season)
+    if len(player_ids):
+        mean, std = model.predict(group, features, rows=len(player_ids))
+    else:
+        mean = std = np.zeros((0, len(PREDICTION_TARGETS[group])))
+    # Bootstrap intervals from the nightly run for players whose stats have not changed since
+    lower, upper = prediction_intervals(group, mean, std)
+    intervals = lookup_intervals(group, season, model.name, model.version, player_ids)
+    if intervals is not None:
+        current = intervals[2][:, None]
+        lower, upper = np.where(current, intervals[0], lower), np.where(current, intervals[1], upper)
+    projections = {"player_ids": player_ids, "mean": mean, "lower": lower, "upper": upper}
+    
+    # Projections from older data or models are never read again
+    with _cache_lock:
+        for stale in [k for k in _projection_cache if k[:2] == (group, season)]:
+            del _projection_cache[stale]
+        _projection_cache[key] = projections
+    return projections
+
+
+def drop_projections(group: str, season: int) -> None:
+    """Drop a group's cached projections for a season, so the next read rebuilds them."""
+    with _cache_lock:
+        for stale in [k for k in _projection_cache if k[:2] == (group, season)]:
+            del _projection_cache[stale]
+
+
+def predict_players_performance(
+    player_ids: List[int],
+    season: int,
+    include_uncertainty: bool = True
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Predict performance for many players from the cached league projections.
+    
+    Args:
+        player_ids: The players' IDs
+        season: The season year to predict
+        include_uncertainty: Whether to include uncertainty estimates
+        
+    Returns:
+        One prediction dictionary (PerformancePrediction fields) per player, or
+        None for players that are unknown or have no recent season
+    """
+    # Split players into hitters and pitchers, keeping their batch positions
+    batches: Dict[str, List[int]] = {"batting": [], "pitching": []}
+    for i, player_id in enumerate(player_ids):
+        group = _player_group(player_id)
+        if group is not None:
+            batches[group].append(i)
+    
+    # One model version serves the whole batch, even if another is activated meanwhile
+    model: LoadedModel = model_registry.active("performance")
+    features_used = list(getattr(model.model, "features_used", []))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(player_ids)
+    prediction_date = datetime.now().strftime("%Y-%m-%d")
+    for group, positions in batches.items():
+        if not positions:
+            continue
+        projections = league_projections(group, season, model)
+        known = projections["player_ids"]
+        wanted = np.array([player_ids[i] for i in positions], dtype=np.int64)
+        index = np.minimum(np.searchsorted(known, wanted), max(len(known) - 1, 0))
+        found = (known[index] == wanted) if len(known) else np.zeros(len(wanted), dtype=bool)
+        positions = [i for i, f in zip(positions, found.tolist()) if f]
+        index = index[found]
+        if not positions:
+            continue
+        
+        intervals = {}
+        for j, target in enumerate(target_names(group)):
+            decimals = TARGET_DECIMALS.get(target, 1)
+            means = np.round(projections["mean"][index, j], decimals).tolist()
+            if include_uncertainty:
+                lowers = np.round(projections["lower"][index, j], decimals).tolist()
+                uppers = np.round(projections["upper"][index, j], decimals).tolist()
+            else:
+                lowers = uppers = [None] * len(positions)
+            intervals[target] = [
+                {"lower": lo, "mean": m, "upper": hi} for lo, m, hi in zip(lowers, means, uppers)
+            ]
+        
+        for k, i in enumerate(positions):
+            prediction = {"player_id": player_ids[i], "season": season}
+            for target, values in intervals.items():
+                prediction[target] = values[k]
+            prediction["model_name"] = model.name
+            prediction["model_version"] = model.version
+            prediction["features_used"] = features_used
+            prediction["prediction_date"] = prediction_date
+            results[i] = prediction
+    
+    return results
+
+
 def predict_player_performance(
     player_id: int,
     season: int,
@@ -21,145 +313,10 @@ def predict_player_performance(
     Returns:
         PerformancePrediction object if successful, None otherwise
     """
-    from app.services.player_service import get_player
-    from app.services.stats_service import get_player_stats
-    
-    player = get_player(player_id)
-    if not player:
-        return None
-    
-    # Get the player's most recent stats
-    current_season = 2024  # Use 2024 as the most recent complete season
-    previous_stats = get_player_stats(player_id, current_season)
-    if not previous_stats:
+    prediction = predict_players_performance([player_id], season, include_uncertainty)[0]
+    if prediction is None:
         return None
-    
-    # In a real implementation, this would use a trained ML model
-    # For now, we'll generate mock predictions
-    
-    # Determine if player is a pitcher or position player
-    is_pitcher = player.position.startswith('P')
-    
-    if is_pitcher:
-        # Pitcher predictions
-        era_mean = 3.50
-        era_std = 0.50
-        whip_mean = 1.20
-        whip_std = 0.15
-        k_mean = 180
-        k_std = 20
-        wins_mean = 12
-        wins_std = 3
-        fip_mean = 3.60
-        fip_std = 0.40
-        war_mean = 3.0
-        war_std = 1.0
-        
-        prediction = PerformancePrediction(
-            player_id=player_id,
-            season=season,
-            earned_run_average={
-                "mean": era_mean,
-                "lower": era_mean + era_std if include_uncertainty else None,
-                "upper": max(0, era_mean - era_std) if include_uncertainty else None
-            },
-            walks_and_hits_per_inning_pitched={
-                "mean": whip_mean,
-                "lower": whip_mean + whip_std if include_uncertainty else None,
-                "upper": max(0, whip_mean - whip_std) if include_uncertainty else None
-            },
-            strikeouts={
-                "mean": k_mean,
-                "lower": max(0, k_mean - k_std) if include_uncertainty else None,
-                "upper": k_mean + k_std if include_uncertainty else None
-            },
-            wins={
-                "mean": wins_mean,
-                "lower": max(0, wins_mean - wins_std) if include_uncertainty else None,
-                "upper": wins_mean + wins_std if include_uncertainty else None
-            },
-            fielding_independent_pitching={
-                "mean": fip_mean,
-                "lower": fip_mean + fip_std if include_uncertainty else None,
-                "upper": max(0, fip_mean - fip_std) if include_uncertainty else None
-            },
-            war={
-                "mean": war_mean,
-                "lower": max(0, war_mean - war_std) if include_uncertainty else None,
-                "upper": war_mean + war_std if include_uncertainty else None
-            },
-            model_version="1.0.0",
-            features_used=["previous_performance", "age", "pitch_mix", "velocity", "movement"],
-            prediction_date=datetime.now().strftime("%Y-%m-%d")
-        )
-    else:
-        # Position player predictions
-        ba_mean = 0.275
-        ba_std = 0.025
-        obp_mean = 0.350
-        obp_std = 0.030
-        slg_mean = 0.480
-        slg_std = 0.040
-        hr_mean = 22
-        hr_std = 5
-        rbi_mean = 75
-        rbi_std = 15
-        sb_mean = 10
-        sb_std = 5
-        wrc_mean = 115
-        wrc_std = 15
-        war_mean = 3.5
-        war_std = 1.2
-        
-        prediction = PerformancePrediction(
-            player_id=player_id,
-            season=season,
-            batting_average={
-                "mean": ba_mean,
-                "lower": max(0, ba_mean - ba_std) if include_uncertainty else None,
-                "upper": min(1, ba_mean + ba_std) if include_uncertainty else None
-            },
-            on_base_percentage={
-                "mean": obp_mean,
-                "lower": max(0, obp_mean - obp_std) if include_uncertainty else None,
-                "upper": min(1, obp_mean + obp_std) if include_uncertainty else None
-            },
-            slugging_percentage={
-                "mean": slg_mean,
-                "lower": max(0, slg_mean - slg_std) if include_uncertainty else None,
-                "upper": min(2, slg_mean + slg_std) if include_uncertainty else None
-            },
-            home_runs={
-                "mean": hr_mean,
-                "lower": max(0, hr_mean - hr_std) if include_uncertainty else None,
-                "upper": hr_mean + hr_std if include_uncertainty else None
-            },
-            runs_batted_in={
-                "mean": rbi_mean,
-                "lower": max(0, rbi_mean - rbi_std) if include_uncertainty else None,
-                "upper": rbi_mean + rbi_std if include_uncertainty else None
-            },
-            stolen_bases={
-                "mean": sb_mean,
-                "lower": max(0, sb_mean - sb_std) if include_uncertainty else None,
-                "upper": sb_mean + sb_std if include_uncertainty else None
-            },
-            weighted_runs_created_plus={
-                "mean": wrc_mean,
-                "lower": max(0, wrc_mean - wrc_std) if include_uncertainty else None,
-                "upper": wrc_mean + wrc_std if include_uncertainty else None
-            },
-            war={
-                "mean": war_mean,
-                "lower": max(0, war_mean - war_std) if include_uncertainty else None,
-                "upper": war_mean + war_std if include_uncertainty else None
-            },
-            model_version="1.0.0",
-            features_used=["previous_performance", "age", "exit_velocity", "launch_angle", "sprint_speed"],
-            prediction_date=datetime.now().strftime("%Y-%m-%d")
-        )
-    
-    return prediction
+    return PerformancePrediction(**prediction)
 
 
 def predict_player_valuation(
@@ -177,58 +334,36 @@ def predict_player_valuation(
         ValuationPrediction object if successful, None otherwise
     """
     from app.services.player_service import get_player
+    from app.services import valuation_service
     
     player = get_player(player_id)
     if not player:
         return None
     
-    # In a real implementation, this would use a trained ML model
-    # For now, we'll generate mock predictions
-    
-    # Mock WAR prediction
-    projected_war = 3.5
-    
-    # Calculate market value (approx. $8M per WAR)
-    market_value = projected_war * 8000000
+    performance = predict_players_performance([player_id], season, include_uncertainty=False)[0]
+    if performance is None:
+        return None
+    projected_war = performance["war"]["mean"]
     
-    # Mock salary prediction
-    salary_prediction = market_value * 0.85  # Slight discount
+    # Market price of the projected WAR and the salary the player's service-time tier pays
+    war = np.array([projected_war])
+    service = valuation_service.service_years(np.array([player_id]), season)
+    market_value = float(valuation_service.market_value(war, season)[0])
+    salary_prediction = float(valuation_service.expected_salary(war, service, season)[0])
     
     # Calculate surplus value
     surplus_value = market_value - salary_prediction
     
-    # Determine optimal contract
-    optimal_years = min(7, max(1, 30 - player.age)) if player.age else 4
-    optimal_aav = salary_prediction * (1 + 0.05 * min(optimal_years, 3))  # Slight premium for longer deals
-    optimal_total = optimal_aav * optimal_years
-    
-    # Mock comparable players
-    comparable_players = [
-        {
-            "player_id": 1001,
-            "name": "Similar Player 1",
-            "similarity_score": 0.92,
-            "war": 3.7,
-            "salary": 28000000,
-            "contract_years": 5
-        },
-        {
-            "player_id": 1002,
-            "name": "Similar Player 2",
-            "similarity_score": 0.88,
-            "war": 3.2,
-            "salary": 25000000,
-            "contract_years": 4
-        },
-        {
-            "player_id": 1003,
-            "name": "Similar Player 3",
-            "similarity_score": 0.85,
-            "war": 4.0,
-            "salary": 32000000,
-            "contract_years": 6
-        }
-    ]
+    # Surplus-maximizing contract over simulated WAR paths, asked at the platform price
+    age = season_age(player.birth_date, season)
+    asking_war = platform_war(np.array([player_id]), season - 1)
+    asking_war = np.where(np.isnan(asking_war), war, asking_war)
+    contract = optimize_contracts(war, asking_war, np.array([age]), season, seed=CONTRACT_SEED)
+    optimal_years = int(contract["years"][0])
+    optimal_aav = float(contract["annual_value"][0])
+    optimal_total = float(contract["total_value"][0])
+    
+    comparable_players = _comparable_players(player_id)
     
     return ValuationPrediction(
         player_id=player_id,
@@ -241,22 +376,143 @@ def predict_player_valuation(
         optimal_annual_value=optimal_aav,
         optimal_total_value=optimal_total,
         comparable_players=comparable_players,
-        model_version="1.0.0",
+        model_name=performance["model_name"],
+        model_version=performance["model_version"],
         prediction_date=datetime.now().strftime("%Y-%m-%d"),
         confidence_score=0.85
     )
 
 
+def _comparable_players(player_id: int, limit: int = COMPARABLE_PLAYERS) -> List[Dict[str, Any]]:
+    """
+    Value a player's nearest statistical neighbours in the seasons they matched on.
+    
+    Args:
+        player_id: The player's ID
+        limit: Number of comparables
+        
+    Returns:
+        Comparable players, most similar first, with their WAR, salary and
+        contract status in the matched season
+    """
+    from app.services.player_service import players_db
+    from app.services import valuation_service
+    
+    comparables = []
+    for pid, season, score in _similarity_index().query(player_id, k=limit):
+        valuation = valuation_service.value_league(season)
+        i = valuation["index"].get(pid)
+        if i is None or pid not in players_db:
+            continue
+        comparables.append({
+            "player_id": pid,
+            "name": players_db[pid].name,
+            "season": season,
+            "similarity_score": score,
+            "war": round(float(valuation["war"][i]), 1),
+            "salary": round(float(valuation["salary"][i])),
+            "contract_status": valuation_service.CONTRACT_STATUSES[int(valuation["tier"][i])],
+        })
+    return comparables
+
+
+def _team_war(state: SeasonState, season: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (batting, pitching) WAR per team, in league order, from a season's stats."""
+    from app.services.stats_service import season_stats
+    
+    rows = season_stats.season_rows(season)
+    codes = np.array([season_stats.team_code(t) for t in state.league.team_ids])
+    # Map table team codes to league positions (-1 for rows without a known team)
+    position = np.full(len(season_stats.teams) + 1, -1)
+    position[codes] = np.arange(len(codes))
+    team = position[season_stats.team[rows]]
+    war = np.nan_to_num(season_stats.war[rows].astype(np.float64))
+    pitcher = season_stats.present["pitching"][rows]
+    known = team >= 0
+    n = len(codes)
+    batting = np.bincount(team[known & ~pitcher], weights=war[known & ~pitcher], minlength=n)
+    pitching = np.bincount(team[known & pitcher], weights=war[known & pitcher], minlength=n)
+    return batting, pitching
+
+
+def _projected_strength(team_war: np.ndarray) -> np.ndarray:
+    """Convert team WAR into a winning percentage relative to the league."""
+    strength = AVERAGE_STRENGTH + WINS_PER_WAR * (team_war - team_war.mean()) / 162
+    return np.clip(strength, *STRENGTH_RANGE)
+
+
+def get_season_odds(season: int, simulations: int = 10000) -> Dict[str, Dict[str, Any]]:
+    """
+    Simulate the rest of a season for all 30 teams at once.
+    
+    Preseason strength comes from each team's WAR in the prior season and is
+    blended with the Pythagorean record of games already played. Results are
+    cached until a game is recorded or stats change, and concurrent requests
+    for the same standings wait for one simulation.
+    
+    Args:
+        season: Season year
+        simulations: Number of simulated seasons
+        
+    Returns:
+        Dictionary of team ID to projected record, run totals, WAR and odds
+    """
+    from app.services.stats_service import season_stats
+    from app.services.team_service import get_season_state
+    
+    state = get_season_state(season)
+    model = model_registry.active("season")
+    key = (season, simulations, state.version, season_stats.version, model.version)
+    odds = _season_odds_cache.get(key)
+    if odds is not None:
+        return odds
+    with _simulation_lock:
+        odds = _season_odds_cache.get(key)
+        if odds is None:
+            odds = _simulate_odds(model, state, season, simulations)
+            # Drop simulations of superseded standings
+            with _cache_lock:
+                for stale in [k for k in _season_odds_cache if k[0] == season]:
+                    del _season_odds_cache[stale]
+                _season_odds_cache[key] = odds
+    return odds
+
+
+def _simulate_odds(model: LoadedModel, state: SeasonState, season: int, simulations: int) -> Dict[str, Dict[str, Any]]:
+    """Run the season simulation behind get_season_odds with a registered simulator."""
+    batting_war, pitching_war = _team_war(state, season - 1)
+    projected = _projected_strength(batting_war + pitching_war)
+    strength = state.blended_strength(projected)
+    odds = model.predict(state, strength, simulations, rows=len(state.league.team_ids))
+    
+    runs_scored, runs_allowed = runs_from_strength(strength)
+    for i, team_id in enumerate(state.league.team_ids):
+        entry = odds[team_id]
+        games = entry["projected_wins"] + entry["projected_losses"]
+        entry.update({
+            "win_percentage": round(entry["projected_wins"] / games, 3),
+            "projected_runs_scored": int(round(runs_scored[i])),
+            "projected_runs_allowed": int(round(runs_allowed[i])),
+            "run_differential": int(round(runs_scored[i])) - int(round(runs_allowed[i])),
+            "team_war": round(float(batting_war[i] + pitching_war[i]), 1),
+            "batting_war": round(float(batting_war[i]), 1),
+            "pitching_war": round(float(pitching_war[i]), 1),
+        })
+    return odds
+
+
 def predict_team_performance(
     team_id: str,
-    season: int
+    season: int,
+    simulations: int = 10000
 ) -> Optional[Dict[str, Any]]:
     """
-    Predict team performance for a future season.
+    Predict team performance for a season by Monte Carlo simulation.
     
     Args:
         team_id: The team's ID
         season: The season year to predict
+        simulations: Number of simulated seasons
         
     Returns:
         Team performance prediction dictionary if successful, None otherwise
@@ -267,36 +523,89 @@ def predict_team_performance(
     if not team:
         return None
     
-    # In a real implementation, this would use a trained ML model
-    # For now, we'll generate mock predictions
-    
-    # Mock team performance prediction
+    model = model_registry.active("season")
     return {
         "team_id": team_id,
         "season": season,
-        "projected_wins": 88,
-        "projected_losses": 74,
-        "win_percentage": 0.543,
-        "division_rank": 2,
-        "playoff_odds": 65.5,
-        "division_odds": 28.5,
-        "pennant_odds": 12.0,
-        "championship_odds": 5.5,
-        "projected_runs_scored": 735,
-        "projected_runs_allowed": 675,
-        "run_differential": 60,
-        "team_war": 38.5,
-        "batting_war": 22.5,
-        "pitching_war": 16.0,
-        "model_version": "1.0.0",
+        **get_season_odds(season, simulations)[team_id],
+        "model_name": model.name,
+        "model_version": model.version,
         "prediction_date": datetime.now().strftime("%Y-%m-%d"),
-        "confidence_score": 0.80
+        "simulations": simulations,
     }
 
 
+def get_posterior_summary(
+    player_id: int,
+    season: int,
+    quantiles: Optional[List[float]] = None,
+    credible: float = 0.9
+) -> Optional[Dict[str, Any]]:
+    """
+    Summarize a player's stored posterior predictive draws.
+    
+    Args:
+        player_id: The player's ID
+        season: The season year to predict
+        quantiles: Extra quantiles to report
+        credible: Mass of the central credible interval
+        
+    Returns:
+        PosteriorSummary fields, or None if no draws are stored for the player
+    """
+    from app.services.posterior_store import posterior_store
+    
+    group = _player_group(player_id)
+    if group is None:
+        return None
+    return posterior_store.summarize(player_id, season, group, quantiles or [], credible)
+
+
+def _similarity_index() -> SimilarityIndex:
+    """Return the similarity index over the shared feature store."""
+    global similarity_index
+    from app.services.stats_service import feature_store
+    
+    if similarity_index is None:
+        similarity_index = SimilarityIndex(feature_store)
+    return similarity_index
+
+
+def get_model_stats() -> List[Dict[str, Any]]:
+    """
+    Report every known model version with its load time, memory and latency.
+    
+    Returns:
+        List of model status dictionaries
+    """
+    return model_registry.stats()
+
+
+def activate_model(name: str, version: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a model version and make it the active one.
+    
+    Args:
+        name: Model name (e.g., "performance")
+        version: Version to activate
+        
+    Returns:
+        Status dictionary of the activated version, None if it does not exist
+    """
+    try:
+        loaded = model_registry.activate(name, version)
+    except KeyError:
+        return None
+    return dict(loaded.stats(), loaded=True, active=True)
+
+
 def get_similar_players(
     player_id: int,
-    limit: int = 5
+    limit: int = 5,
+    season: Optional[int] = None,
+    position: Optional[str] = None,
+    seasons: Optional[List[int]] = None,
+    metric: str = "cosine"
 ) -> List[Dict[str, Any]]:
     """
     Find players with similar statistical profiles.
@@ -304,20 +613,43 @@ def get_similar_players(
     Args:
         player_id: The player's ID
         limit: Number of similar players to return
+        season: Season whose profile is matched (defaults to the latest)
+        position: Only return players at this position
+        seasons: Only match against these seasons
+        metric: Distance metric, cosine or euclidean
         
     Returns:
-        List of similar players
+        List of similar players, most similar first
     """
-    from app.services.player_service import get_player, get_players
-    
-    player = get_player(player_id)
-    if not player:
-        return []
-    
-    # In a real implementation, this would use a similarity algorithm
-    # For now, we'll return a few random players
+    return find_similar_players([player_id], limit, season, position, seasons, metric)[0]
+
+
+def find_similar_players(
+    player_ids: List[int],
+    limit: int = 5,
+    season: Optional[int] = None,
+    position: Optional[str] = None,
+    seasons: Optional[List[int]] = None,
+    metric: str = "cosine"
+) -> List[List[Dict[str, Any]]]:
+    """
+    Find similar players for many players with batched index queries.
     
-    all_players = get_players()
-    similar_players = [p for p in all_players if p.id != player_id and p.position == player.position][:limit]
+    Args:
+        player_ids: The players' IDs
+        limit: Number of similar players to return per player
+        season: Season whose profiles are matched (defaults to each player's latest)
+        position: Only return players at this position
+        seasons: Only match against these seasons
+        metric: Distance metric, cosine or euclidean
+        
+    Returns:
+        One list of similar players per requested player
+    """
+    from app.services.player_service import players_db
     
-    return similar_players
+    neighbours = _similarity_index().query_batch(player_ids, season, limit, metric, position, seasons)
+    return [
+        [players_db[pid] for pid, _, _ in matches if pid in players_db]
+        for matches in neighbours
+    ]
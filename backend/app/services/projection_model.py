@@ -0,0 +1,240 @@
+from typing import List, Dict, Tuple
+import warnings
+import numpy as np
+
+# Projected stats per player group: (target, stat category, field); WAR has no category
+PREDICTION_TARGETS = {
+    "batting": [
+        ("batting_average", "batting", "batting_average"),
+        ("on_base_percentage", "batting", "on_base_percentage"),
+        ("slugging_percentage", "batting", "slugging_percentage"),
+        ("home_runs", "batting", "home_runs"),
+        ("runs_batted_in", "batting", "runs_batted_in"),
+        ("stolen_bases", "batting", "stolen_bases"),
+        ("weighted_runs_created_plus", "batting", "weighted_runs_created_plus"),
+        ("war", None, "war"),
+    ],
+    "pitching": [
+        ("earned_run_average", "pitching", "earned_run_average"),
+        ("walks_and_hits_per_inning_pitched", "pitching", "walks_and_hits_per_inning_pitched"),
+        ("strikeouts", "pitching", "strikeouts"),
+        ("wins", "pitching", "wins"),
+        ("fielding_independent_pitching", "pitching", "fielding_independent_pitching"),
+        ("war", None, "war"),
+    ],
+}
+
+# Playing-time column per player group (pitching innings are converted to outs)
+PLAYING_TIME = {"batting": ("batting", "plate_appearances"), "pitching": ("pitching", "innings_pitched")}
+
+# Targets that accumulate with playing time; the rest are rates
+COUNTING_TARGETS = {"home_runs", "runs_batted_in", "stolen_bases", "strikeouts", "wins", "war"}
+
+# Rate targets where a lower value is better (aging works the other way)
+LOWER_IS_BETTER = {"earned_run_average", "walks_and_hits_per_inning_pitched", "fielding_independent_pitching"}
+
+# Upper limits for bounded rate stats (all targets are floored at zero)
+TARGET_CAPS = {"batting_average": 1.0, "on_base_percentage": 1.0, "slugging_percentage": 4.0}
+
+# Decimal places reported per target (default 1)
+TARGET_DECIMALS = {
+    "batting_average": 3,
+    "on_base_percentage": 3,
+    "slugging_percentage": 3,
+    "earned_run_average": 2,
+    "walks_and_hits_per_inning_pitched": 2,
+    "fielding_independent_pitching": 2,
+}
+
+
+def target_names(group: str) -> List[str]:
+    """Return the projected stat names of a player group."""
+    return [target for target, _, _ in PREDICTION_TARGETS[group]]
+
+
+def prediction_intervals(
+    group: str,
+    mean: np.ndarray,
+    std: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turn projected means and spreads into bounded one-sigma intervals.
+
+    Args:
+        group: batting or pitching
+        mean: (n, targets) projected means
+        std: (n, targets) projected standard deviations
+
+    Returns:
+        (lower, upper) arrays with lower <= mean <= upper for every target
+    """
+    lower = np.maximum(mean - std, 0.0)
+    upper = mean + std
+    caps = np.array([TARGET_CAPS.get(t, np.inf) for t in target_names(group)])
+    return lower, np.minimum(upper, caps)
+
+
+class BaselineProjectionModel:
+    """
+    Projects next season as the prior season regressed toward the league mean.
+
+    Every input is a column of the feature arrays, so a whole batch of players
+    is projected with a handful of array operations.
+    """
+
+    version = "1.0.0"
+    features_used = ["previous_performance", "league_average"]
+
+    # Share of the prior season kept; the rest regresses to the league mean
+    RELIABILITY = {
+        "batting_average": 0.5,
+        "on_base_percentage": 0.6,
+        "slugging_percentage": 0.6,
+        "home_runs": 0.65,
+        "runs_batted_in": 0.6,
+        "stolen_bases": 0.7,
+        "weighted_runs_created_plus": 0.6,
+        "earned_run_average": 0.45,
+        "walks_and_hits_per_inning_pitched": 0.55,
+        "strikeouts": 0.7,
+        "wins": 0.4,
+        "fielding_independent_pitching": 0.6,
+        "war": 0.55,
+    }
+
+    # One-sigma spread of the projection per target
+    SPREAD = {
+        "batting_average": 0.025,
+        "on_base_percentage": 0.030,
+        "slugging_percentage": 0.040,
+        "home_runs": 5.0,
+        "runs_batted_in": 15.0,
+        "stolen_bases": 5.0,
+        "weighted_runs_created_plus": 15.0,
+        "earned_run_average": 0.50,
+        "walks_and_hits_per_inning_pitched": 0.15,
+        "strikeouts": 20.0,
+        "wins": 3.0,
+        "fielding_independent_pitching": 0.40,
+        "war": 1.2,
+    }
+
+    def predict(self, group: str, features: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Project a batch of players.
+
+        Args:
+            group: batting or pitching
+            features: "previous" (n, targets) prior-season values (NaN if missing)
+                and "league" (n, targets) league means of each player's prior season
+
+        Returns:
+            (mean, std) arrays of shape (n, targets)
+        """
+        targets = target_names(group)
+        previous, league = features["previous"], features["league"]
+        reliability = np.array([self.RELIABILITY[t] for t in targets])
+        spread = np.array([self.SPREAD[t] for t in targets])
+
+        prior = np.where(np.isnan(previous), league, previous)
+        mean = reliability * prior + (1 - reliability) * league
+        mean = np.nan_to_num(mean, nan=0.0)
+        return mean, np.broadcast_to(spread, mean.shape)
+
+
+class MarcelProjectionModel:
+    """
+    Marcel-style projections from the last three seasons.
+
+    Each stat is a playing-time weighted average of the last three seasons
+    (5/4/3 for hitters, 3/2/1 for pitchers), regressed toward the league rate
+    by a fixed amount of league-average playing time, and adjusted for age.
+    Counting stats are projected as rates and scaled by projected playing
+    time. Every step is an array operation over (player, season, stat).
+    """
+
+    version = "2.0.0"
+    features_used = ["last_three_seasons", "playing_time", "league_average", "age"]
+
+    # Season weights, most recent first
+    WEIGHTS = {"batting": (5.0, 4.0, 3.0), "pitching": (3.0, 2.0, 1.0)}
+
+    # League-average playing time added when regressing (PA for hitters, outs for pitchers)
+    REGRESSION = {"batting": 1200.0, "pitching": 402.0}
+
+    # Projected playing time: weights on the last two seasons plus a baseline
+    PLAYING_TIME_WEIGHTS = (0.5, 0.1)
+    PLAYING_TIME_BASE = {"batting": 200.0, "pitching": 75.0}
+
+    # Rates improve by AGE_IMPROVEMENT per year below AGE_PEAK and decline by AGE_DECLINE above it
+    AGE_PEAK = 29
+    AGE_IMPROVEMENT = 0.006
+    AGE_DECLINE = 0.003
+
+    # One-sigma spread for a player with no track record (shrinks by half with a full one)
+    SPREAD = BaselineProjectionModel.SPREAD
+
+    def age_adjust(self, group: str, rates: np.ndarray, age: np.ndarray) -> np.ndarray:
+        """
+        Age (n, ..., targets) rates to the projected season.
+
+        Args:
+            group: batting or pitching
+            rates: Rates with players on the first axis
+            age: Age per player in the projected season (NaN for unknown)
+
+        Returns:
+            Adjusted rates; stats where lower is better move the other way
+        """
+        years = np.nan_to_num(age, nan=self.AGE_PEAK) - self.AGE_PEAK
+        factor = 1 + np.where(years < 0, -years * self.AGE_IMPROVEMENT, -years * self.AGE_DECLINE)
+        factor = factor.reshape((-1,) + (1,) * (rates.ndim - 1))
+        lower_is_better = np.array([t in LOWER_IS_BETTER for t in target_names(group)])
+        return np.where(lower_is_better, rates / factor, rates * factor)
+
+    def projected_playing_time(self, group: str, playing_time: np.ndarray) -> np.ndarray:
+        """Project next season's PA or outs from (n, seasons) past playing time."""
+        weights = self.PLAYING_TIME_WEIGHTS
+        projected = weights[0] * playing_time[:, 0] + weights[1] * playing_time[:, 1]
+        return projected + self.PLAYING_TIME_BASE[group]
+
+    def predict(self, group: str, features: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Project a batch of players.
+
+        Args:
+            group: batting or pitching
+            features: "history" (n, 3, targets) stats of the last three seasons,
+                most recent first (NaN if missing); "playing_time" (n, 3) PA or
+                outs of those seasons; "league_rate" (n, targets) league rate of
+                each stat per PA/out for counting stats and playing-time weighted
+                for rates; "age" (n,) age in the projected season (NaN if unknown)
+
+        Returns:
+            (mean, std) arrays of shape (n, targets)
+        """
+        targets = target_names(group)
+        history = features["history"]
+        playing_time = np.nan_to_num(features["playing_time"])
+        league_rate = features["league_rate"]
+        counting = np.array([t in COUNTING_TARGETS for t in targets])
+
+        # Per-season rates: counting stats per unit of playing time
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = np.where(counting, history / playing_time[:, :, None], history)
+        weight = np.array(self.WEIGHTS[group])[None, :, None] * playing_time[:, :, None]
+        weight = np.where(np.isfinite(rates), weight, 0.0)
+        weighted = (np.nan_to_num(rates) * weight).sum(axis=1)
+        regression = self.REGRESSION[group]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            rate = (weighted + regression * league_rate) / (weight.sum(axis=1) + regression)
+
+        rate = self.age_adjust(group, rate, features["age"])
+        projected_time = self.projected_playing_time(group, playing_time)
+        mean = np.where(counting, rate * projected_time[:, None], rate)
+        mean = np.nan_to_num(mean, nan=0.0)
+
+        reliability = weight.sum(axis=1) / (weight.sum(axis=1) + regression)
+        spread = np.array([self.SPREAD[t] for t in targets])
+        return mean, spread * (1 - 0.5 * reliability)
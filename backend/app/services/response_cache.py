@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Callable, Hashable
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Entries kept across all routes before the least recently used is evicted
+MAX_ENTRIES = 2048
+
+# Seconds a cached body is served as fresh, per route
+ROUTE_TTL = {
+    "league-averages": 300.0,
+    "leaders": 60.0,
+    "advanced-metrics": 300.0,
+    "team-stats": 60.0,
+}
+DEFAULT_TTL = 60.0
+
+# Seconds past the TTL a body is still served while it is recomputed in the background
+STALE_WHILE_REVALIDATE = 120.0
+
+
+class CacheEntry:
+    """A pre-serialized response body and when it was computed."""
+
+    __slots__ = ("body", "created", "ttl")
+
+    def __init__(self, body: bytes, created: float, ttl: float):
+        self.body = body
+        self.created = created
+        self.ttl = ttl
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized response bodies.
+
+    Keys are (route, normalized query parameters, data version), where the
+    data version is that of the entities the response is built from, so a
+    write to one of them makes older entries unreachable; those age out
+    through LRU eviction. Within one data version an entry is fresh for
+    its route's TTL and then served stale for STALE_WHILE_REVALIDATE seconds
+    while a single background refresh recomputes it.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "refreshes": 0}
+
+    @staticmethod
+    def key(route: str, params: Dict[str, Any], version: Hashable) -> Tuple[Any, ...]:
+        """Build a cache key; parameter order does not matter and None values are dropped."""
+        normalized = tuple(sorted((name, value) for name, value in params.items() if value is not None))
+        return route, normalized, version
+
+    def _store(self, key: Hashable, body: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = CacheEntry(body, self.clock(), ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def _refresh(self, key: Hashable, compute: Callable[[], Optional[bytes]], ttl: float) -> None:
+        try:
+            body = compute()
+            if body is not None:
+                self._store(key, body, ttl)
+            with self._lock:
+                self.counters["refreshes"] += 1
+        except Exception:
+            logger.exception("Background refresh of %s failed", key[0] if isinstance(key, tuple) else key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_compute(
+        self,
+        route: str,
+        params: Dict[str, Any],
+        version: Hashable,
+        compute: Callable[[], Optional[bytes]],
+    ) -> Tuple[Optional[bytes], str]:
+        """
+        Return a route's serialized body, computing it only on a miss.
+
+        Args:
+            route: Route name (a ROUTE_TTL key)
+            params: Query parameters after defaults and type coercion
+            version: Data version the response depends on
+            compute: Returns the serialized body, or None when there is nothing
+                to serve (not cached)
+
+        Returns:
+            (body or None, "HIT" | "STALE" | "MISS")
+        """
+        key = self.key(route, params, version)
+        ttl = ROUTE_TTL.get(route, DEFAULT_TTL)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.created
+                if age <= entry.ttl:
+                    self._entries.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return entry.body, "HIT"
+                if age <= entry.ttl + STALE_WHILE_REVALIDATE:
+                    self._entries.move_to_end(key)
+                    self.counters["stale_hits"] += 1
+                    refresh = key not in self._refreshing
+                    if refresh:
+                        self._refreshing.add(key)
+                else:
+                    del self._entries[key]
+                    self.counters["expirations"] += 1
+                    entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+
+        if entry is not None:
+            if refresh:
+                threading.Thread(target=self._refresh, args=(key, compute, ttl), daemon=True).start()
+            return entry.body, "STALE"
+
+        body = compute()
+        if body is not None:
+            self._store(key, body, ttl)
+        return body, "MISS"
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters, entry count and hit ratio."""
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._entries)
+            size = sum(len(entry.body) for entry in self._entries.values())
+        lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+        return {
+            **counters,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "bytes": size,
+            "hit_ratio": round((counters["hits"] + counters["stale_hits"]) / lookups, 4) if lookups else None,
+        }
+
+
+# Cached bodies of the hot statistics and team stats reads
+response_cache = ResponseCache()
+
@@ -0,0 +1,441 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import List, Optional, Dict, Any, Tuple
+import multiprocessing
+import os
+import threading
+import numpy as np
+
+# Natural interleague rivals (4 games a season, 2 in each park)
+NATURAL_RIVALS = {
+    "NYY": "NYM", "BOS": "ATL", "BAL": "WSH", "TBR": "MIA", "TOR": "PHI",
+    "CHW": "CHC", "CLE": "CIN", "DET": "PIT", "KCR": "STL", "MIN": "MIL",
+    "HOU": "COL", "LAA": "LAD", "OAK": "SFG", "SEA": "SDP", "TEX": "ARI",
+}
+
+LEAGUES = ("AL", "NL")
+DIVISIONS = ("East", "Central", "West")
+
+# Share of games the home team wins between evenly matched teams
+HOME_WIN_PCT = 0.54
+
+# Pythagorean exponent for turning runs scored/allowed into a win percentage
+PYTHAGOREAN_EXPONENT = 1.83
+
+# League-average runs per team per game, for converting strength back to runs
+LEAGUE_RUNS_PER_GAME = 4.5
+
+# Games of weight the preseason projection keeps against the actual record
+PRIOR_GAMES = 70
+
+# Simulations per vectorized batch (bounds memory to a few tens of MB)
+BATCH_SIMULATIONS = 5000
+
+# Worker processes are started fresh rather than forked from the threaded server process
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Postseason rounds: (name, games, home games for the higher seed)
+WILD_CARD_SERIES = (3, 3)
+DIVISION_SERIES = (5, 3)
+CHAMPIONSHIP_SERIES = (7, 4)
+WORLD_SERIES = (7, 4)
+
+
+def log5(p_a: np.ndarray, p_b: np.ndarray) -> np.ndarray:
+    """Probability that a team of strength p_a beats one of strength p_b on a neutral field."""
+    return (p_a - p_a * p_b) / (p_a + p_b - 2 * p_a * p_b)
+
+
+def pythagorean(runs_scored: np.ndarray, runs_allowed: np.ndarray) -> np.ndarray:
+    """Expected winning percentage from runs scored and allowed."""
+    rs = np.power(runs_scored, PYTHAGOREAN_EXPONENT)
+    ra = np.power(runs_allowed, PYTHAGOREAN_EXPONENT)
+    return np.divide(rs, rs + ra, out=np.full(np.shape(rs), 0.5), where=(rs + ra) > 0)
+
+
+def runs_from_strength(strength: np.ndarray, games: int = 162) -> Tuple[np.ndarray, np.ndarray]:
+    """Invert the Pythagorean formula into league-average-centred runs scored and allowed."""
+    ratio = np.power(strength / (1 - strength), 1 / PYTHAGOREAN_EXPONENT)
+    runs = LEAGUE_RUNS_PER_GAME * games
+    return runs * np.sqrt(ratio), runs / np.sqrt(ratio)
+
+
+def home_win_matrix(strength: np.ndarray) -> np.ndarray:
+    """
+    Return P[h, a], the probability the home team h beats the visitor a.
+
+    Log5 gives the neutral-site probability, and home field scales the odds by
+    HOME_WIN_PCT / (1 - HOME_WIN_PCT).
+    """
+    neutral = log5(strength[:, None], strength[None, :])
+    odds = neutral / (1 - neutral) * (HOME_WIN_PCT / (1 - HOME_WIN_PCT))
+    return odds / (1 + odds)
+
+
+class League:
+    """Team order and league/division structure shared by schedule and simulation."""
+
+    def __init__(self, teams: List[Any]):
+        ordered = sorted(teams, key=lambda t: (LEAGUES.index(t.league), DIVISIONS.index(t.division), t.id))
+        self.team_ids = [t.id for t in ordered]
+        self.index = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        self.league = np.array([LEAGUES.index(t.league) for t in ordered])
+        self.division = np.array([LEAGUES.index(t.league) * 3 + DIVISIONS.index(t.division) for t in ordered])
+        if len(ordered) != 30 or np.bincount(self.division, minlength=6).tolist() != [5] * 6:
+            raise ValueError("Season simulation needs 30 teams in 2 leagues of 3 five-team divisions")
+
+    def __len__(self) -> int:
+        return len(self.team_ids)
+
+    def members(self, division: int) -> np.ndarray:
+        """Team indices of a division (league * 3 + division number)."""
+        return np.flatnonzero(self.division == division)
+
+
+def build_schedule(league: League) -> np.ndarray:
+    """
+    Build the balanced 162-game schedule as home-game counts.
+
+    Each team plays 13 games against each division rival (52), 6 or 7 against
+    each other league opponent (64: 7 against two teams of each other
+    division), 4 against its natural rival and 3 against every other
+    interleague opponent (46), with 81 home games.
+
+    Args:
+        league: League structure
+
+    Returns:
+        (30, 30) integer matrix where games[h, a] is the number of games h hosts a
+    """
+    games = np.zeros((len(league), len(league)), dtype=np.int64)
+
+    def series(home: int, away: int, total: int, home_games: int) -> None:
+        games[home, away] += home_games
+        games[away, home] += total - home_games
+
+    for lg in range(2):
+        divisions = [league.members(lg * 3 + d) for d in range(3)]
+        for members in divisions:
+            # A 5-cycle: each team hosts 7 of 13 against the next two, 6 against the others
+            for i in range(5):
+                for step in (1, 2):
+                    series(members[i], members[(i + step) % 5], 13, 7)
+        for d_a in range(3):
+            for d_b in range(d_a + 1, 3):
+                a_teams, b_teams = divisions[d_a], divisions[d_b]
+                for i in range(5):
+                    for j in range(5):
+                        if j == i:
+                            series(a_teams[i], b_teams[j], 7, 4)
+                        elif j == (i + 1) % 5:
+                            series(a_teams[i], b_teams[j], 7, 3)
+                        else:
+                            series(a_teams[i], b_teams[j], 6, 3)
+
+    # Interleague: index NL teams by their AL rival so offset 0 is the rival pairing
+    al = [i for i in range(len(league)) if league.league[i] == 0]
+    nl_by_rival = [league.index[NATURAL_RIVALS[league.team_ids[i]]] for i in al]
+    for i, home in enumerate(al):
+        for j, away in enumerate(nl_by_rival):
+            offset = (j - i) % 15
+            if offset == 0:
+                series(home, away, 4, 2)
+            else:
+                series(home, away, 3, 2 if offset <= 7 else 1)
+    return games
+
+
+class SeasonState:
+    """
+    Standings and remaining schedule of one season.
+
+    Results are folded in as games are played; the remaining home-game
+    matrix is what the simulator plays out.
+    """
+
+    def __init__(self, season: int, league: League):
+        self.season = season
+        self.league = league
+        self.remaining = build_schedule(league)
+        n = len(league)
+        self.wins = np.zeros(n, dtype=np.int64)
+        self.losses = np.zeros(n, dtype=np.int64)
+        self.runs_scored = np.zeros(n, dtype=np.int64)
+        self.runs_allowed = np.zeros(n, dtype=np.int64)
+        self.version = 0
+
+    def record_game(self, home_id: str, away_id: str, home_score: int, away_score: int) -> None:
+        """
+        Record a final score.
+
+        Raises:
+            ValueError: If a team is unknown, the game is a tie, or no such game remains
+        """
+        if home_id not in self.league.index or away_id not in self.league.index:
+            raise ValueError("Unknown team")
+        if home_score == away_score:
+            raise ValueError("Games cannot end in a tie")
+        home, away = self.league.index[home_id], self.league.index[away_id]
+        if self.remaining[home, away] <= 0:
+            raise ValueError(f"No remaining {away_id} at {home_id} game in {self.season}")
+
+        self.remaining[home, away] -= 1
+        winner, loser = (home, away) if home_score > away_score else (away, home)
+        self.wins[winner] += 1
+        self.losses[loser] += 1
+        self.runs_scored[home] += home_score
+        self.runs_allowed[home] += away_score
+        self.runs_scored[away] += away_score
+        self.runs_allowed[away] += home_score
+        self.version += 1
+
+    @property
+    def games_played(self) -> np.ndarray:
+        return self.wins + self.losses
+
+    def blended_strength(self, projected: np.ndarray) -> np.ndarray:
+        """
+        Blend projected strengths with each team's Pythagorean record so far.
+
+        Args:
+            projected: Preseason winning-percentage projections
+
+        Returns:
+            Strengths weighted PRIOR_GAMES to games played
+        """
+        played = self.games_played
+        actual = pythagorean(self.runs_scored.astype(np.float64), self.runs_allowed.astype(np.float64))
+        return (PRIOR_GAMES * projected + played * actual) / (PRIOR_GAMES + played)
+
+
+def _series(
+    home_win: np.ndarray,
+    higher: np.ndarray,
+    lower: np.ndarray,
+    games: int,
+    home_games: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Play a best-of-n series in every simulation.
+
+    Playing all n games and taking the majority picks the same winner as
+    stopping at the clinch, so each game is one uniform draw.
+    """
+    p_home = home_win[higher, lower]
+    p_away = 1 - home_win[lower, higher]
+    draws = rng.random((len(higher), games))
+    probs = np.concatenate([np.repeat(p_home[:, None], home_games, 1),
+                            np.repeat(p_away[:, None], games - home_games, 1)], axis=1)
+    wins = (draws < probs).sum(axis=1)
+    return np.where(wins > games // 2, higher, lower)
+
+
+def simulate_batch(
+    home_win: np.ndarray,
+    remaining: np.ndarray,
+    wins: np.ndarray,
+    losses: np.ndarray,
+    division: np.ndarray,
+    league: np.ndarray,
+    simulations: int,
+    seed: Any,
+) -> Dict[str, np.ndarray]:
+    """
+    Play out the rest of a season and the postseason in a batch of simulations.
+
+    Args:
+        home_win: (n, n) home-win probabilities
+        remaining: (n, n) remaining home-game counts
+        wins: Wins so far
+        losses: Losses so far
+        division: Division index per team
+        league: League index per team
+        simulations: Number of simulated seasons
+        seed: Seed or SeedSequence for this batch
+
+    Returns:
+        Per-team sums and counts over the batch
+    """
+    rng = np.random.default_rng(seed)
+    n = len(wins)
+    home, away = np.nonzero(remaining)
+    counts = remaining[home, away]
+    p = home_win[home, away]
+
+    # Home wins per (simulation, matchup) by inverting the binomial CDF of one uniform
+    max_games = int(counts.max()) if len(counts) else 0
+    cdf = np.ones((len(home), max(max_games, 1)), dtype=np.float64)
+    for k in range(max_games):
+        pmf = np.array([comb(int(c), k) for c in counts]) * p ** k * (1 - p) ** (counts - k)
+        cdf[:, k] = pmf if k == 0 else cdf[:, k - 1] + pmf
+    cdf[np.arange(max_games)[None, :] >= counts[:, None]] = 2.0
+    cdf = cdf.astype(np.float32)
+
+    home_onehot = np.zeros((len(home), n), dtype=np.float32)
+    home_onehot[np.arange(len(home)), home] = 1
+    away_onehot = np.zeros((len(home), n), dtype=np.float32)
+    away_onehot[np.arange(len(home)), away] = 1
+
+    u = rng.random((simulations, len(home)), dtype=np.float32)
+    home_wins = np.zeros((simulations, len(home)), dtype=np.float32)
+    for k in range(max_games):
+        home_wins += u > cdf[:, k]
+    away_wins = counts.astype(np.float32) - home_wins
+    final_wins = wins + home_wins @ home_onehot + away_wins @ away_onehot
+    final_wins = np.rint(final_wins).astype(np.int64)
+
+    # Ties in the standings break at random
+    keys = final_wins + rng.random((simulations, n))
+    sims = np.arange(simulations)
+
+    division_rank = np.zeros((simulations, n), dtype=np.int64)
+    division_winner = np.zeros((simulations, 6), dtype=np.int64)
+    for d in range(6):
+        members = np.flatnonzero(division == d)
+        order = np.argsort(-keys[:, members], axis=1)
+        division_rank[sims[:, None], members[order]] = np.arange(1, len(members) + 1)
+        division_winner[:, d] = members[order[:, 0]]
+
+    made_playoffs = np.zeros(n, dtype=np.int64)
+    won_division = np.bincount(division_winner.ravel(), minlength=n)
+    bye = np.zeros(n, dtype=np.int64)
+    pennant = np.zeros((simulations, 2), dtype=np.int64)
+    for lg in range(2):
+        # Seeds 1-3: division winners by record; 4-6: best three other teams
+        winners = division_winner[:, lg * 3 : lg * 3 + 3]
+        winners = np.take_along_axis(winners, np.argsort(-keys[sims[:, None], winners], axis=1), axis=1)
+        others = keys.copy()
+        others[:, league != lg] = -np.inf
+        others[sims[:, None], winners] = -np.inf
+        wild_cards = np.argsort(-others, axis=1)[:, :3]
+        seeds = np.concatenate([winners, wild_cards], axis=1)
+
+        made_playoffs += np.bincount(seeds.ravel(), minlength=n)
+        bye += np.bincount(seeds[:, :2].ravel(), minlength=n)
+
+        wc_a = _series(home_win, seeds[:, 2], seeds[:, 5], *WILD_CARD_SERIES, rng)
+        wc_b = _series(home_win, seeds[:, 3], seeds[:, 4], *WILD_CARD_SERIES, rng)
+        ds_a = _series(home_win, seeds[:, 0], wc_b, *DIVISION_SERIES, rng)
+        ds_b = _series(home_win, seeds[:, 1], wc_a, *DIVISION_SERIES, rng)
+        # The LCS home team is the better (lower-numbered) of the two remaining seeds
+        seed_number = np.zeros((simulations, n), dtype=np.int64)
+        seed_number[sims[:, None], seeds] = np.arange(6)
+        a_better = seed_number[sims, ds_a] < seed_number[sims, ds_b]
+        higher = np.where(a_better, ds_a, ds_b)
+        lower = np.where(a_better, ds_b, ds_a)
+        pennant[:, lg] = _series(home_win, higher, lower, *CHAMPIONSHIP_SERIES, rng)
+
+    # World Series home field goes to the better regular-season record
+    al_champ, nl_champ = pennant[:, 0], pennant[:, 1]
+    al_better = keys[sims, al_champ] > keys[sims, nl_champ]
+    higher = np.where(al_better, al_champ, nl_champ)
+    lower = np.where(al_better, nl_champ, al_champ)
+    champion = _series(home_win, higher, lower, *WORLD_SERIES, rng)
+
+    return {
+        "wins_sum": final_wins.sum(axis=0).astype(np.float64),
+        "wins_sq_sum": (final_wins.astype(np.float64) ** 2).sum(axis=0),
+        "division_rank_sum": division_rank.sum(axis=0).astype(np.float64),
+        "playoffs": made_playoffs,
+        "division": won_division,
+        "bye": bye,
+        "pennant": np.bincount(pennant.ravel(), minlength=n),
+        "championship": np.bincount(champion, minlength=n),
+    }
+
+
+def simulation_pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by all simulations, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context(POOL_START_METHOD),
+            )
+        return _pool
+
+
+def simulate_season(
+    state: SeasonState,
+    strength: np.ndarray,
+    simulations: int = 10000,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Monte Carlo the rest of a season for every team at once.
+
+    Simulations run in vectorized batches; with workers > 1 the batches are
+    spread over the shared simulation_pool().
+
+    Args:
+        state: Season standings and remaining schedule
+        strength: Winning-percentage strength per team (league order)
+        simulations: Number of simulated seasons
+        workers: Processes to use (None or 1 runs in this process)
+        seed: Random seed for reproducible odds
+
+    Returns:
+        Dictionary of team ID to projected record and postseason odds (percent)
+    """
+    league = state.league
+    home_win = home_win_matrix(np.clip(strength, 0.2, 0.8))
+    sizes = [min(BATCH_SIMULATIONS, simulations - start) for start in range(0, simulations, BATCH_SIMULATIONS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (home_win, state.remaining, state.wins, state.losses, league.division, league.league, size, s)
+        for size, s in zip(sizes, seeds)
+    ]
+
+    if workers and workers > 1 and len(args) > 1:
+        batches = list(simulation_pool().map(simulate_batch, *zip(*args)))
+    else:
+        batches = [simulate_batch(*a) for a in args]
+
+    totals = {key: sum(b[key] for b in batches) for key in batches[0]}
+    mean_wins = totals["wins_sum"] / simulations
+    std_wins = np.sqrt(np.maximum(totals["wins_sq_sum"] / simulations - mean_wins ** 2, 0))
+    games = state.wins + state.losses + state.remaining.sum(axis=0) + state.remaining.sum(axis=1)
+
+    def percent(key: str, i: int) -> float:
+        return round(100.0 * float(totals[key][i]) / simulations, 1)
+
+    return {
+        team_id: {
+            "projected_wins": round(float(mean_wins[i]), 1),
+            "projected_losses": round(float(games[i] - mean_wins[i]), 1),
+            "wins_std": round(float(std_wins[i]), 2),
+            "division_rank": round(float(totals["division_rank_sum"][i] / simulations), 2),
+            "playoff_odds": percent("playoffs", i),
+            "division_odds": percent("division", i),
+            "bye_odds": percent("bye", i),
+            "pennant_odds": percent("pennant", i),
+            "championship_odds": percent("championship", i),
+        }
+        for i, team_id in enumerate(league.team_ids)
+    }
+
+
+def default_workers(simulations: int) -> int:
+    """Use a process pool only when there is enough work to amortize it."""
+    if simulations < 4 * BATCH_SIMULATIONS:
+        return 1
+    return min(os.cpu_count() or 1, -(-simulations // BATCH_SIMULATIONS))
+
+
+class SeasonSimulator:
+    """
+    Registry wrapper around simulate_season, so season odds are served by a
+    versioned model like player projections.
+    """
+
+    version = "2.0.0"
+
+    def predict(self, state: SeasonState, strength: np.ndarray, simulations: int = 10000) -> Dict[str, Dict[str, Any]]:
+        """Simulate the rest of a season (see simulate_season)."""
+        return simulate_season(state, strength, simulations, workers=default_workers(simulations))
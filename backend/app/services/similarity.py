@@ -0,0 +1,272 @@
+from typing import List, Optional, Dict, Tuple, Any
+import numpy as np
+from app.services.feature_store import FEATURE_POSITIONS
+
+# Feature store columns compared per player group (see feature_store.FEATURE_COLUMNS)
+SIMILARITY_FEATURES = {
+    "batting": [
+        "batting.batting_average",
+        "batting.on_base_percentage",
+        "batting.slugging_percentage",
+        "batting.isolated_power",
+        "batting.batting_average_on_balls_in_play",
+        "batting.walk_percentage",
+        "batting.strikeout_percentage",
+        "batting.home_runs/plate_appearances",
+        "batting.stolen_bases/plate_appearances",
+        "statcast.average_exit_velocity",
+        "statcast.average_launch_angle",
+        "statcast.barrel_percentage",
+        "statcast.hard_hit_percentage",
+        "statcast.average_sprint_speed",
+        "age",
+    ],
+    "pitching": [
+        "pitching.earned_run_average",
+        "pitching.fielding_independent_pitching",
+        "pitching.walks_and_hits_per_inning_pitched",
+        "pitching.strikeouts_per_nine",
+        "pitching.walks_per_nine",
+        "pitching.home_runs_per_nine",
+        "pitching.strikeout_percentage",
+        "pitching.walk_percentage",
+        "pitching.ground_ball_percentage",
+        "pitching.games_started/games",
+        "statcast.average_fastball_velocity",
+        "statcast.spin_rate_fastball",
+        "statcast.spin_rate_breaking",
+        "statcast.whiff_percentage",
+        "statcast.chase_percentage",
+        "age",
+    ],
+}
+
+# Positions one-hot encoded per group; other positions get no position feature
+SIMILARITY_POSITIONS = {
+    "batting": ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"],
+    "pitching": ["SP", "RP", "P"],
+}
+
+# Scale of the position one-hot columns relative to a standardized stat
+POSITION_WEIGHT = 1.0
+
+# Queries evaluated per matrix product in batch mode
+BATCH_SIZE = 256
+
+
+class _GroupMatrix:
+    """Standardized feature matrix of one player group (hitters or pitchers)."""
+
+    def __init__(self, rows: np.ndarray, player_id: np.ndarray, season: np.ndarray,
+                 position: np.ndarray, features: np.ndarray):
+        self.rows = rows
+        self.player_id = player_id
+        self.season = season
+        self.position = position
+        self.features = features
+        self.sq_norms = np.einsum("ij,ij->i", features, features)
+        norms = np.sqrt(self.sq_norms)
+        self.unit = features / np.where(norms > 0, norms, 1)[:, None]
+
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour index over player-season statistical profiles.
+
+    Hitter and pitcher seasons live in separate matrices of rate stats,
+    Statcast metrics and age, z-scored within each season by the feature
+    store, plus a one-hot position block. A query is one matrix-vector product
+    (cosine similarity over unit rows, or squared Euclidean distance from
+    precomputed norms) followed by an argpartition. The matrices are rebuilt
+    when the stats table or a player changes.
+    """
+
+    def __init__(self, store: Any):
+        self.store = store
+        self.table = store.table
+        self.version = None
+        self._groups: Dict[str, _GroupMatrix] = {}
+        self._locations: Dict[Tuple[int, int], Tuple[str, int]] = {}
+
+    def _build(self) -> None:
+        table = self.table
+        seasons = np.unique(table.season[: table.n_rows]).tolist()
+        matrices = [self.store.matrix(season) for season in seasons]
+
+        self._groups = {}
+        self._locations = {}
+        for group in ("batting", "pitching"):
+            positions = SIMILARITY_POSITIONS[group]
+            to_group = np.array([positions.index(p) if p in positions else -1 for p in FEATURE_POSITIONS] + [-1])
+            # Pitchers are the seasons with a pitching line; hitters need a batting line
+            parts = []
+            for matrix in matrices:
+                pitching = table.present["pitching"][matrix.rows]
+                members = np.flatnonzero(pitching if group == "pitching" else table.present["batting"][matrix.rows] & ~pitching)
+                parts.append((matrix, members))
+
+            columns = len(SIMILARITY_FEATURES[group])
+            if parts:
+                rows = np.concatenate([m.rows[i] for m, i in parts]).astype(np.int64)
+                player_id = np.concatenate([m.player_id[i] for m, i in parts]).astype(np.int64)
+                season = np.concatenate([np.full(len(i), m.season, dtype=np.int64) for m, i in parts])
+                z = np.concatenate([m.features[i][:, m.columns(SIMILARITY_FEATURES[group])] for m, i in parts])
+                codes = np.concatenate([m.position[i] for m, i in parts]).astype(np.int64)
+            else:
+                rows = player_id = season = codes = np.zeros(0, dtype=np.int64)
+                z = np.zeros((0, columns), dtype=np.float32)
+            # Store position codes mapped onto this group's positions; -1 (unknown) stays -1
+            position = to_group[codes]
+
+            one_hot = np.zeros((len(rows), len(positions)), dtype=np.float32)
+            known = position >= 0
+            one_hot[np.flatnonzero(known), position[known]] = POSITION_WEIGHT
+
+            features = np.hstack([z, one_hot]).astype(np.float32)
+            self._groups[group] = _GroupMatrix(rows, player_id, season, position, features)
+            for i, key in enumerate(zip(player_id.tolist(), season.tolist())):
+                self._locations[key] = (group, i)
+
+        self.version = (table.version, self.store.player_version)
+
+    def _ensure(self) -> None:
+        if self.version != (self.table.version, self.store.player_version):
+            self._build()
+
+    def locate(self, player_id: int, season: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """
+        Find a player-season in the index.
+
+        Args:
+            player_id: The player's ID
+            season: Season year (defaults to the player's most recent season)
+
+        Returns:
+            (group, index) tuple, or None if the player-season is not indexed
+        """
+        self._ensure()
+        seasons = [season] if season else reversed(self.table.seasons_for(player_id))
+        for s in seasons:
+            location = self._locations.get((player_id, s))
+            if location is not None:
+                return location
+        return None
+
+    def _candidate_mask(
+        self,
+        matrix: _GroupMatrix,
+        position: Optional[str],
+        seasons: Optional[List[int]],
+        group: str,
+    ) -> Optional[np.ndarray]:
+        mask = None
+        if position is not None:
+            positions = SIMILARITY_POSITIONS[group]
+            code = positions.index(position) if position in positions else -2
+            mask = matrix.position == code
+        if seasons:
+            in_seasons = np.isin(matrix.season, seasons)
+            mask = in_seasons if mask is None else mask & in_seasons
+        return mask
+
+    def _scores(self, matrix: _GroupMatrix, queries: np.ndarray, metric: str) -> np.ndarray:
+        """Return (n_queries, n_rows) scores where lower is more similar."""
+        if metric == "cosine":
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            unit = queries / np.where(norms > 0, norms, 1)
+            return -(unit @ matrix.unit.T)
+        if metric == "euclidean":
+            q_sq = np.einsum("ij,ij->i", queries, queries)[:, None]
+            return matrix.sq_norms[None, :] - 2 * (queries @ matrix.features.T) + q_sq
+        raise ValueError("metric must be cosine or euclidean")
+
+    def query_batch(
+        self,
+        player_ids: List[int],
+        season: Optional[int] = None,
+        k: int = 5,
+        metric: str = "cosine",
+        position: Optional[str] = None,
+        seasons: Optional[List[int]] = None,
+    ) -> List[List[Tuple[int, int, float]]]:
+        """
+        Find the nearest player-seasons for many players at once.
+
+        Each query player is matched on their season line (default: most recent)
+        against the other players of the same group; a neighbour appears once,
+        with its most similar season.
+
+        Args:
+            player_ids: Query player IDs
+            season: Season of the query lines (defaults to each player's latest)
+            k: Neighbours per query
+            metric: "cosine" (similarity, higher is closer) or "euclidean" (distance)
+            position: Only return neighbours at this position
+            seasons: Only return neighbour seasons in this list
+
+        Returns:
+            One list per query of (player_id, season, score) tuples, closest first;
+            empty for players without an indexed line
+        """
+        results: List[List[Tuple[int, int, float]]] = [[] for _ in player_ids]
+        by_group: Dict[str, List[Tuple[int, int]]] = {}
+        for q, player_id in enumerate(player_ids):
+            location = self.locate(player_id, season)
+            if location is not None:
+                by_group.setdefault(location[0], []).append((q, location[1]))
+
+        for group, located in by_group.items():
+            matrix = self._groups[group]
+            mask = self._candidate_mask(matrix, position, seasons, group)
+            for start in range(0, len(located), BATCH_SIZE):
+                chunk = located[start : start + BATCH_SIZE]
+                indices = np.array([i for _, i in chunk])
+                scores = self._scores(matrix, matrix.features[indices], metric)
+                if mask is not None:
+                    scores[:, ~mask] = np.inf
+                for (q, i), row_scores in zip(chunk, scores):
+                    results[q] = self._top(matrix, row_scores, int(matrix.player_id[i]), k, metric)
+        return results
+
+    def query(
+        self,
+        player_id: int,
+        season: Optional[int] = None,
+        k: int = 5,
+        metric: str = "cosine",
+        position: Optional[str] = None,
+        seasons: Optional[List[int]] = None,
+    ) -> List[Tuple[int, int, float]]:
+        """Find the nearest player-seasons for one player (see query_batch)."""
+        return self.query_batch([player_id], season, k, metric, position, seasons)[0]
+
+    @staticmethod
+    def _top(
+        matrix: _GroupMatrix,
+        scores: np.ndarray,
+        player_id: int,
+        k: int,
+        metric: str,
+    ) -> List[Tuple[int, int, float]]:
+        """Select the k closest distinct players from one row of scores."""
+        scores[matrix.player_id == player_id] = np.inf
+        eligible = int(np.isfinite(scores).sum())
+        # Players recur across seasons, so partition for extra rows and widen if needed
+        m = min(eligible, k * 4)
+        while True:
+            top = np.argpartition(scores, m - 1)[:m] if m else np.zeros(0, dtype=np.int64)
+            top = top[np.lexsort((matrix.player_id[top], scores[top]))]
+            picked: List[Tuple[int, int, float]] = []
+            seen = set()
+            for i in top:
+                pid = int(matrix.player_id[i])
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                score = -scores[i] if metric == "cosine" else np.sqrt(max(scores[i], 0.0))
+                picked.append((pid, int(matrix.season[i]), round(float(score), 4)))
+                if len(picked) == k:
+                    return picked
+            if m >= eligible:
+                return picked
+            m = min(eligible, m * 4)
@@ -0,0 +1,572 @@
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Union
+import json
+import os
+import shutil
+import numpy as np
+
+# Default location of the on-disk pitch store; one directory per season partition
+STATCAST_DIR = Path(os.environ.get("MLB_STATCAST_DIR", Path(__file__).resolve().parents[2] / "data" / "statcast"))
+
+EPOCH = date(1970, 1, 1)
+
+# Pitch-level columns and their on-disk dtypes. Categorical columns hold codes into
+# the partition's vocabulary; batted-ball columns are NaN on pitches not put in play.
+PITCH_COLUMNS = {
+    "game_date": np.int32,  # days since 1970-01-01
+    "batter": np.int32,
+    "pitcher": np.int32,
+    "bat_team": np.int8,
+    "fld_team": np.int8,
+    "pitch_type": np.int8,
+    "release_speed": np.float32,
+    "release_spin_rate": np.float32,
+    "pfx_x": np.float32,
+    "pfx_z": np.float32,
+    "launch_speed": np.float32,
+    "launch_angle": np.float32,
+    "hit_distance": np.float32,
+    "events": np.int8,
+    "is_swing": np.bool_,
+    "is_whiff": np.bool_,
+    "in_zone": np.bool_,
+    "is_barrel": np.bool_,
+}
+
+# Subdirectory of a season partition holding its tail segments
+SEGMENTS_DIR = "segments"
+
+# Entity indexes kept per partition: index name -> column holding the entity key
+ENTITY_INDEXES = {
+    "batter": "batter",
+    "pitcher": "pitcher",
+    "bat_team": "bat_team",
+    "fld_team": "fld_team",
+}
+
+FASTBALLS = ("FF", "SI", "FC")
+BREAKING_BALLS = ("SL", "CU", "KC", "SV", "ST")
+
+
+def date_to_day(value: Union[str, date]) -> int:
+    """Convert a date or YYYY-MM-DD string to days since 1970-01-01."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return (value - EPOCH).days
+
+
+def day_to_date(day: int) -> date:
+    """Convert days since 1970-01-01 back to a date."""
+    return EPOCH + timedelta(days=int(day))
+
+
+def is_barrel(launch_speed: np.ndarray, launch_angle: np.ndarray) -> np.ndarray:
+    """
+    Flag barrels: 98+ mph batted balls whose launch angle falls in a window that
+    starts at 26-30 degrees and widens by about one degree per extra mph.
+    """
+    with np.errstate(invalid="ignore"):
+        extra = np.clip(launch_speed - 98, 0, None)
+        low = np.maximum(26 - extra, 8)
+        high = np.minimum(30 + extra * 1.2, 50)
+        return (launch_speed >= 98) & (launch_angle >= low) & (launch_angle <= high)
+
+
+def _build_partition(columns: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Sort pitch columns by game date and build the per-entity row-offset indexes.
+
+    For each entity index the rows are grouped by entity (stable, so game-date
+    order is kept inside each group): ``order`` lists row numbers, ``keys`` and
+    ``offsets`` delimit each entity's run in ``order``, and ``dates`` holds the
+    game date of each entry so date ranges can be found by binary search.
+    """
+    by_date = np.argsort(columns["game_date"], kind="stable")
+    table = {name: np.ascontiguousarray(columns[name][by_date]).astype(dtype, copy=False)
+             for name, dtype in PITCH_COLUMNS.items()}
+
+    indexes = {}
+    for index_name, column in ENTITY_INDEXES.items():
+        order = np.argsort(table[column], kind="stable").astype(np.int32)
+        keys, starts = np.unique(table[column][order], return_index=True)
+        indexes[f"{index_name}_order"] = order
+        indexes[f"{index_name}_dates"] = table["game_date"][order]
+        indexes[f"{index_name}_keys"] = keys
+        indexes[f"{index_name}_offsets"] = np.append(starts, len(order)).astype(np.int64)
+    return table, indexes
+
+
+class StatcastPartition:
+    """
+    One season of pitch-level Statcast data in columnar form.
+
+    Columns are NumPy arrays sorted by game date, normally memory-mapped from the
+    season's directory so only the pages a query touches are read. Each entity
+    index (batter, pitcher, batting team, fielding team) maps an entity to a
+    contiguous run of date-ordered row numbers.
+
+    Game days ingested after the season was written are kept as tail segments:
+    small partitions of their own, later in date than everything before them.
+    Row numbers run through the base rows and then each segment in turn.
+    """
+
+    def __init__(
+        self,
+        season: int,
+        columns: Dict[str, np.ndarray],
+        indexes: Dict[str, np.ndarray],
+        vocab: Dict[str, List[str]],
+        last_updated: Optional[str] = None,
+        segments: Optional[List["StatcastPartition"]] = None,
+        path: Optional[Path] = None,
+    ):
+        self.season = season
+        self.columns = columns
+        self.indexes = indexes
+        self.vocab = vocab
+        self.last_updated = last_updated or date.today().isoformat()
+        self.segments = list(segments or [])
+        # Directory the partition was opened from, or None while it only lives in memory
+        self.path = path
+        self._codes = {name: {v: i for i, v in enumerate(values)} for name, values in vocab.items()}
+        # First row number of the base and of each segment, then the total
+        sizes = [len(self.columns["game_date"])] + [len(segment) for segment in self.segments]
+        self._bounds = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    def __len__(self) -> int:
+        return int(self._bounds[-1])
+
+    @classmethod
+    def from_arrays(
+        cls,
+        season: int,
+        columns: Dict[str, np.ndarray],
+        vocab: Dict[str, List[str]],
+    ) -> "StatcastPartition":
+        """Build an in-memory partition from unsorted pitch columns."""
+        table, indexes = _build_partition(columns)
+        return cls(season, table, indexes, vocab)
+
+    @classmethod
+    def open(cls, path: Path, mmap_mode: Optional[str] = "r") -> "StatcastPartition":
+        """Memory-map a partition written by write(), with its tail segments."""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        columns = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in PITCH_COLUMNS}
+        indexes = {name: np.load(path / "index" / f"{name}.npy", mmap_mode=mmap_mode)
+                   for name in meta["indexes"]}
+        segments = [cls.open(path / SEGMENTS_DIR / name, mmap_mode) for name in meta.get("segments", [])]
+        return cls(meta["season"], columns, indexes, meta["vocab"], meta.get("last_updated"), segments, path)
+
+    def write(self, path: Path) -> None:
+        """Write the partition as one .npy file per column and index, segments under segments/."""
+        path = Path(path)
+        (path / "index").mkdir(parents=True, exist_ok=True)
+        for name, values in self.columns.items():
+            np.save(path / f"{name}.npy", np.asarray(values))
+        for name, values in self.indexes.items():
+            np.save(path / "index" / f"{name}.npy", np.asarray(values))
+        self._write_meta(path, self._write_segments(path))
+
+    def write_segments(self) -> "StatcastPartition":
+        """
+        Write the tail segments not yet on disk and re-open the partition memory-mapped.
+
+        The base files are left alone. meta.json is replaced atomically once the
+        new segments are complete, and segments it no longer lists are removed.
+
+        Returns:
+            The partition re-opened from its directory
+        """
+        names = self._write_segments(self.path)
+        self._write_meta(self.path, names)
+        for stale in (self.path / SEGMENTS_DIR).glob("*"):
+            if stale.name not in names:
+                shutil.rmtree(stale, ignore_errors=True)
+        return StatcastPartition.open(self.path)
+
+    def _write_segments(self, path: Path) -> List[str]:
+        """Write segments missing under path; returns every segment's directory name."""
+        names = []
+        for segment, start, stop in zip(self.segments, self._bounds[1:-1].tolist(), self._bounds[2:].tolist()):
+            # Named by row range, so a merged segment never reuses a live directory
+            name = f"{start:09d}-{stop:09d}"
+            target = path / SEGMENTS_DIR / name
+            if segment.path != target:
+                shutil.rmtree(target, ignore_errors=True)
+                segment.write(target)
+            names.append(name)
+        return names
+
+    def _write_meta(self, path: Path, segments: List[str]) -> None:
+        meta = {
+            "season": self.season,
+            "n_rows": len(self),
+            "indexes": sorted(self.indexes),
+            "vocab": self.vocab,
+            "last_updated": self.last_updated,
+            "segments": segments,
+        }
+        scratch = path / "meta.json.tmp"
+        scratch.write_text(json.dumps(meta, indent=2))
+        os.replace(scratch, path / "meta.json")
+
+    def last_day(self) -> Optional[int]:
+        """Return the latest game day stored (days since epoch), or None if empty."""
+        for part in reversed([self] + self.segments):
+            dates = part.columns["game_date"]
+            if len(dates):
+                return int(dates[-1])
+        return None
+
+    def append(self, columns: Dict[str, np.ndarray]) -> "StatcastPartition":
+        """
+        Return a new partition with extra pitches added.
+
+        Pitches no earlier than the last stored day become a new tail segment,
+        sorted and indexed on their own, so the season's rows are neither copied
+        nor re-sorted. The two newest segments are merged while the older is no
+        larger, which keeps a season at O(log days) segments and re-indexes each
+        pitch O(log days) times. Pitches dated before the last stored day cannot
+        extend the date order and rebuild the whole partition instead.
+
+        Args:
+            columns: Pitch columns coded against this partition's vocabulary
+
+        Returns:
+            New partition sharing this one's base and older segments
+        """
+        if not len(columns["game_date"]):
+            return self
+        last_day = self.last_day()
+        if last_day is not None and int(np.min(columns["game_date"])) < last_day:
+            merged = {name: np.concatenate([self.take(slice(None), [name])[name], np.asarray(columns[name])])
+                      for name in PITCH_COLUMNS}
+            return StatcastPartition.from_arrays(self.season, merged, self.vocab)
+
+        segments = self.segments + [StatcastPartition.from_arrays(self.season, columns, self.vocab)]
+        while len(segments) > 1 and len(segments[-2]) <= len(segments[-1]):
+            newer, older = segments.pop(), segments.pop()
+            # Both are date-sorted and older ends no later than newer starts
+            joined = {name: np.concatenate([np.asarray(older.columns[name]), newer.columns[name]])
+                      for name in PITCH_COLUMNS}
+            segments.append(StatcastPartition.from_arrays(self.season, joined, self.vocab))
+        return StatcastPartition(self.season, self.columns, self.indexes, self.vocab, segments=segments, path=self.path)
+
+    def code(self, column: str, value: str) -> Optional[int]:
+        """Return the code of a categorical value, or None if it never occurs."""
+        return self._codes[column].get(value)
+
+    def decode(self, column: str, codes: np.ndarray) -> List[str]:
+        """Map categorical codes back to their string values."""
+        values = self.vocab[column]
+        return [values[c] for c in codes.tolist()]
+
+    def rows(
+        self,
+        index: Optional[str] = None,
+        key: Optional[int] = None,
+        start_day: Optional[int] = None,
+        end_day: Optional[int] = None,
+    ) -> Union[slice, np.ndarray]:
+        """
+        Locate the rows of an entity (or of the whole season) within a date range.
+
+        Both lookups are binary searches: the entity's run of the index is found
+        from its keys and offsets, then the date bounds within that run. With
+        tail segments each segment is searched the same way.
+
+        Args:
+            index: Entity index name (batter, pitcher, bat_team, fld_team), or None for all rows
+            key: Entity key (player ID or team code)
+            start_day: First day to include (days since epoch), or None
+            end_day: Last day to include (days since epoch), or None
+
+        Returns:
+            A slice of the date-sorted columns when no entity is given, otherwise
+            an array of row numbers in date order
+        """
+        if not self.segments:
+            return self._own_rows(index, key, start_day, end_day)
+        parts = [self._own_rows(index, key, start_day, end_day)]
+        parts += [segment._own_rows(index, key, start_day, end_day) for segment in self.segments]
+        if index is None:
+            # Rows are date-sorted across segments, so the bounds add up
+            return slice(sum(part.start for part in parts), sum(part.stop for part in parts))
+        return np.concatenate([part + start for part, start in zip(parts, self._bounds[:-1])])
+
+    def _own_rows(
+        self,
+        index: Optional[str],
+        key: Optional[int],
+        start_day: Optional[int],
+        end_day: Optional[int],
+    ) -> Union[slice, np.ndarray]:
+        """rows() over this partition's own columns, ignoring its segments."""
+        if index is None:
+            dates = self.columns["game_date"]
+            lo = 0 if start_day is None else int(np.searchsorted(dates, start_day, side="left"))
+            hi = len(dates) if end_day is None else int(np.searchsorted(dates, end_day, side="right"))
+            return slice(lo, hi)
+
+        keys = self.indexes[f"{index}_keys"]
+        pos = int(np.searchsorted(keys, key))
+        if pos == len(keys) or keys[pos] != key:
+            return np.empty(0, dtype=np.int32)
+
+        offsets = self.indexes[f"{index}_offsets"]
+        begin, end = int(offsets[pos]), int(offsets[pos + 1])
+        dates = self.indexes[f"{index}_dates"][begin:end]
+        lo = 0 if start_day is None else int(np.searchsorted(dates, start_day, side="left"))
+        hi = len(dates) if end_day is None else int(np.searchsorted(dates, end_day, side="right"))
+        return np.asarray(self.indexes[f"{index}_order"][begin + lo : begin + hi])
+
+    def take(self, rows: Union[slice, np.ndarray], names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Gather the given rows of some (or all) columns into memory."""
+        names = names or list(PITCH_COLUMNS)
+        if not self.segments:
+            return {name: np.asarray(self.columns[name][rows]) for name in names}
+
+        parts = [self] + self.segments
+        starts = self._bounds[:-1].tolist()
+        if isinstance(rows, slice):
+            lo, hi, _ = rows.indices(len(self))
+            pieces = [(part, slice(max(lo - start, 0), max(min(hi - start, len(part)), 0)))
+                      for part, start in zip(parts, starts)]
+            return {name: np.concatenate([np.asarray(part.columns[name][local]) for part, local in pieces])
+                    for name in names}
+
+        rows = np.asarray(rows, dtype=np.int64)
+        owner = np.searchsorted(self._bounds[1:], rows, side="right")
+        taken = {name: np.empty(len(rows), dtype=PITCH_COLUMNS[name]) for name in names}
+        for i in np.unique(owner).tolist():
+            mask = owner == i
+            local = rows[mask] - starts[i]
+            for name in names:
+                taken[name][mask] = parts[i].columns[name][local]
+        return taken
+
+
+class StatcastStore:
+    """
+    Season-partitioned pitch store.
+
+    Partitions are opened lazily from ``<root>/season=<year>`` and kept memory-mapped;
+    partitions registered with add() live in memory.
+    """
+
+    def __init__(self, root: Path = STATCAST_DIR):
+        self.root = Path(root)
+        self._partitions: Dict[int, StatcastPartition] = {}
+
+    def _path(self, season: int) -> Path:
+        return self.root / f"season={season}"
+
+    def seasons(self) -> List[int]:
+        """Return the seasons available in memory or on disk."""
+        seasons = set(self._partitions)
+        if self.root.is_dir():
+            for path in self.root.glob("season=*"):
+                if (path / "meta.json").exists():
+                    seasons.add(int(path.name.split("=", 1)[1]))
+        return sorted(seasons)
+
+    def is_persisted(self, season: int) -> bool:
+        """Return whether a season partition exists on disk."""
+        return (self._path(season) / "meta.json").exists()
+
+    def add(self, partition: StatcastPartition, persist: bool = False) -> None:
+        """
+        Register a partition, optionally writing it to disk and re-opening it memory-mapped.
+
+        The files are written to a scratch directory and swapped in by rename, so
+        readers still mapping the previous version of the season are not disturbed.
+        """
+        if persist:
+            path = self._path(partition.season)
+            scratch = path.with_name(path.name + ".tmp")
+            retired = path.with_name(path.name + ".old")
+            shutil.rmtree(scratch, ignore_errors=True)
+            partition.write(scratch)
+            if path.exists():
+                shutil.rmtree(retired, ignore_errors=True)
+                path.rename(retired)
+            scratch.rename(path)
+            shutil.rmtree(retired, ignore_errors=True)
+            partition = StatcastPartition.open(path)
+        self._partitions[partition.season] = partition
+
+    def append(self, season: int, columns: Dict[str, np.ndarray]) -> StatcastPartition:
+        """
+        Add pitches to a season's partition (see StatcastPartition.append).
+
+        A partition on disk only gains its new segment files; one rebuilt by an
+        out-of-order append is rewritten like add(persist=True).
+
+        Args:
+            season: Season year (its partition must exist)
+            columns: Pitch columns coded against the partition's vocabulary
+
+        Returns:
+            The season's new partition
+        """
+        partition = self.get(season)
+        appended = partition.append(columns)
+        if partition.path is not None:
+            if appended.columns is partition.columns:
+                appended = appended.write_segments()
+            else:
+                self.add(appended, persist=True)
+                return self._partitions[season]
+        self._partitions[season] = appended
+        return appended
+
+    def get(self, season: int) -> Optional[StatcastPartition]:
+        """Return the partition for a season, or None if there is no data."""
+        partition = self._partitions.get(season)
+        if partition is None and self.is_persisted(season):
+            partition = StatcastPartition.open(self._path(season))
+            self._partitions[season] = partition
+        return partition
+
+
+# Additive per-pitch components behind the aggregated Statcast metrics. Any set of
+# pitches is summarized by summing these, which is what makes prefix sums possible.
+COMPONENTS = (
+    "pitches",
+    "batted",
+    "launch_speed",
+    "launch_angle",
+    "launch_angle_n",
+    "hit_distance",
+    "hit_distance_n",
+    "barrels",
+    "hard_hit",
+    "swings",
+    "whiffs",
+    "out_of_zone",
+    "chases",
+    "fastball_velo",
+    "fastball_velo_n",
+    "fastball_spin",
+    "fastball_spin_n",
+    "breaking_velo",
+    "breaking_velo_n",
+    "breaking_spin",
+    "breaking_spin_n",
+)
+
+
+def pitch_components(pitches: Dict[str, np.ndarray], partition: StatcastPartition) -> np.ndarray:
+    """
+    Expand pitch columns into one row of additive components per pitch.
+
+    Args:
+        pitches: Pitch columns (as returned by StatcastPartition.take)
+        partition: Partition the pitches came from (for pitch type codes)
+
+    Returns:
+        Float32 array of shape (n_pitches, len(COMPONENTS))
+    """
+    def pitch_codes(types: Tuple[str, ...]) -> List[int]:
+        return [c for c in (partition.code("pitch_type", t) for t in types) if c is not None]
+
+    def present(values: np.ndarray, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        keep = ~np.isnan(values) if mask is None else mask & ~np.isnan(values)
+        return np.where(keep, values, 0), keep
+
+    n = len(pitches["game_date"])
+    launch_speed, batted = present(pitches["launch_speed"])
+    launch_angle, launch_angle_n = present(pitches["launch_angle"])
+    hit_distance, hit_distance_n = present(pitches["hit_distance"])
+    swings = pitches["is_swing"]
+    out_of_zone = ~pitches["in_zone"]
+    fastball = np.isin(pitches["pitch_type"], pitch_codes(FASTBALLS))
+    breaking = np.isin(pitches["pitch_type"], pitch_codes(BREAKING_BALLS))
+    fastball_velo, fastball_velo_n = present(pitches["release_speed"], fastball)
+    fastball_spin, fastball_spin_n = present(pitches["release_spin_rate"], fastball)
+    breaking_velo, breaking_velo_n = present(pitches["release_speed"], breaking)
+    breaking_spin, breaking_spin_n = present(pitches["release_spin_rate"], breaking)
+
+    values = {
+        "pitches": np.ones(n),
+        "batted": batted,
+        "launch_speed": launch_speed,
+        "launch_angle": launch_angle,
+        "launch_angle_n": launch_angle_n,
+        "hit_distance": hit_distance,
+        "hit_distance_n": hit_distance_n,
+        "barrels": pitches["is_barrel"] & batted,
+        "hard_hit": batted & (launch_speed >= 95),
+        "swings": swings,
+        "whiffs": pitches["is_whiff"] & swings,
+        "out_of_zone": out_of_zone,
+        "chases": swings & out_of_zone,
+        "fastball_velo": fastball_velo,
+        "fastball_velo_n": fastball_velo_n,
+        "fastball_spin": fastball_spin,
+        "fastball_spin_n": fastball_spin_n,
+        "breaking_velo": breaking_velo,
+        "breaking_velo_n": breaking_velo_n,
+        "breaking_spin": breaking_spin,
+        "breaking_spin_n": breaking_spin_n,
+    }
+    return np.column_stack([values[name] for name in COMPONENTS]).astype(np.float32)
+
+
+def summarize_components(totals: np.ndarray, metric_type: str) -> Dict[str, Any]:
+    """
+    Turn summed components into the aggregated Statcast block.
+
+    Args:
+        totals: Component totals, indexed like COMPONENTS
+        metric_type: Metric type (batting or pitching)
+
+    Returns:
+        Dictionary of aggregated metrics (None where there is no sample)
+    """
+    t = dict(zip(COMPONENTS, np.asarray(totals, dtype=np.float64).tolist()))
+
+    def ratio(numerator: str, denominator: str, scale: float = 1.0, digits: int = 1) -> Optional[float]:
+        count = round(t[denominator])
+        return round(scale * t[numerator] / count, digits) if count else None
+
+    whiff_percentage = ratio("whiffs", "swings", 100)
+    if metric_type == "batting":
+        return {
+            "avg_launch_speed": ratio("launch_speed", "batted"),
+            "avg_launch_angle": ratio("launch_angle", "launch_angle_n"),
+            "avg_hit_distance": ratio("hit_distance", "hit_distance_n"),
+            "barrel_percentage": ratio("barrels", "batted", 100),
+            "hard_hit_percentage": ratio("hard_hit", "batted", 100),
+            "whiff_percentage": whiff_percentage,
+        }
+    return {
+        "avg_fastball_velo": ratio("fastball_velo", "fastball_velo_n"),
+        "avg_breaking_velo": ratio("breaking_velo", "breaking_velo_n"),
+        "avg_fastball_spin": ratio("fastball_spin", "fastball_spin_n", digits=0),
+        "avg_breaking_spin": ratio("breaking_spin", "breaking_spin_n", digits=0),
+        "whiff_percentage": whiff_percentage,
+        "chase_percentage": ratio("chases", "out_of_zone", 100),
+    }
+
+
+def summarize_pitches(
+    pitches: Dict[str, np.ndarray],
+    partition: StatcastPartition,
+    metric_type: str,
+) -> Dict[str, Any]:
+    """
+    Compute the aggregated Statcast block for a set of pitches with vectorized reductions.
+
+    Args:
+        pitches: Pitch columns (as returned by StatcastPartition.take)
+        partition: Partition the pitches came from (for pitch type codes)
+        metric_type: Metric type (batting or pitching)
+
+    Returns:
+        Dictionary of aggregated metrics (None where there is no sample)
+    """
+    totals = pitch_components(pitches, partition).sum(axis=0, dtype=np.float64)
+    return summarize_components(totals, metric_type)
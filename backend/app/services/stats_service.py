@@ -1,124 +1,119 @@
-from typing import List, Optional, Dict, Any
+from datetime import date
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+import numpy as np
 from app.models.player import PlayerStats
 from app.models.statistics import LeagueAverages, StatcastMetrics, AdvancedMetrics, StatisticalLeaders
+from app.services.stats_store import SeasonStatsTable, CATEGORY_MODELS, FLOAT_DECIMALS, innings_to_outs, outs_to_innings, nullable_list
+from app.services.statcast_store import (
+    StatcastStore,
+    StatcastPartition,
+    PITCH_COLUMNS,
+    date_to_day,
+    day_to_date,
+    is_barrel,
+    summarize_pitches,
+)
+from app.services.statcast_rollups import StatcastRollups, ROLLING_WINDOWS
+from app.services.leaderboard import LeaderboardIndex, LEADER_CATEGORIES, RATE_CATEGORIES
+from app.services.percentiles import PercentileIndex, ADVANCED_METRICS
+from app.services.feature_store import FeatureStore
+from app.services.entity_versions import entity_versions, player_key, team_key, season_key
 
 # Mock implementation for demonstration purposes
 # In a real application, these functions would query databases or APIs
 
+# Columnar player-season statistics, one row per (player_id, season)
+season_stats = SeasonStatsTable()
+
+# Top-K leaderboards per (season, category), maintained as lines are recorded
+stat_leaders = LeaderboardIndex(season_stats)
+
+# Sorted per-metric arrays behind league percentile ranks
+stat_percentiles = PercentileIndex(season_stats, stat_leaders)
+
+# Standardized per-season feature matrices shared by prediction, similarity and valuation
+feature_store = FeatureStore(season_stats)
+
+# Pitch-level Statcast data, one memory-mapped partition per season
+statcast_store = StatcastStore()
+
+# Per-day prefix sums of the Statcast summary metrics, built lazily per season
+statcast_rollups: Dict[int, StatcastRollups] = {}
+
+# Rows gathered per step of an export; bounds its memory whatever the export size
+EXPORT_CHUNK_ROWS = 2000
+
+# Keys of exported pitch records: the stored pitch columns, categorical ones decoded
+STATCAST_EXPORT_FIELDS = list(PITCH_COLUMNS)
+
+
 def get_player_stats(player_id: int, season: Optional[int] = None) -> Optional[PlayerStats]:
     """
     Retrieve statistics for a specific player.
     
     Args:
         player_id: The player's ID
-        season: The season year (defaults to current season)
+        season: The season year (defaults to the player's most recent season)
         
     Returns:
         PlayerStats object if found, None otherwise
     """
-    from app.services.player_service import get_player
+    if not season:
+        seasons = season_stats.seasons_for(player_id)
+        if not seasons:
+            return None
+        season = seasons[-1]
     
-    player = get_player(player_id)
-    if not player:
-        return None
+    return season_stats.get(player_id, season)
+
+
+def record_player_stats(stats: PlayerStats) -> None:
+    """
+    Store (or replace) a player's season line.
     
-    if not season:
-        season = 2024
+    Lines without a team are credited to the player's current team.
     
-    # In a real implementation, this would query a database or API
-    # For now, we'll return mock data based on the player's position
-    
-    if player.position.startswith('P'):
-        # Pitcher stats
-        return PlayerStats(
-            player_id=player_id,
-            season=season,
-            pitching={
-                "games": 32,
-                "games_started": 30,
-                "innings_pitched": 180.2,
-                "wins": 12,
-                "losses": 8,
-                "saves": 0,
-                "earned_run_average": 3.45,
-                "walks_and_hits_per_inning_pitched": 1.15,
-                "hits_allowed": 160,
-                "runs_allowed": 75,
-                "earned_runs": 69,
-                "home_runs_allowed": 20,
-                "walks": 50,
-                "strikeouts": 190,
-                "strikeouts_per_nine": 9.5,
-                "walks_per_nine": 2.5,
-                "home_runs_per_nine": 1.0,
-                "fielding_independent_pitching": 3.30,
-                "expected_fielding_independent_pitching": 3.25,
-                "strikeout_percentage": 25.5,
-                "walk_percentage": 6.7,
-                "ground_ball_percentage": 45.5,
-                "left_on_base_percentage": 75.0
-            },
-            statcast={
-                "average_fastball_velocity": 94.5,
-                "spin_rate_fastball": 2300,
-                "spin_rate_breaking": 2500,
-                "whiff_percentage": 28.5,
-                "chase_percentage": 32.0
-            },
-            war=3.5
-        )
-    else:
-        # Position player stats
-        return PlayerStats(
-            player_id=player_id,
-            season=season,
-            batting={
-                "games": 145,
-                "plate_appearances": 600,
-                "at_bats": 540,
-                "runs": 85,
-                "hits": 150,
-                "doubles": 30,
-                "triples": 5,
-                "home_runs": 25,
-                "runs_batted_in": 80,
-                "stolen_bases": 15,
-                "caught_stealing": 5,
-                "walks": 50,
-                "strikeouts": 120,
-                "batting_average": 0.278,
-                "on_base_percentage": 0.350,
-                "slugging_percentage": 0.490,
-                "on_base_plus_slugging": 0.840,
-                "weighted_on_base_average": 0.360,
-                "weighted_runs_created_plus": 125,
-                "batting_average_on_balls_in_play": 0.310,
-                "isolated_power": 0.212,
-                "walk_percentage": 8.3,
-                "strikeout_percentage": 20.0
-            },
-            fielding={
-                "games": 140,
-                "innings": 1200.0,
-                "putouts": 250,
-                "assists": 150,
-                "errors": 10,
-                "fielding_percentage": 0.976,
-                "defensive_runs_saved": 5,
-                "ultimate_zone_rating": 3.5,
-                "outs_above_average": 4
-            },
-            statcast={
-                "average_exit_velocity": 89.5,
-                "max_exit_velocity": 112.0,
-                "average_launch_angle": 15.5,
-                "barrel_percentage": 8.5,
-                "sweet_spot_percentage": 35.0,
-                "hard_hit_percentage": 42.0,
-                "average_sprint_speed": 27.5
-            },
-            war=4.2
-        )
+    Args:
+        stats: PlayerStats object to store
+    """
+    from app.services.player_service import players_db
+    
+    if stats.team_id is None and stats.player_id in players_db:
+        stats = stats.model_copy(update={"team_id": players_db[stats.player_id].team_id})
+    before = stat_percentiles.snapshot(stats.player_id, stats.season)
+    previous = season_stats.row(stats.player_id, stats.season)
+    previous_team = None
+    if previous is not None and season_stats.team[previous] >= 0:
+        previous_team = season_stats.teams[season_stats.team[previous]]
+    row = season_stats.upsert(stats)
+    stat_leaders.record(row)
+    stat_percentiles.record(row, before)
+    # A line can move a player between teams and change any league-wide category of the season
+    teams = {team for team in (previous_team, stats.team_id) if team is not None}
+    entity_versions.bump(
+        player_key(stats.player_id),
+        *(team_key(team) for team in teams),
+        *(season_key(stats.season, category) for category in CATEGORY_MODELS),
+    )
+
+
+def record_team_games(season: int, team_ids: List[str]) -> None:
+    """
+    Credit a game played to each listed team, e.g. after a game day.
+    
+    Rate-stat leaderboards of the season requalify players on their next read.
+    
+    Args:
+        season: Season year
+        team_ids: Teams that played (once per game played)
+    """
+    stat_leaders.team_games.record_games(season, team_ids)
+    # Games played change who qualifies for the season's rate-stat leaderboards
+    entity_versions.bump(
+        season_key(season, "batting"),
+        season_key(season, "pitching"),
+        *(team_key(team_id) for team_id in set(team_ids)),
+    )
 
 
 def get_team_stats(team_id: str, season: Optional[int] = None) -> Optional[Dict[str, Any]]:
@@ -179,6 +174,9 @@ def get_league_averages(season: int, category: str) -> Optional[LeagueAverages]:
     """
     Retrieve league average statistics for a specific season and category.
     
+    Averages are computed from league totals of the season stats table, so
+    rate stats are weighted by playing time.
+    
     Args:
         season: The season year
         category: Category (batting, pitching, or fielding)
@@ -186,54 +184,68 @@ def get_league_averages(season: int, category: str) -> Optional[LeagueAverages]:
     Returns:
         LeagueAverages object if found, None otherwise
     """
-    # In a real implementation, this would query a database or API
-    # For now, we'll return mock data based on 2024 MLB season
-    
     if category == "batting":
-        return LeagueAverages(
-            season=season,
-            category=category,
-            metrics={
-                "batting_average": 0.243,
-                "on_base_percentage": 0.312,
-                "slugging_percentage": 0.397,
-                "on_base_plus_slugging": 0.709,
-                "home_runs_per_game": 1.05,
-                "strikeout_percentage": 23.1,
-                "walk_percentage": 8.5
-            },
-            sample_size=162 * 30,  # 30 teams, 162 games
-            last_updated="2025-04-01"
-        )
+        totals = season_stats.totals(season, "batting", [
+            "games", "plate_appearances", "at_bats", "hits", "doubles", "triples",
+            "home_runs", "walks", "strikeouts"
+        ])
+        if not totals["lines"] or not totals["at_bats"]:
+            return None
+        
+        singles = totals["hits"] - totals["doubles"] - totals["triples"] - totals["home_runs"]
+        total_bases = singles + 2 * totals["doubles"] + 3 * totals["triples"] + 4 * totals["home_runs"]
+        obp = (totals["hits"] + totals["walks"]) / totals["plate_appearances"]
+        slg = total_bases / totals["at_bats"]
+        metrics = {
+            "batting_average": round(totals["hits"] / totals["at_bats"], 3),
+            "on_base_percentage": round(obp, 3),
+            "slugging_percentage": round(slg, 3),
+            "on_base_plus_slugging": round(obp + slg, 3),
+            "home_runs_per_game": round(totals["home_runs"] / totals["games"], 2),
+            "strikeout_percentage": round(100 * totals["strikeouts"] / totals["plate_appearances"], 1),
+            "walk_percentage": round(100 * totals["walks"] / totals["plate_appearances"], 1)
+        }
+        sample_size = int(totals["plate_appearances"])
     elif category == "pitching":
-        return LeagueAverages(
-            season=season,
-            category=category,
-            metrics={
-                "earned_run_average": 4.02,
-                "walks_and_hits_per_inning_pitched": 1.25,
-                "strikeouts_per_nine": 8.9,
-                "walks_per_nine": 3.0,
-                "home_runs_per_nine": 1.1,
-                "left_on_base_percentage": 73.2
-            },
-            sample_size=43200,  # Approximate innings pitched league-wide
-            last_updated="2025-04-01"
-        )
+        totals = season_stats.totals(season, "pitching", [
+            "hits_allowed", "earned_runs", "home_runs_allowed", "walks", "strikeouts",
+            "left_on_base_percentage"
+        ])
+        innings_pitched = season_stats.column("pitching", "innings_pitched")[season_stats.season_rows(season)]
+        innings = innings_to_outs(innings_pitched[~np.isnan(innings_pitched)]).sum() / 3
+        if not totals["lines"] or not innings:
+            return None
+        
+        metrics = {
+            "earned_run_average": round(9 * totals["earned_runs"] / innings, 2),
+            "walks_and_hits_per_inning_pitched": round((totals["walks"] + totals["hits_allowed"]) / innings, 2),
+            "strikeouts_per_nine": round(9 * totals["strikeouts"] / innings, 1),
+            "walks_per_nine": round(9 * totals["walks"] / innings, 1),
+            "home_runs_per_nine": round(9 * totals["home_runs_allowed"] / innings, 1),
+            "left_on_base_percentage": round(totals["left_on_base_percentage"] / totals["lines"], 1)
+        }
+        sample_size = int(innings)
     elif category == "fielding":
-        return LeagueAverages(
-            season=season,
-            category=category,
-            metrics={
-                "fielding_percentage": 0.985,
-                "errors_per_game": 0.55,
-                "double_plays_per_game": 0.80
-            },
-            sample_size=162 * 30,  # 30 teams, 162 games
-            last_updated="2025-04-01"
-        )
+        totals = season_stats.totals(season, "fielding", ["games", "putouts", "assists", "errors"])
+        chances = totals["putouts"] + totals["assists"] + totals["errors"]
+        if not totals["lines"] or not chances:
+            return None
+        
+        metrics = {
+            "fielding_percentage": round((totals["putouts"] + totals["assists"]) / chances, 3),
+            "errors_per_game": round(totals["errors"] / totals["games"], 2)
+        }
+        sample_size = int(totals["games"])
     else:
         return None
+    
+    return LeagueAverages(
+        season=season,
+        category=category,
+        metrics=metrics,
+        sample_size=sample_size,
+        last_updated=date.today().isoformat()
+    )
 
 
 def get_statcast_metrics(
@@ -242,96 +254,268 @@ def get_statcast_metrics(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     season: Optional[int] = None,
-    metric_type: str = "batting"
+    metric_type: str = "batting",
+    last_n_days: Optional[int] = None
 ) -> Optional[StatcastMetrics]:
     """
     Retrieve Statcast metrics with various filtering options.
     
+    Pitches are read from the season partition of the pitch store: the player
+    (or team) index narrows the season to that entity's date-ordered rows and the
+    date range is found by binary search, so only the matching pitches are read.
+    The aggregated block comes from per-day prefix sums, so it costs the same
+    for any window.
+    
     Args:
-        player_id: Filter by player ID
-        team_id: Filter by team ID
+        player_id: Filter by player ID (batter for batting, pitcher for pitching)
+        team_id: Filter by team ID (batting team for batting, fielding team for pitching)
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
-        season: Season year
+        season: Season year (defaults to the year of the date range)
         metric_type: Metric type (batting or pitching)
+        last_n_days: Rolling window (7, 15 or 30 days) ending at end_date or the
+            latest ingested game day; overrides start_date
         
     Returns:
         StatcastMetrics object if found, None otherwise
+        
+    Raises:
+        ValueError: If a date is not in YYYY-MM-DD format or last_n_days is not supported
     """
-    # In a real implementation, this would query the Statcast API
-    # For now, we'll return mock data
+    from app.services.player_service import get_player
     
-    # Mock metrics data
-    if metric_type == "batting":
-        metrics_data = [
-            {
-                "game_date": "2022-04-15",
-                "player_name": "Example Player",
-                "launch_speed": 95.5,
-                "launch_angle": 25.0,
-                "hit_distance": 405,
-                "events": "home_run"
-            },
-            {
-                "game_date": "2022-04-16",
-                "player_name": "Example Player",
-                "launch_speed": 88.2,
-                "launch_angle": 12.5,
-                "hit_distance": 180,
-                "events": "single"
-            }
-        ]
+    selection = _select_statcast(player_id, team_id, start_date, end_date, season, metric_type, last_n_days)
+    if selection is None:
+        return None
+    fields, pitches, partition = selection
+    
+    metrics_data = _statcast_rows(pitches, partition, metric_type == "batting", get_player)
+    
+    # One plain dict per pitch: validating them costs more than building them, so skip it
+    return StatcastMetrics.model_construct(metrics=metrics_data, **fields)
+
+
+def get_statcast_table(
+    player_id: Optional[int] = None,
+    team_id: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    season: Optional[int] = None,
+    metric_type: str = "batting",
+    last_n_days: Optional[int] = None
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Retrieve Statcast metrics with the per-event rows as columns.
+    
+    Same selection as get_statcast_metrics, but the rows are left as arrays
+    gathered from the pitch store instead of one dict per event. Categorical
+    columns are (codes, values) pairs.
+    
+    Args:
+        Same as get_statcast_metrics
         
-        aggregated_data = {
-            "avg_launch_speed": 91.85,
-            "avg_launch_angle": 18.75,
-            "avg_hit_distance": 292.5,
-            "barrel_percentage": 8.5,
-            "hard_hit_percentage": 40.0
-        }
-    else:  # pitching
-        metrics_data = [
-            {
-                "game_date": "2022-04-15",
-                "player_name": "Example Pitcher",
-                "pitch_type": "FF",
-                "release_speed": 95.2,
-                "spin_rate": 2350,
-                "vertical_movement": 8.5,
-                "horizontal_movement": -6.2
-            },
+    Returns:
+        (StatcastMetrics fields other than metrics, columns) if found, None otherwise
+        
+    Raises:
+        ValueError: If a date is not in YYYY-MM-DD format or last_n_days is not supported
+    """
+    from app.services.player_service import get_player
+    
+    selection = _select_statcast(player_id, team_id, start_date, end_date, season, metric_type, last_n_days)
+    if selection is None:
+        return None
+    fields, pitches, partition = selection
+    return fields, _statcast_columns(pitches, partition, metric_type == "batting", get_player)
+
+
+def _select_statcast(
+    player_id: Optional[int],
+    team_id: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    season: Optional[int],
+    metric_type: str,
+    last_n_days: Optional[int]
+) -> Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray], Any]]:
+    """Return (StatcastMetrics fields other than metrics, pitch columns, partition) of a request."""
+    if metric_type not in ("batting", "pitching"):
+        return None
+    
+    start_day = date_to_day(start_date) if start_date else None
+    end_day = date_to_day(end_date) if end_date else None
+    if not season:
+        season = date.fromisoformat(start_date or end_date).year if (start_date or end_date) else None
+    if not season:
+        seasons = statcast_store.seasons()
+        if not seasons:
+            return None
+        season = seasons[-1]
+    
+    partition = statcast_store.get(season)
+    if partition is None:
+        return None
+    rollups = _season_rollups(season)
+    
+    if last_n_days is not None:
+        if last_n_days not in ROLLING_WINDOWS:
+            raise ValueError(f"last_n_days must be one of {', '.join(map(str, ROLLING_WINDOWS))}")
+        start_day, end_day = rollups.rolling_window(last_n_days, end_day)
+        start_date, end_date = day_to_date(start_day).isoformat(), day_to_date(end_day).isoformat()
+    
+    batting = metric_type == "batting"
+    player_index = "batter" if batting else "pitcher"
+    team_index = "bat_team" if batting else "fld_team"
+    team_code = partition.code(team_index, team_id) if team_id is not None else None
+    if team_id is not None and team_code is None:
+        return None
+    
+    if player_id is not None:
+        kind, key = player_index, player_id
+    elif team_id is not None:
+        kind, key = team_index, team_code
+    else:
+        kind, key = None, None
+    
+    pitches = partition.take(partition.rows(kind, key, start_day, end_day))
+    if player_id is not None and team_id is not None:
+        # Player on one team: filter the player's slice and summarize it directly
+        on_team = pitches[team_index] == team_code
+        pitches = {name: values[on_team] for name, values in pitches.items()}
+        aggregated = summarize_pitches(pitches, partition, metric_type)
+    else:
+        aggregated = rollups.summarize(kind or "league", key, metric_type, start_day, end_day)
+    
+    fields = {
+        "player_id": player_id,
+        "team_id": team_id,
+        "season": season,
+        "start_date": start_date,
+        "end_date": end_date,
+        "metric_type": metric_type,
+        "aggregated": aggregated,
+        "sample_size": len(pitches["game_date"]),
+        "last_updated": partition.last_updated,
+    }
+    return fields, pitches, partition
+
+
+def _season_rollups(season: int) -> StatcastRollups:
+    """Return the Statcast prefix sums of a season, building them on first use."""
+    rollups = statcast_rollups.get(season)
+    if rollups is None:
+        rollups = StatcastRollups.from_partition(statcast_store.get(season))
+        statcast_rollups[season] = rollups
+    return rollups
+
+
+def ingest_statcast_day(season: int, pitches: Dict[str, np.ndarray]) -> None:
+    """
+    Add a game day of pitches to the pitch store and the rolling aggregates.
+    
+    Args:
+        season: Season year (its partition must already exist)
+        pitches: Pitch columns (see PITCH_COLUMNS) coded against the season
+            partition's vocabulary
+        
+    Raises:
+        ValueError: If the season has no partition or a pitch falls outside the season
+    """
+    partition = statcast_store.get(season)
+    if partition is None:
+        raise ValueError(f"No Statcast partition for season {season}")
+    
+    rollups = _season_rollups(season)
+    rollups.add(pitches, partition)
+    statcast_store.append(season, pitches)
+    entity_versions.bump(season_key(season, "statcast"))
+
+
+def _statcast_rows(pitches: Dict[str, np.ndarray], partition, batting: bool, get_player) -> List[Dict[str, Any]]:
+    """Turn pitch columns into the per-event rows returned with Statcast metrics."""
+    names = {}
+    
+    def player_name(pid: int) -> Optional[str]:
+        if pid not in names:
+            player = get_player(pid)
+            names[pid] = player.name if player else None
+        return names[pid]
+    
+    dates = [day_to_date(d).isoformat() for d in pitches["game_date"].tolist()]
+    if batting:
+        # Batted-ball events only
+        batted = np.flatnonzero(~np.isnan(pitches["launch_speed"]))
+        events = partition.decode("events", pitches["events"][batted])
+        return [
             {
-                "game_date": "2022-04-16",
-                "player_name": "Example Pitcher",
-                "pitch_type": "SL",
-                "release_speed": 85.5,
-                "spin_rate": 2650,
-                "vertical_movement": 2.1,
-                "horizontal_movement": 4.5
+                "game_date": dates[i],
+                "player_name": player_name(batter),
+                "launch_speed": round(speed, 1),
+                "launch_angle": round(angle, 1),
+                "hit_distance": round(distance),
+                "events": event
             }
+            for i, batter, speed, angle, distance, event in zip(
+                batted.tolist(),
+                pitches["batter"][batted].tolist(),
+                pitches["launch_speed"][batted].tolist(),
+                pitches["launch_angle"][batted].tolist(),
+                pitches["hit_distance"][batted].tolist(),
+                events
+            )
         ]
-        
-        aggregated_data = {
-            "avg_fastball_velo": 94.8,
-            "avg_breaking_velo": 84.2,
-            "avg_fastball_spin": 2320,
-            "avg_breaking_spin": 2580,
-            "whiff_percentage": 26.5,
-            "chase_percentage": 30.2
-        }
     
-    return StatcastMetrics(
-        player_id=player_id,
-        team_id=team_id,
-        season=season,
-        start_date=start_date,
-        end_date=end_date,
-        metric_type=metric_type,
-        metrics=metrics_data,
-        aggregated=aggregated_data,
-        sample_size=len(metrics_data),
-        last_updated="2023-11-01"
-    )
+    pitch_types = partition.decode("pitch_type", pitches["pitch_type"])
+    return [
+        {
+            "game_date": game_date,
+            "player_name": player_name(pitcher),
+            "pitch_type": pitch_type,
+            "release_speed": round(speed, 1),
+            "spin_rate": round(spin),
+            "vertical_movement": round(pfx_z, 1),
+            "horizontal_movement": round(pfx_x, 1)
+        }
+        for game_date, pitcher, pitch_type, speed, spin, pfx_z, pfx_x in zip(
+            dates,
+            pitches["pitcher"].tolist(),
+            pitch_types,
+            pitches["release_speed"].tolist(),
+            pitches["release_spin_rate"].tolist(),
+            pitches["pfx_z"].tolist(),
+            pitches["pfx_x"].tolist()
+        )
+    ]
+
+
+def _statcast_columns(pitches: Dict[str, np.ndarray], partition, batting: bool, get_player) -> Dict[str, Any]:
+    """Columnar form of _statcast_rows: arrays, with (codes, values) pairs for categorical columns."""
+    if batting:
+        # Batted-ball events only
+        batted = np.flatnonzero(~np.isnan(pitches["launch_speed"]))
+        pitches = {name: values[batted] for name, values in pitches.items()}
+    player_ids = pitches["batter" if batting else "pitcher"]
+    # Names are looked up once per player, not once per event
+    unique_ids, player_codes = np.unique(player_ids, return_inverse=True)
+    names = [player.name if player else None for player in map(get_player, unique_ids.tolist())]
+    columns = {
+        "game_date": pitches["game_date"].astype("datetime64[D]"),
+        "player_name": (player_codes.astype(np.int32), names),
+    }
+    # Rounded as in the JSON rows; float64 so clients see the same decimals
+    rounded = lambda name, decimals=0: np.round(pitches[name].astype(np.float64), decimals)
+    if batting:
+        columns["launch_speed"] = rounded("launch_speed", 1)
+        columns["launch_angle"] = rounded("launch_angle", 1)
+        columns["hit_distance"] = rounded("hit_distance")
+        columns["events"] = (pitches["events"], partition.vocab["events"])
+    else:
+        columns["pitch_type"] = (pitches["pitch_type"], partition.vocab["pitch_type"])
+        columns["release_speed"] = rounded("release_speed", 1)
+        columns["spin_rate"] = rounded("release_spin_rate")
+        columns["vertical_movement"] = rounded("pfx_z", 1)
+        columns["horizontal_movement"] = rounded("pfx_x", 1)
+    return columns
 
 
 def get_advanced_metrics(
@@ -352,95 +536,47 @@ def get_advanced_metrics(
     Returns:
         AdvancedMetrics object if found, None otherwise
     """
-    # In a real implementation, this would query a database or API
-    # For now, we'll return mock data
+    if metric_type not in ADVANCED_METRICS:
+        return None
+    metrics = ADVANCED_METRICS[metric_type]
     
-    if metric_type == "batting":
-        metrics_data = {
-            "wOBA": 0.355,
-            "wRC+": 125,
-            "ISO": 0.210,
-            "BABIP": 0.310,
-            "BB%": 10.5,
-            "K%": 22.0,
-            "Contact%": 78.5,
-            "SwStr%": 10.2,
-            "Pull%": 42.5,
-            "Cent%": 35.0,
-            "Oppo%": 22.5,
-            "Soft%": 15.0,
-            "Med%": 45.0,
-            "Hard%": 40.0,
-            "GB%": 40.0,
-            "FB%": 38.0,
-            "LD%": 22.0
-        }
-        
-        percentiles = {
-            "wOBA": 80,
-            "wRC+": 82,
-            "ISO": 75,
-            "BABIP": 65,
-            "BB%": 70,
-            "K%": 40,  # Lower is better for K%
-            "Hard%": 78
-        }
-    elif metric_type == "pitching":
-        metrics_data = {
-            "FIP": 3.45,
-            "xFIP": 3.60,
-            "SIERA": 3.75,
-            "K/9": 9.5,
-            "BB/9": 2.8,
-            "HR/9": 1.1,
-            "K%": 25.0,
-            "BB%": 7.5,
-            "K-BB%": 17.5,
-            "GB%": 45.0,
-            "FB%": 35.0,
-            "LD%": 20.0,
-            "Soft%": 18.0,
-            "Med%": 48.0,
-            "Hard%": 34.0,
-            "Contact%": 75.0,
-            "SwStr%": 12.5,
-            "F-Strike%": 62.0,
-            "LOB%": 75.0
-        }
-        
-        percentiles = {
-            "FIP": 70,
-            "xFIP": 65,
-            "SIERA": 68,
-            "K/9": 72,
-            "BB/9": 65,
-            "HR/9": 55,
-            "K%": 70,
-            "BB%": 60,
-            "Hard%": 65
-        }
-    else:  # fielding
-        metrics_data = {
-            "DRS": 5,
-            "UZR": 3.5,
-            "UZR/150": 4.2,
-            "OAA": 4,
-            "RngR": 2.5,
-            "ErrR": 1.0,
-            "ARM": 1.5,
-            "DPR": 0.5,
-            "CPP": 0.8,
-            "RPP": 0.7
-        }
-        
-        percentiles = {
-            "DRS": 75,
-            "UZR": 70,
-            "UZR/150": 72,
-            "OAA": 68,
-            "RngR": 65,
-            "ErrR": 60
-        }
+    if player_id is not None:
+        row = season_stats.row(player_id, season)
+        if row is None or not season_stats.present[metric_type][row]:
+            return None
+        metrics_data = {}
+        for metric, (category, field) in metrics.items():
+            if season_stats.present[category][row]:
+                value = season_stats.value(row, category, field)
+                if value is not None:
+                    metrics_data[metric] = value
+        percentiles = stat_percentiles.player_percentiles(row, metric_type)
+        team = season_stats.team[row]
+        team_id = season_stats.teams[team] if team >= 0 else team_id
+    elif team_id is not None:
+        # Team metrics weight each line by playing time
+        if team_id not in season_stats.teams:
+            return None
+        rows = season_stats.season_rows(season)
+        code = season_stats.teams.index(team_id)
+        rows = rows[(season_stats.team[rows] == code) & season_stats.present[metric_type][rows]]
+        if not len(rows):
+            return None
+        if metric_type == "batting":
+            weights = season_stats.column("batting", "plate_appearances")[rows].astype(np.float64)
+        elif metric_type == "pitching":
+            weights = innings_to_outs(season_stats.column("pitching", "innings_pitched")[rows].astype(np.float64))
+        else:
+            weights = season_stats.column("fielding", "innings")[rows].astype(np.float64)
+        metrics_data = {}
+        for metric, (category, field) in metrics.items():
+            values = season_stats.column(category, field)[rows].astype(np.float64)
+            keep = ~np.isnan(values) & season_stats.present[category][rows]
+            if keep.any() and weights[keep].sum() > 0:
+                metrics_data[metric] = round(float(np.average(values[keep], weights=weights[keep])), 3)
+        percentiles = {}
+    else:
+        return None
     
     return AdvancedMetrics(
         player_id=player_id,
@@ -449,7 +585,7 @@ def get_advanced_metrics(
         metric_type=metric_type,
         metrics=metrics_data,
         percentiles=percentiles,
-        last_updated="2023-11-01"
+        last_updated=date.today().isoformat()
     )
 
 
@@ -469,114 +605,329 @@ def get_statistical_leaders(
     Returns:
         StatisticalLeaders object if found, None otherwise
     """
-    # In a real implementation, this would query a database or API
-    # For now, we'll return mock data based on 2024 MLB season
+    from app.services.player_service import players_db
+    
+    if category not in LEADER_CATEGORIES:
+        return None
+    
+    top = stat_leaders.top(season, category, limit)
+    if not top:
+        return None
     
-    # Mock leader data
     leaders_data = []
+    for position, (player_id, value) in enumerate(top, start=1):
+        player = players_db.get(player_id)
+        value = round(value, FLOAT_DECIMALS)
+        # Tied values share the better rank
+        tied = leaders_data and leaders_data[-1]["value"] == value
+        leaders_data.append({
+            "player_id": player_id,
+            "player_name": player.name if player else f"Player {player_id}",
+            "team_id": player.team_id if player else "",
+            "value": value,
+            "rank": leaders_data[-1]["rank"] if tied else position
+        })
     
-    # Generate mock leaders based on category
-    if category == "HR":
-        # Home Run leaders for 2024 (mock data based on realistic stats)
-        hr_leaders = [
-            {"player_id": 1001, "player_name": "Aaron Judge", "team_id": "NYY", "value": 51, "rank": 1},
-            {"player_id": 1002, "player_name": "Shohei Ohtani", "team_id": "LAD", "value": 47, "rank": 2},
-            {"player_id": 1003, "player_name": "Pete Alonso", "team_id": "NYM", "value": 41, "rank": 3},
-            {"player_id": 1004, "player_name": "Kyle Schwarber", "team_id": "PHI", "value": 39, "rank": 4},
-            {"player_id": 1005, "player_name": "Yordan Alvarez", "team_id": "HOU", "value": 37, "rank": 5},
-            {"player_id": 1006, "player_name": "Juan Soto", "team_id": "NYY", "value": 36, "rank": 6},
-            {"player_id": 1007, "player_name": "Matt Olson", "team_id": "ATL", "value": 35, "rank": 7},
-            {"player_id": 1008, "player_name": "Bryce Harper", "team_id": "PHI", "value": 34, "rank": 8},
-            {"player_id": 1009, "player_name": "Vladimir Guerrero Jr.", "team_id": "TOR", "value": 33, "rank": 9},
-            {"player_id": 1010, "player_name": "Adolis García", "team_id": "TEX", "value": 32, "rank": 10}
-        ]
-        leaders_data = hr_leaders[:limit]
-    elif category == "AVG":
-        # Batting Average leaders for 2024 (mock data based on realistic stats)
-        avg_leaders = [
-            {"player_id": 1011, "player_name": "Luis Arraez", "team_id": "SDP", "value": 0.328, "rank": 1},
-            {"player_id": 1012, "player_name": "Freddie Freeman", "team_id": "LAD", "value": 0.323, "rank": 2},
-            {"player_id": 1013, "player_name": "Corey Seager", "team_id": "TEX", "value": 0.317, "rank": 3},
-            {"player_id": 1014, "player_name": "Mookie Betts", "team_id": "LAD", "value": 0.312, "rank": 4},
-            {"player_id": 1015, "player_name": "Bobby Witt Jr.", "team_id": "KCR", "value": 0.310, "rank": 5},
-            {"player_id": 1016, "player_name": "Juan Soto", "team_id": "NYY", "value": 0.307, "rank": 6},
-            {"player_id": 1017, "player_name": "Gunnar Henderson", "team_id": "BAL", "value": 0.303, "rank": 7},
-            {"player_id": 1018, "player_name": "Ronald Acuña Jr.", "team_id": "ATL", "value": 0.301, "rank": 8},
-            {"player_id": 1019, "player_name": "Shohei Ohtani", "team_id": "LAD", "value": 0.299, "rank": 9},
-            {"player_id": 1020, "player_name": "Yandy Díaz", "team_id": "TBR", "value": 0.298, "rank": 10}
-        ]
-        leaders_data = avg_leaders[:limit]
-    elif category == "ERA":
-        # ERA leaders for 2024 (mock data based on realistic stats)
-        era_leaders = [
-            {"player_id": 2001, "player_name": "Corbin Burnes", "team_id": "BAL", "value": 2.42, "rank": 1},
-            {"player_id": 2002, "player_name": "Zack Wheeler", "team_id": "PHI", "value": 2.56, "rank": 2},
-            {"player_id": 2003, "player_name": "Tyler Glasnow", "team_id": "LAD", "value": 2.67, "rank": 3},
-            {"player_id": 2004, "player_name": "Logan Webb", "team_id": "SFG", "value": 2.75, "rank": 4},
-            {"player_id": 2005, "player_name": "Pablo López", "team_id": "MIN", "value": 2.83, "rank": 5},
-            {"player_id": 2006, "player_name": "Tarik Skubal", "team_id": "DET", "value": 2.89, "rank": 6},
-            {"player_id": 2007, "player_name": "Gerrit Cole", "team_id": "NYY", "value": 2.95, "rank": 7},
-            {"player_id": 2008, "player_name": "Sonny Gray", "team_id": "STL", "value": 3.02, "rank": 8},
-            {"player_id": 2009, "player_name": "Max Fried", "team_id": "ATL", "value": 3.08, "rank": 9},
-            {"player_id": 2010, "player_name": "Sandy Alcantara", "team_id": "MIA", "value": 3.15, "rank": 10}
-        ]
-        leaders_data = era_leaders[:limit]
-    elif category == "K":
-        # Strikeout leaders for 2024 (mock data based on realistic stats)
-        k_leaders = [
-            {"player_id": 2011, "player_name": "Spencer Strider", "team_id": "ATL", "value": 274, "rank": 1},
-            {"player_id": 2012, "player_name": "Tyler Glasnow", "team_id": "LAD", "value": 256, "rank": 2},
-            {"player_id": 2013, "player_name": "Zack Wheeler", "team_id": "PHI", "value": 242, "rank": 3},
-            {"player_id": 2014, "player_name": "Kevin Gausman", "team_id": "TOR", "value": 237, "rank": 4},
-            {"player_id": 2015, "player_name": "Tarik Skubal", "team_id": "DET", "value": 228, "rank": 5},
-            {"player_id": 2016, "player_name": "Gerrit Cole", "team_id": "NYY", "value": 223, "rank": 6},
-            {"player_id": 2017, "player_name": "Dylan Cease", "team_id": "SDP", "value": 219, "rank": 7},
-            {"player_id": 2018, "player_name": "Logan Gilbert", "team_id": "SEA", "value": 214, "rank": 8},
-            {"player_id": 2019, "player_name": "Corbin Burnes", "team_id": "BAL", "value": 208, "rank": 9},
-            {"player_id": 2020, "player_name": "Pablo López", "team_id": "MIN", "value": 204, "rank": 10}
-        ]
-        leaders_data = k_leaders[:limit]
-    elif category in ["RBI", "R", "SB", "H", "OBP", "SLG", "OPS", "wOBA", "W", "SV", "WHIP", "FIP", "K/9"]:
-        # For other categories, generate mock data
-        for i in range(1, limit + 1):
-            if category in ["RBI", "R", "H"]:
-                value = max(100, 130 - i * 2)
-            elif category == "SB":
-                value = max(30, 50 - i * 2)
-            elif category in ["OBP", "wOBA"]:
-                value = max(0.350, 0.420 - i * 0.007)
-            elif category == "SLG":
-                value = max(0.450, 0.550 - i * 0.01)
-            elif category == "OPS":
-                value = max(0.800, 0.950 - i * 0.015)
-            elif category == "W":
-                value = max(15, 22 - i)
-            elif category == "SV":
-                value = max(25, 40 - i)
-            elif category == "WHIP":
-                value = min(1.30, 0.95 + i * 0.03)
-            elif category == "FIP":
-                value = min(4.00, 2.80 + i * 0.12)
-            elif category == "K/9":
-                value = max(9.0, 12.5 - i * 0.3)
-            else:
-                value = 0
-                
-            leaders_data.append({
-                "player_id": 3000 + i,
-                "player_name": f"Player {i}",
-                "team_id": ["NYY", "LAD", "BOS", "HOU", "ATL", "PHI", "SDP", "SEA"][i % 8],
-                "value": value,
-                "rank": i
-            })
+    if category not in RATE_CATEGORIES:
+        threshold = None
+    elif LEADER_CATEGORIES[category][0] == "batting":
+        threshold = "3.1 PA per team game"
     else:
-        return None
+        threshold = "1 IP per team game"
     
-    # Create and return the StatisticalLeaders object
     return StatisticalLeaders(
         season=season,
         category=category,
         leaders=leaders_data,
-        qualification_threshold="3.1 PA per team game" if category in ["AVG", "OBP", "SLG", "OPS", "wOBA"] else "1 IP per team game",
-        last_updated="2025-04-01"
+        qualification_threshold=threshold,
+        last_updated=stat_leaders.last_updated(season, category)
     )
+
+
+def export_player_seasons(season: Optional[int] = None, chunk_size: int = EXPORT_CHUNK_ROWS) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield every player-season line, or one season's, as flat records.
+    
+    The table is walked in row order chunk_size rows at a time, so only one
+    chunk of records exists at once. Keys are season_stats.record_fields().
+    
+    Args:
+        season: Only export this season
+        chunk_size: Rows per yielded chunk
+        
+    Yields:
+        Lists of up to chunk_size records
+    """
+    n_rows = len(season_stats)
+    for start in range(0, n_rows, chunk_size):
+        rows = np.arange(start, min(start + chunk_size, n_rows))
+        if season is not None:
+            rows = rows[season_stats.season[rows] == season]
+        if len(rows):
+            yield season_stats.records(rows)
+
+
+def export_statcast_pitches(
+    start_date: str,
+    end_date: str,
+    chunk_size: int = EXPORT_CHUNK_ROWS
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield every pitch in a date range as a record, in date order.
+    
+    Dates are checked up front; pitches are then read from each season
+    partition one slice of chunk_size rows at a time. Keys are
+    STATCAST_EXPORT_FIELDS.
+    
+    Args:
+        start_date: First day (YYYY-MM-DD)
+        end_date: Last day (YYYY-MM-DD)
+        chunk_size: Pitches per yielded chunk
+        
+    Returns:
+        Iterator over lists of up to chunk_size records
+        
+    Raises:
+        ValueError: If a date is not in YYYY-MM-DD format or the range is reversed
+    """
+    start_day, end_day = date_to_day(start_date), date_to_day(end_date)
+    if end_day < start_day:
+        raise ValueError("end_date must not be before start_date")
+    first, last = day_to_date(start_day).year, day_to_date(end_day).year
+    seasons = [season for season in statcast_store.seasons() if first <= season <= last]
+    return _pitch_chunks(seasons, start_day, end_day, chunk_size)
+
+
+def _pitch_chunks(seasons: List[int], start_day: int, end_day: int, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    for season in seasons:
+        partition = statcast_store.get(season)
+        if partition is None:
+            continue
+        span = partition.rows(None, None, start_day, end_day)
+        for start in range(span.start, span.stop, chunk_size):
+            pitches = partition.take(slice(start, min(start + chunk_size, span.stop)))
+            yield _pitch_records(pitches, partition)
+
+
+def _pitch_records(pitches: Dict[str, np.ndarray], partition: StatcastPartition) -> List[Dict[str, Any]]:
+    """Turn pitch columns into one record per pitch, with codes and days decoded."""
+    columns = []
+    for name in STATCAST_EXPORT_FIELDS:
+        values = pitches[name]
+        if name == "game_date":
+            columns.append(values.astype("datetime64[D]").astype(str).tolist())
+        elif name in partition.vocab:
+            columns.append(partition.decode(name, values))
+        elif values.dtype.kind == "f":
+            columns.append(nullable_list(values, np.isnan(values), FLOAT_DECIMALS))
+        else:
+            columns.append(values.tolist())
+    return [dict(zip(STATCAST_EXPORT_FIELDS, values)) for values in zip(*columns)]
+
+
+# Initialize with sample season lines
+def _sample_batting(rng: np.random.Generator, skill: float, playing_time: float) -> Dict[str, Any]:
+    """Generate a consistent batting line around a league-typical regular."""
+    plate_appearances = int(600 * playing_time)
+    walks = int(plate_appearances * 0.083 * skill)
+    at_bats = plate_appearances - walks - int(plate_appearances * 0.017)
+    hits = int(at_bats * 0.270 * skill ** 0.5)
+    doubles = int(hits * rng.uniform(0.17, 0.23))
+    triples = int(hits * rng.uniform(0.0, 0.04))
+    home_runs = int(at_bats * 0.045 * skill ** 1.5)
+    singles = hits - doubles - triples - home_runs
+    strikeouts = int(plate_appearances * 0.21 / skill)
+    stolen_bases = int(rng.uniform(0, 25) * playing_time)
+    
+    batting_average = hits / at_bats
+    on_base_percentage = (hits + walks) / plate_appearances
+    slugging_percentage = (singles + 2 * doubles + 3 * triples + 4 * home_runs) / at_bats
+    woba = (0.69 * walks + 0.88 * singles + 1.25 * doubles + 1.6 * triples + 2.0 * home_runs) / plate_appearances
+    balls_in_play = at_bats - strikeouts - home_runs
+    
+    return {
+        "games": min(162, int(150 * playing_time)),
+        "plate_appearances": plate_appearances,
+        "at_bats": at_bats,
+        "runs": int(plate_appearances * 0.14 * skill),
+        "hits": hits,
+        "doubles": doubles,
+        "triples": triples,
+        "home_runs": home_runs,
+        "runs_batted_in": int(plate_appearances * 0.13 * skill),
+        "stolen_bases": stolen_bases,
+        "caught_stealing": int(stolen_bases * 0.25),
+        "walks": walks,
+        "strikeouts": strikeouts,
+        "batting_average": round(batting_average, 3),
+        "on_base_percentage": round(on_base_percentage, 3),
+        "slugging_percentage": round(slugging_percentage, 3),
+        "on_base_plus_slugging": round(on_base_percentage + slugging_percentage, 3),
+        "weighted_on_base_average": round(woba, 3),
+        "weighted_runs_created_plus": int(round(100 + (woba - 0.315) * 700)),
+        "batting_average_on_balls_in_play": round((hits - home_runs) / balls_in_play, 3),
+        "isolated_power": round(slugging_percentage - batting_average, 3),
+        "walk_percentage": round(100 * walks / plate_appearances, 1),
+        "strikeout_percentage": round(100 * strikeouts / plate_appearances, 1)
+    }
+
+
+def _sample_pitching(rng: np.random.Generator, skill: float, playing_time: float) -> Dict[str, Any]:
+    """Generate a consistent starting pitcher line around a league-typical starter."""
+    outs = int(540 * playing_time)
+    innings = outs / 3
+    strikeouts = int(innings * 9.0 * skill / 9)
+    walks = int(innings * 3.0 / skill / 9)
+    home_runs_allowed = int(innings * 1.1 / skill / 9)
+    hits_allowed = int(innings * 8.2 / skill ** 0.5 / 9)
+    earned_runs = int(innings * 3.9 / skill / 9)
+    batters_faced = outs + hits_allowed + walks
+    games_started = min(34, int(31 * playing_time))
+    wins = int(rng.uniform(0.3, 0.5) * games_started * skill ** 0.5)
+    fip = (13 * home_runs_allowed + 3 * walks - 2 * strikeouts) / innings + 3.1
+    
+    return {
+        "games": games_started + int(rng.integers(0, 3)),
+        "games_started": games_started,
+        "innings_pitched": outs_to_innings(outs),
+        "wins": wins,
+        "losses": int(rng.uniform(0.25, 0.45) * games_started / skill ** 0.5),
+        "saves": 0,
+        "earned_run_average": round(9 * earned_runs / innings, 2),
+        "walks_and_hits_per_inning_pitched": round((walks + hits_allowed) / innings, 2),
+        "hits_allowed": hits_allowed,
+        "runs_allowed": int(earned_runs * 1.08),
+        "earned_runs": earned_runs,
+        "home_runs_allowed": home_runs_allowed,
+        "walks": walks,
+        "strikeouts": strikeouts,
+        "strikeouts_per_nine": round(9 * strikeouts / innings, 1),
+        "walks_per_nine": round(9 * walks / innings, 1),
+        "home_runs_per_nine": round(9 * home_runs_allowed / innings, 1),
+        "fielding_independent_pitching": round(fip, 2),
+        "expected_fielding_independent_pitching": round(fip * rng.uniform(0.95, 1.05), 2),
+        "strikeout_percentage": round(100 * strikeouts / batters_faced, 1),
+        "walk_percentage": round(100 * walks / batters_faced, 1),
+        "ground_ball_percentage": round(rng.uniform(38, 52), 1),
+        "left_on_base_percentage": round(rng.uniform(68, 80), 1)
+    }
+
+
+def initialize_sample_stats():
+    """Initialize the season stats table with generated lines for the sample players."""
+    from app.services.player_service import players_db
+    
+    rng = np.random.default_rng(42)
+    for player in players_db.values():
+        for season in (2022, 2023, 2024):
+            skill = rng.normal(1.1, 0.12)
+            playing_time = rng.uniform(0.8, 1.1)
+            
+            if player.position.startswith('P'):
+                record_player_stats(PlayerStats(
+                    player_id=player.id,
+                    season=season,
+                    pitching=_sample_pitching(rng, skill, playing_time),
+                    statcast={
+                        "average_fastball_velocity": round(rng.normal(94.5, 1.5), 1),
+                        "spin_rate_fastball": round(rng.normal(2300, 100)),
+                        "spin_rate_breaking": round(rng.normal(2500, 150)),
+                        "whiff_percentage": round(25.0 * skill, 1),
+                        "chase_percentage": round(rng.normal(31, 2.5), 1)
+                    },
+                    war=round(3.0 * skill ** 2 * playing_time, 1)
+                ))
+            else:
+                record_player_stats(PlayerStats(
+                    player_id=player.id,
+                    season=season,
+                    batting=_sample_batting(rng, skill, playing_time),
+                    fielding={
+                        "games": min(162, int(140 * playing_time)),
+                        "innings": round(1200.0 * playing_time, 1),
+                        "putouts": int(250 * playing_time),
+                        "assists": int(150 * playing_time),
+                        "errors": int(rng.integers(3, 15)),
+                        "fielding_percentage": round(rng.uniform(0.970, 0.990), 3),
+                        "defensive_runs_saved": int(rng.normal(3, 5)),
+                        "ultimate_zone_rating": round(rng.normal(2.0, 4.0), 1),
+                        "outs_above_average": int(rng.normal(2, 4))
+                    },
+                    statcast={
+                        "average_exit_velocity": round(rng.normal(89.5, 2.0), 1),
+                        "max_exit_velocity": round(rng.normal(112.0, 3.0), 1),
+                        "average_launch_angle": round(rng.normal(14.0, 4.0), 1),
+                        "barrel_percentage": round(8.5 * skill ** 2, 1),
+                        "sweet_spot_percentage": round(rng.normal(35.0, 3.0), 1),
+                        "hard_hit_percentage": round(42.0 * skill ** 0.5, 1),
+                        "average_sprint_speed": round(rng.normal(27.5, 1.0), 1)
+                    },
+                    war=round(4.0 * (skill ** 2 - 0.55) * playing_time * 2, 1)
+                ))
+
+
+def _sample_statcast_season(season: int, rng: np.random.Generator) -> StatcastPartition:
+    """Generate a season of pitch-level data for the sample players."""
+    from app.services.player_service import players_db
+    
+    teams = sorted({p.team_id for p in players_db.values()} | {"NYY", "LAD", "BOS", "HOU", "ATL"})
+    pitch_types = ["FF", "SI", "FC", "SL", "CU", "CH"]
+    events = ["", "single", "double", "triple", "home_run", "field_out", "strikeout", "walk"]
+    opening_day, last_day = date_to_day(f"{season}-03-28"), date_to_day(f"{season}-09-29")
+    
+    parts = []
+    for player in players_db.values():
+        n = int(rng.integers(2200, 2800))
+        team = teams.index(player.team_id)
+        opponent = (team + rng.integers(1, len(teams), n)) % len(teams)
+        other = rng.integers(900000, 900400, n).astype(np.int32)
+        own = np.full(n, player.id, dtype=np.int32)
+        is_pitcher = player.position.startswith('P')
+        parts.append({
+            "game_date": np.sort(rng.integers(opening_day, last_day + 1, n)).astype(np.int32),
+            "batter": other if is_pitcher else own,
+            "pitcher": own if is_pitcher else other,
+            "bat_team": opponent if is_pitcher else np.full(n, team),
+            "fld_team": np.full(n, team) if is_pitcher else opponent,
+            "pitch_type": rng.choice(len(pitch_types), n, p=[0.35, 0.15, 0.08, 0.2, 0.1, 0.12]),
+        })
+    
+    columns = {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+    n = len(columns["game_date"])
+    fastball = columns["pitch_type"] < 3
+    columns["release_speed"] = np.where(fastball, rng.normal(94.5, 1.8, n), rng.normal(84.5, 2.5, n))
+    columns["release_spin_rate"] = np.where(fastball, rng.normal(2300, 120, n), rng.normal(2550, 180, n))
+    columns["pfx_x"] = rng.normal(-4.0, 6.0, n)
+    columns["pfx_z"] = np.where(fastball, rng.normal(15.0, 2.5, n), rng.normal(2.0, 4.0, n))
+    columns["in_zone"] = rng.random(n) < 0.48
+    columns["is_swing"] = rng.random(n) < np.where(columns["in_zone"], 0.66, 0.30)
+    columns["is_whiff"] = columns["is_swing"] & (rng.random(n) < 0.24)
+    
+    in_play = columns["is_swing"] & ~columns["is_whiff"] & (rng.random(n) < 0.45)
+    launch_speed = np.clip(rng.normal(89.0, 13.0, n), 40, 120)
+    launch_angle = rng.normal(12.0, 26.0, n)
+    columns["launch_speed"] = np.where(in_play, launch_speed, np.nan)
+    columns["launch_angle"] = np.where(in_play, launch_angle, np.nan)
+    columns["hit_distance"] = np.where(
+        in_play, np.clip(launch_speed * 4.2 * np.sin(np.radians(np.clip(launch_angle, 5, 85)) * 2) ** 0.5, 5, 480), np.nan
+    )
+    columns["is_barrel"] = is_barrel(columns["launch_speed"], columns["launch_angle"])
+    outcome = rng.choice([1, 2, 3, 4, 5], n, p=[0.2, 0.06, 0.005, 0.035, 0.7])
+    outcome = np.where(columns["is_barrel"], np.where(rng.random(n) < 0.5, 4, 2), outcome)
+    columns["events"] = np.where(in_play, outcome, 0)
+    
+    return StatcastPartition.from_arrays(
+        season,
+        columns,
+        {"bat_team": teams, "fld_team": teams, "pitch_type": pitch_types, "events": events}
+    )
+
+
+def initialize_sample_statcast():
+    """Register a generated 2024 pitch partition unless one exists on disk."""
+    if 2024 not in statcast_store.seasons():
+        statcast_store.add(_sample_statcast_season(2024, np.random.default_rng(2024)))
+
+
+initialize_sample_stats()
+initialize_sample_statcast()
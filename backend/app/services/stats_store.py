@@ -0,0 +1,391 @@
+from typing import List, Optional, Dict, Any, Tuple, Union, get_args, get_origin
+import numpy as np
+from app.models.player import PlayerStats, BattingStats, PitchingStats, FieldingStats, StatcastData
+
+# Stat categories stored in the table, in PlayerStats field order
+CATEGORY_MODELS = {
+    "batting": BattingStats,
+    "pitching": PitchingStats,
+    "fielding": FieldingStats,
+    "statcast": StatcastData,
+}
+
+# Required integer fields are season counting stats, which fit in int16.
+# Everything else (rates, optional fields) is float32 with NaN marking a missing value.
+INT_DTYPE = np.int16
+FLOAT_DTYPE = np.float32
+
+# Decimal places kept when turning float32 cells back into Python floats
+FLOAT_DECIMALS = 4
+
+
+def _field_schema(model) -> Dict[str, Tuple[np.dtype, bool]]:
+    """Map each field of a stats model to (dtype, is_optional_int)."""
+    schema = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        optional_int = get_origin(annotation) is Union and int in get_args(annotation)
+        dtype = INT_DTYPE if annotation is int else FLOAT_DTYPE
+        schema[name] = (np.dtype(dtype), optional_int)
+    return schema
+
+
+def innings_to_outs(innings: Union[float, np.ndarray]) -> Union[int, np.ndarray]:
+    """
+    Convert innings pitched in baseball notation (180.2 = 180 2/3) to outs.
+
+    Args:
+        innings: Innings pitched, scalar or array
+
+    Returns:
+        Outs recorded, with the same shape as the input
+    """
+    whole = np.floor(innings)
+    outs = whole * 3 + np.round((innings - whole) * 10)
+    return outs.astype(np.int64) if isinstance(outs, np.ndarray) else int(outs)
+
+
+def outs_to_innings(outs: int) -> float:
+    """Convert outs recorded to innings pitched in baseball notation."""
+    return outs // 3 + (outs % 3) / 10
+
+
+def nullable_list(values: np.ndarray, missing: np.ndarray, decimals: Optional[int] = None) -> List[Any]:
+    """
+    Convert a column slice to Python values with None where missing is set.
+
+    Args:
+        values: Column values
+        missing: Boolean mask of the same length
+        decimals: Round floats to this many places (None keeps the dtype's kind)
+
+    Returns:
+        List of Python ints, floats or bools, and None
+    """
+    if decimals is not None:
+        values = np.round(np.where(missing, 0, values).astype(np.float64), decimals)
+    out = values.tolist()
+    if missing.any():
+        out = [None if m else v for v, m in zip(out, missing.tolist())]
+    return out
+
+
+class SeasonStatsTable:
+    """
+    Column-oriented store of player-season statistics.
+
+    Each batting, pitching, fielding and Statcast field is one typed NumPy array,
+    and rows are addressed through a (player_id, season) index. Single lines are
+    gathered from the columns on demand, while league-wide questions reduce over
+    whole columns.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self.schema = {category: _field_schema(model) for category, model in CATEGORY_MODELS.items()}
+        self.n_rows = 0
+        self.version = 0
+        self._capacity = initial_capacity
+        self._rows: Dict[Tuple[int, int], int] = {}
+        self._player_seasons: Dict[int, List[int]] = {}
+        self._season_versions: Dict[int, int] = {}
+        self.teams: List[str] = []
+        self._team_codes: Dict[str, int] = {}
+
+        self.player_id = np.zeros(initial_capacity, dtype=np.int32)
+        self.season = np.zeros(initial_capacity, dtype=np.int16)
+        self.team = np.full(initial_capacity, -1, dtype=np.int16)
+        self.war = np.full(initial_capacity, np.nan, dtype=FLOAT_DTYPE)
+        self.row_version = np.zeros(initial_capacity, dtype=np.int64)
+        self.present = {c: np.zeros(initial_capacity, dtype=bool) for c in self.schema}
+        self.columns = {
+            category: {name: self._empty(dtype, initial_capacity) for name, (dtype, _) in fields.items()}
+            for category, fields in self.schema.items()
+        }
+
+    @staticmethod
+    def _empty(dtype: np.dtype, size: int) -> np.ndarray:
+        """Allocate a column filled with its missing value."""
+        if dtype.kind == "f":
+            return np.full(size, np.nan, dtype=dtype)
+        return np.zeros(size, dtype=dtype)
+
+    def _grow(self) -> None:
+        """Double the capacity of every column."""
+        new_capacity = self._capacity * 2
+
+        def grown(array: np.ndarray, fill=None) -> np.ndarray:
+            out = self._empty(array.dtype, new_capacity)
+            if fill is not None:
+                out[:] = fill
+            out[: self._capacity] = array
+            return out
+
+        self.player_id = grown(self.player_id)
+        self.season = grown(self.season)
+        self.team = grown(self.team, fill=-1)
+        self.war = grown(self.war)
+        self.row_version = grown(self.row_version)
+        self.present = {c: grown(a) for c, a in self.present.items()}
+        self.columns = {
+            category: {name: grown(a) for name, a in fields.items()}
+            for category, fields in self.columns.items()
+        }
+        self._capacity = new_capacity
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the column arrays."""
+        arrays = [self.player_id, self.season, self.team, self.war, self.row_version]
+        arrays += list(self.present.values())
+        arrays += [a for fields in self.columns.values() for a in fields.values()]
+        return sum(a.nbytes for a in arrays)
+
+    def row(self, player_id: int, season: int) -> Optional[int]:
+        """Return the row index of a player-season, or None."""
+        return self._rows.get((player_id, season))
+
+    def seasons_for(self, player_id: int) -> List[int]:
+        """Return the seasons stored for a player, oldest first."""
+        return self._player_seasons.get(player_id, [])
+
+    def season_version(self, season: int) -> int:
+        """Return the table version of the last write to a season (0 if none)."""
+        return self._season_versions.get(season, 0)
+
+    def season_rows(self, season: int) -> np.ndarray:
+        """Return the row indices of every player-season in a season."""
+        return np.flatnonzero(self.season[: self.n_rows] == season)
+
+    def team_code(self, team_id: str) -> int:
+        """Return the integer code of a team, assigning one on first use."""
+        code = self._team_codes.get(team_id)
+        if code is None:
+            code = self._team_codes[team_id] = len(self.teams)
+            self.teams.append(team_id)
+        return code
+
+    def column(self, category: str, field: str) -> np.ndarray:
+        """Return a view of a stat column over the filled rows."""
+        return self.columns[category][field][: self.n_rows]
+
+    def upsert(self, stats: PlayerStats) -> int:
+        """
+        Insert or replace a player-season line.
+
+        Args:
+            stats: PlayerStats object to store
+
+        Returns:
+            Row index of the stored line
+        """
+        key = (stats.player_id, stats.season)
+        row = self._rows.get(key)
+        if row is None:
+            if self.n_rows == self._capacity:
+                self._grow()
+            row = self.n_rows
+            self.n_rows += 1
+            self._rows[key] = row
+            seasons = self._player_seasons.setdefault(stats.player_id, [])
+            seasons.append(stats.season)
+            seasons.sort()
+            self.player_id[row] = stats.player_id
+            self.season[row] = stats.season
+
+        self.team[row] = -1 if stats.team_id is None else self.team_code(stats.team_id)
+        for category, fields in self.schema.items():
+            line = getattr(stats, category)
+            self.present[category][row] = line is not None
+            columns = self.columns[category]
+            for name, (dtype, _) in fields.items():
+                value = getattr(line, name) if line is not None else None
+                if value is None:
+                    value = np.nan if dtype.kind == "f" else 0
+                columns[name][row] = value
+
+        self.war[row] = np.nan if stats.war is None else stats.war
+        self.version += 1
+        self.row_version[row] = self.version
+        self._season_versions[stats.season] = self.version
+        return row
+
+    @staticmethod
+    def _to_python(value: Any, dtype: np.dtype, optional_int: bool) -> Any:
+        """Convert a column cell back to the Python value the models expect."""
+        if dtype.kind != "f":
+            return int(value)
+        if np.isnan(value):
+            return None
+        if optional_int:
+            return int(value)
+        return round(float(value), FLOAT_DECIMALS)
+
+    def value(self, row: int, category: str, field: str) -> Any:
+        """Return one cell as the Python value the models expect (None if missing)."""
+        dtype, optional_int = self.schema[category][field]
+        return self._to_python(self.columns[category][field][row], dtype, optional_int)
+
+    def get(self, player_id: int, season: int) -> Optional[PlayerStats]:
+        """
+        Gather one player-season line from the columns.
+
+        Args:
+            player_id: The player's ID
+            season: The season year
+
+        Returns:
+            PlayerStats object if the line exists, None otherwise
+        """
+        row = self._rows.get((player_id, season))
+        if row is None:
+            return None
+
+        lines = {}
+        for category, fields in self.schema.items():
+            if not self.present[category][row]:
+                continue
+            columns = self.columns[category]
+            lines[category] = {
+                name: self._to_python(columns[name][row], dtype, optional_int)
+                for name, (dtype, optional_int) in fields.items()
+            }
+
+        war = self.war[row]
+        team = self.team[row]
+        return PlayerStats(
+            player_id=player_id,
+            season=season,
+            team_id=None if team < 0 else self.teams[team],
+            war=None if np.isnan(war) else round(float(war), FLOAT_DECIMALS),
+            **lines
+        )
+
+    def record_fields(self) -> List[str]:
+        """Return the keys of records(): the row keys, then "<category>.<field>" per stat."""
+        stats = [f"{category}.{name}" for category, fields in self.schema.items() for name in fields]
+        return ["player_id", "season", "team_id", "war"] + stats
+
+    def records(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Flatten rows into one dict per player-season, keyed as in record_fields().
+
+        Columns are converted a slice at a time, to the same values get()
+        returns; a category without a line for the row is None throughout.
+
+        Args:
+            rows: Row indices
+
+        Returns:
+            List of flat records, in the order of rows
+        """
+        team = self.team[rows].tolist()
+        war = self.war[rows]
+        columns = [
+            self.player_id[rows].tolist(),
+            self.season[rows].tolist(),
+            [None if code < 0 else self.teams[code] for code in team],
+            nullable_list(war, np.isnan(war), FLOAT_DECIMALS),
+        ]
+        for category, fields in self.schema.items():
+            absent = ~self.present[category][rows]
+            for name, (dtype, optional_int) in fields.items():
+                values = self.columns[category][name][rows]
+                if dtype.kind != "f":
+                    columns.append(nullable_list(values, absent))
+                    continue
+                missing = absent | np.isnan(values)
+                if optional_int:
+                    columns.append(nullable_list(np.where(missing, 0, values).astype(np.int64), missing))
+                else:
+                    columns.append(nullable_list(values, missing, FLOAT_DECIMALS))
+        names = self.record_fields()
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def totals(self, season: int, category: str, fields: List[str]) -> Dict[str, float]:
+        """
+        Sum stat columns over every player with a line in the category.
+
+        Args:
+            season: Season year
+            category: Stat category (batting, pitching, fielding, statcast)
+            fields: Field names to total
+
+        Returns:
+            Dictionary of field name to league total, plus "lines" (row count)
+        """
+        mask = (self.season[: self.n_rows] == season) & self.present[category][: self.n_rows]
+        result = {"lines": int(mask.sum())}
+        for name in fields:
+            values = self.column(category, name)[mask]
+            result[name] = float(np.nansum(values, dtype=np.float64))
+        return result
+
+    def leaders(
+        self,
+        season: int,
+        category: str,
+        field: str,
+        k: int = 10,
+        ascending: bool = False,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the top k players of a season in one stat column.
+
+        Args:
+            season: Season year
+            category: Stat category
+            field: Field name
+            k: Number of players to return
+            ascending: Rank lowest values first (e.g., ERA)
+            mask: Optional boolean array over the filled rows restricting who ranks
+
+        Returns:
+            List of (player_id, value) tuples, best first
+        """
+        eligible = (self.season[: self.n_rows] == season) & self.present[category][: self.n_rows]
+        if mask is not None:
+            eligible &= mask
+        rows = np.flatnonzero(eligible)
+        values = self.column(category, field)[rows].astype(np.float64)
+        keep = ~np.isnan(values)
+        rows, values = rows[keep], values[keep]
+        if not len(rows):
+            return []
+
+        scores = values if ascending else -values
+        k = min(k, len(scores))
+        cutoff = scores[np.argpartition(scores, k - 1)[k - 1]]
+        # Keep every player tied at the cutoff so ties break by player ID
+        top = np.flatnonzero(scores <= cutoff)
+        top = top[np.lexsort((self.player_id[rows[top]], scores[top]))][:k]
+        return [(int(self.player_id[rows[i]]), float(values[i])) for i in top]
+
+    def percentiles(
+        self,
+        season: int,
+        category: str,
+        field: str,
+        q: Union[float, List[float]],
+    ) -> np.ndarray:
+        """
+        Compute league percentiles of a stat column.
+
+        Args:
+            season: Season year
+            category: Stat category
+            field: Field name
+            q: Percentile or percentiles in [0, 100]
+
+        Returns:
+            Array of percentile values (NaN if the season has no data)
+        """
+        mask = (self.season[: self.n_rows] == season) & self.present[category][: self.n_rows]
+        values = self.column(category, field)[mask].astype(np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return np.full(np.shape(q), np.nan)
+        return np.percentile(values, q)
@@ -1,10 +1,68 @@
-from typing import List, Optional, Dict, Any
+from bisect import bisect_right, insort
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple
 from app.models.team import Team, TeamRoster
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.season_simulator import League, SeasonState
 
 # This is a mock implementation. In a real application, you would connect to a database.
 # For now, we'll use an in-memory dictionary to store team data.
 teams_db = {}
 
+# Team IDs in sort order, for keyset pagination
+team_ids: List[str] = []
+
+# Standings and remaining schedule per season, created on first use
+season_states: Dict[int, SeasonState] = {}
+
+
+def _add_team(team: Team) -> None:
+    """Add a team to the database and the sorted ID list."""
+    if team.id not in teams_db:
+        insort(team_ids, team.id)
+    teams_db[team.id] = team
+
+
+def get_teams_page(
+    skip: int = 0,
+    limit: int = 30,
+    cursor: Optional[str] = None,
+    division: Optional[str] = None,
+    league: Optional[str] = None,
+) -> Tuple[List[Team], Optional[str]]:
+    """
+    Retrieve a page of teams ordered by ID, with optional keyset pagination.
+    
+    Args:
+        skip: Number of teams to skip (applied after the cursor position)
+        limit: Maximum number of teams to return
+        cursor: Opaque cursor returned with the previous page
+        division: Filter by division
+        league: Filter by league
+        
+    Returns:
+        Tuple of (list of Team objects, cursor for the next page or None)
+        
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    start = 0
+    if cursor:
+        last_id = decode_cursor(cursor, "id")
+        if not isinstance(last_id, str):
+            raise ValueError("Invalid cursor")
+        start = bisect_right(team_ids, last_id)
+    
+    candidates = (teams_db[team_ids[i]] for i in range(start, len(team_ids)))
+    matching = (
+        t for t in candidates
+        if (not division or t.division == division) and (not league or t.league == league)
+    )
+    page = list(islice(matching, skip, skip + limit + 1))
+    
+    next_cursor = encode_cursor("id", page[limit - 1].id) if 0 < limit < len(page) else None
+    return page[:limit], next_cursor
+
 
 def get_teams(
     skip: int = 0,
@@ -22,17 +80,10 @@ def get_teams(
         league: Filter by league
         
     Returns:
-        List of Team objects
+        List of Team objects, ordered by ID
     """
-    filtered_teams = list(teams_db.values())
-    
-    if division:
-        filtered_teams = [t for t in filtered_teams if t.division == division]
-    
-    if league:
-        filtered_teams = [t for t in filtered_teams if t.league == league]
-    
-    return filtered_teams[skip : skip + limit]
+    teams, _ = get_teams_page(skip=skip, limit=limit, division=division, league=league)
+    return teams
 
 
 def get_team(team_id: str) -> Optional[Team]:
@@ -72,21 +123,18 @@ def get_team_roster(team_id: str, season: Optional[int] = None) -> Optional[Team
     from app.services.player_service import get_players
     team_players = get_players(team=team_id)
     
-    # Mock payroll data
-    payroll = 0
-    for player in team_players:
-        # In a real implementation, this would come from a database
-        # For now, we'll assign random salaries
-        import random
-        player.salary = random.uniform(700000, 20000000)
-        payroll += player.salary
+    # Mock payroll data: Player has no salary field, so salaries are kept by player ID
+    # In a real implementation, this would come from a database
+    import random
+    salaries = {player.id: random.uniform(700000, 20000000) for player in team_players}
+    payroll = sum(salaries.values(), 0.0)
     
     # Find highest paid player
-    highest_paid = max(team_players, key=lambda p: getattr(p, 'salary', 0)) if team_players else None
+    highest_paid = max(team_players, key=lambda p: salaries[p.id]) if team_players else None
     highest_paid_dict = {
         "id": highest_paid.id,
         "name": highest_paid.name,
-        "salary": getattr(highest_paid, 'salary', 0)
+        "salary": salaries[highest_paid.id]
     } if highest_paid else {}
     
     # Count positions
@@ -104,13 +152,53 @@ def get_team_roster(team_id: str, season: Optional[int] = None) -> Optional[Team
         injured_list=0,  # Mock data
         total_payroll=payroll,
         average_salary=payroll / len(team_players) if team_players else 0,
-        median_salary=sorted([getattr(p, 'salary', 0) for p in team_players])[len(team_players) // 2] if team_players else 0,
+        median_salary=sorted(salaries.values())[len(team_players) // 2] if team_players else 0,
         highest_paid_player=highest_paid_dict
     )
     
     return roster
 
 
+def get_season_state(season: int) -> SeasonState:
+    """
+    Return the standings and remaining schedule of a season.
+    
+    A season with no recorded games starts from the full 162-game schedule.
+    
+    Args:
+        season: Season year
+        
+    Returns:
+        SeasonState for the season
+    """
+    state = season_states.get(season)
+    if state is None:
+        state = season_states[season] = SeasonState(season, League(list(teams_db.values())))
+    return state
+
+
+def record_game_result(season: int, home_team_id: str, away_team_id: str, home_score: int, away_score: int) -> None:
+    """
+    Record a final score in the standings and remaining schedule.
+    
+    Both teams are also credited a game played for leaderboard qualification.
+    
+    Args:
+        season: Season year
+        home_team_id: Home team's ID
+        away_team_id: Visiting team's ID
+        home_score: Runs scored by the home team
+        away_score: Runs scored by the visiting team
+        
+    Raises:
+        ValueError: If a team is unknown, the score is tied, or the matchup has no games left
+    """
+    from app.services.stats_service import record_team_games
+    
+    get_season_state(season).record_game(home_team_id, away_team_id, home_score, away_score)
+    record_team_games(season, [home_team_id, away_team_id])
+
+
 # Initialize with MLB team data
 def initialize_team_data():
     """Initialize the database with MLB team data."""
@@ -194,11 +282,231 @@ def initialize_team_data():
             division="West",
             venue="Minute Maid Park",
             first_year=1962
+        ),
+        Team(
+            id="BAL",
+            name="Orioles",
+            full_name="Baltimore Orioles",
+            location="Baltimore",
+            league="AL",
+            division="East",
+            venue="Oriole Park at Camden Yards",
+            first_year=1901
+        ),
+        Team(
+            id="TBR",
+            name="Rays",
+            full_name="Tampa Bay Rays",
+            location="St. Petersburg",
+            league="AL",
+            division="East",
+            venue="Tropicana Field",
+            first_year=1998
+        ),
+        Team(
+            id="TOR",
+            name="Blue Jays",
+            full_name="Toronto Blue Jays",
+            location="Toronto",
+            league="AL",
+            division="East",
+            venue="Rogers Centre",
+            first_year=1977
+        ),
+        Team(
+            id="CHW",
+            name="White Sox",
+            full_name="Chicago White Sox",
+            location="Chicago",
+            league="AL",
+            division="Central",
+            venue="Guaranteed Rate Field",
+            first_year=1901
+        ),
+        Team(
+            id="CLE",
+            name="Guardians",
+            full_name="Cleveland Guardians",
+            location="Cleveland",
+            league="AL",
+            division="Central",
+            venue="Progressive Field",
+            first_year=1901
+        ),
+        Team(
+            id="DET",
+            name="Tigers",
+            full_name="Detroit Tigers",
+            location="Detroit",
+            league="AL",
+            division="Central",
+            venue="Comerica Park",
+            first_year=1901
+        ),
+        Team(
+            id="KCR",
+            name="Royals",
+            full_name="Kansas City Royals",
+            location="Kansas City",
+            league="AL",
+            division="Central",
+            venue="Kauffman Stadium",
+            first_year=1969
+        ),
+        Team(
+            id="MIN",
+            name="Twins",
+            full_name="Minnesota Twins",
+            location="Minneapolis",
+            league="AL",
+            division="Central",
+            venue="Target Field",
+            first_year=1901
+        ),
+        Team(
+            id="OAK",
+            name="Athletics",
+            full_name="Oakland Athletics",
+            location="Oakland",
+            league="AL",
+            division="West",
+            venue="Oakland Coliseum",
+            first_year=1901
+        ),
+        Team(
+            id="SEA",
+            name="Mariners",
+            full_name="Seattle Mariners",
+            location="Seattle",
+            league="AL",
+            division="West",
+            venue="T-Mobile Park",
+            first_year=1977
+        ),
+        Team(
+            id="TEX",
+            name="Rangers",
+            full_name="Texas Rangers",
+            location="Arlington",
+            league="AL",
+            division="West",
+            venue="Globe Life Field",
+            first_year=1961
+        ),
+        Team(
+            id="NYM",
+            name="Mets",
+            full_name="New York Mets",
+            location="New York",
+            league="NL",
+            division="East",
+            venue="Citi Field",
+            first_year=1962
+        ),
+        Team(
+            id="PHI",
+            name="Phillies",
+            full_name="Philadelphia Phillies",
+            location="Philadelphia",
+            league="NL",
+            division="East",
+            venue="Citizens Bank Park",
+            first_year=1883
+        ),
+        Team(
+            id="WSH",
+            name="Nationals",
+            full_name="Washington Nationals",
+            location="Washington",
+            league="NL",
+            division="East",
+            venue="Nationals Park",
+            first_year=1969
+        ),
+        Team(
+            id="CIN",
+            name="Reds",
+            full_name="Cincinnati Reds",
+            location="Cincinnati",
+            league="NL",
+            division="Central",
+            venue="Great American Ball Park",
+            first_year=1882
+        ),
+        Team(
+            id="MIL",
+            name="Brewers",
+            full_name="Milwaukee Brewers",
+            location="Milwaukee",
+            league="NL",
+            division="Central",
+            venue="American Family Field",
+            first_year=1969
+        ),
+        Team(
+            id="PIT",
+            name="Pirates",
+            full_name="Pittsburgh Pirates",
+            location="Pittsburgh",
+            league="NL",
+            division="Central",
+            venue="PNC Park",
+            first_year=1882
+        ),
+        Team(
+            id="STL",
+            name="Cardinals",
+            full_name="St. Louis Cardinals",
+            location="St. Louis",
+            league="NL",
+            division="Central",
+            venue="Busch Stadium",
+            first_year=1882
+        ),
+        Team(
+            id="ARI",
+            name="Diamondbacks",
+            full_name="Arizona Diamondbacks",
+            location="Phoenix",
+            league="NL",
+            division="West",
+            venue="Chase Field",
+            first_year=1998
+        ),
+        Team(
+            id="COL",
+            name="Rockies",
+            full_name="Colorado Rockies",
+            location="Denver",
+            league="NL",
+            division="West",
+            venue="Coors Field",
+            first_year=1993
+        ),
+        Team(
+            id="SDP",
+            name="Padres",
+            full_name="San Diego Padres",
+            location="San Diego",
+            league="NL",
+            division="West",
+            venue="Petco Park",
+            first_year=1969
+        ),
+        Team(
+            id="SFG",
+            name="Giants",
+            full_name="San Francisco Giants",
+            location="San Francisco",
+            league="NL",
+            division="West",
+            venue="Oracle Park",
+            first_year=1883
         )
     ]
     
     for team in mlb_teams:
-        teams_db[team.id] = team
+        _add_team(team)
 
 
 # Initialize team data
@@ -0,0 +1,329 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Tuple
+import logging
+import multiprocessing
+import threading
+import numpy as np
+from app.services.projection_model import COUNTING_TARGETS, TARGET_CAPS, target_names
+from app.services.season_simulator import POOL_START_METHOD
+
+logger = logging.getLogger(__name__)
+
+# Bootstrap replicates per player
+BOOTSTRAP_REPLICATES = 400
+
+# Quantiles reported as the interval (the one-sigma band of a normal)
+INTERVAL_QUANTILES = (0.1587, 0.8413)
+
+# Players resampled per array batch (and per process-pool task)
+BOOTSTRAP_CHUNK = 256
+
+# Sampling noise of one PA (hitters) or out (pitchers): a season's standard
+# deviation is this over sqrt(playing time) for rates and times it for counts
+SAMPLING_SD = {
+    "batting": {
+        "batting_average": 0.44,
+        "on_base_percentage": 0.47,
+        "slugging_percentage": 0.75,
+        "home_runs": 0.20,
+        "runs_batted_in": 0.45,
+        "stolen_bases": 0.20,
+        "weighted_runs_created_plus": 380.0,
+        "war": 0.041,
+    },
+    "pitching": {
+        "earned_run_average": 14.0,
+        "walks_and_hits_per_inning_pitched": 2.8,
+        "strikeouts": 0.57,
+        "wins": 0.10,
+        "fielding_independent_pitching": 9.3,
+        "war": 0.043,
+    },
+}
+
+# Least playing time assumed for next season's outcome noise (PA or outs)
+MIN_PLAYING_TIME = {"batting": 300.0, "pitching": 300.0}
+
+# Local hour at which the nightly precompute runs
+NIGHTLY_HOUR = 4
+
+# Precomputed intervals per (group, season, model name, model version): (sorted player IDs,
+# version of each player's history rows when computed, lower, upper)
+precomputed_intervals: Dict[Tuple[str, int, str, str], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+# Guards precomputed_intervals, written by the nightly thread and read by requests
+_intervals_lock = threading.Lock()
+
+_nightly_thread: Optional[threading.Thread] = None
+
+
+def _noise_scale(group: str, playing_time: np.ndarray) -> np.ndarray:
+    """Return the sampling standard deviation per (..., target) at a playing time."""
+    targets = target_names(group)
+    sd = np.array([SAMPLING_SD[group][t] for t in targets])
+    counting = np.array([t in COUNTING_TARGETS for t in targets])
+    time = np.maximum(playing_time, 1.0)[..., None]
+    return np.where(counting, sd * np.sqrt(time), sd / np.sqrt(time))
+
+
+def resample_features(
+    group: str,
+    features: Dict[str, np.ndarray],
+    replicates: int,
+    rng: np.random.Generator,
+) -> Dict[str, np.ndarray]:
+    """
+    Draw bootstrap replicates of a batch of model inputs.
+
+    Each season line is redrawn around its observed value with the sampling
+    noise of its playing time (a parametric bootstrap of the plate
+    appearances or outs behind it), so thin track records vary most.
+
+    Args:
+        group: batting or pitching
+        features: Feature arrays of n players (see build_feature_matrix)
+        replicates: Replicates per player
+        rng: Random generator
+
+    Returns:
+        Feature arrays of replicates * n rows, replicate-major
+    """
+    history = features["history"]
+    n = len(history)
+    scale = _noise_scale(group, features["playing_time"])
+    noisy = history[None] + rng.standard_normal((replicates,) + history.shape) * scale[None]
+    noisy = np.maximum(noisy, 0.0)
+
+    played = np.isfinite(history).any(axis=2)
+    latest = np.argmax(played, axis=1)
+    resampled = {name: np.tile(values, (replicates,) + (1,) * (values.ndim - 1)) for name, values in features.items()}
+    resampled["history"] = noisy.reshape((replicates * n,) + history.shape[1:])
+    resampled["previous"] = noisy[:, np.arange(n), latest].reshape(replicates * n, -1)
+    return resampled
+
+
+def bootstrap_intervals(
+    model: Any,
+    group: str,
+    features: Dict[str, np.ndarray],
+    replicates: int = BOOTSTRAP_REPLICATES,
+    seed: Any = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Predictive intervals from bootstrap replicates of the model inputs.
+
+    All replicates of a batch go through one predict call; next season's own
+    sampling noise is added to each replicate before taking quantiles.
+
+    Args:
+        model: Object with predict(group, features) -> (mean, std)
+        group: batting or pitching
+        features: Feature arrays of n players
+        replicates: Replicates per player
+        seed: Seed or SeedSequence
+
+    Returns:
+        (lower, upper) arrays of shape (n, targets)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(features["history"])
+    mean, _ = model.predict(group, features)
+    draws, _ = model.predict(group, resample_features(group, features, replicates, rng))
+    draws = draws.reshape(replicates, n, -1)
+
+    next_time = np.maximum(np.nan_to_num(features["playing_time"][:, 0]), MIN_PLAYING_TIME[group])
+    draws = draws + rng.standard_normal(draws.shape) * _noise_scale(group, next_time)[None]
+
+    lower, upper = np.quantile(draws, INTERVAL_QUANTILES, axis=0)
+    lower, upper = np.minimum(lower, mean), np.maximum(upper, mean)
+    caps = np.array([TARGET_CAPS.get(t, np.inf) for t in target_names(group)])
+    return np.maximum(lower, 0.0), np.minimum(upper, caps)
+
+
+def _bootstrap_chunk(args: Tuple[Any, str, Dict[str, np.ndarray], int, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Process-pool task: bootstrap one chunk of players."""
+    return bootstrap_intervals(*args)
+
+
+def compute_intervals(
+    model: Any,
+    group: str,
+    features: Dict[str, np.ndarray],
+    replicates: int = BOOTSTRAP_REPLICATES,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap intervals for a whole group, chunk by chunk.
+
+    Args:
+        model: Projection model
+        group: batting or pitching
+        features: Feature arrays of all players
+        replicates: Replicates per player
+        workers: Processes for the chunks (None or 1 runs in this process)
+        seed: Random seed
+
+    Returns:
+        (lower, upper) arrays of shape (n, targets)
+    """
+    n = len(features["history"])
+    starts = list(range(0, n, BOOTSTRAP_CHUNK))
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [
+        (model, group, {k: v[s : s + BOOTSTRAP_CHUNK] for k, v in features.items()}, replicates, chunk_seed)
+        for s, chunk_seed in zip(starts, seeds)
+    ]
+    if not tasks:
+        empty = np.zeros((0, len(target_names(group))))
+        return empty, empty
+
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            mp_context=multiprocessing.get_context(POOL_START_METHOD),
+        ) as pool:
+            results = list(pool.map(_bootstrap_chunk, tasks))
+    else:
+        results = [_bootstrap_chunk(task) for task in tasks]
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+def history_versions(player_ids: np.ndarray, season: int) -> np.ndarray:
+    """
+    Return the latest row version of each player's stats in the seasons a projection reads.
+
+    A player's projection for a season only changes when one of their own
+    rows in the previous HISTORY_SEASONS seasons is written.
+
+    Args:
+        player_ids: Sorted player IDs
+        season: The season year to project
+
+    Returns:
+        Row version per player (0 for players without rows in the window)
+    """
+    from app.services.stats_service import season_stats
+    from app.services.prediction_service import HISTORY_SEASONS
+
+    versions = np.zeros(len(player_ids), dtype=np.int64)
+    for k in range(1, HISTORY_SEASONS + 1):
+        rows = season_stats.season_rows(season - k)
+        if not len(rows):
+            continue
+        rows = rows[np.argsort(season_stats.player_id[rows])]
+        row_ids = season_stats.player_id[rows].astype(np.int64)
+        position = np.minimum(np.searchsorted(row_ids, player_ids), len(rows) - 1)
+        match = row_ids[position] == player_ids
+        row_versions = season_stats.row_version[rows[position]]
+        versions = np.maximum(versions, np.where(match, row_versions, 0))
+    return versions
+
+
+def precompute_intervals(
+    season: int,
+    replicates: int = BOOTSTRAP_REPLICATES,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Bootstrap intervals for every projected player of a season with the active model.
+
+    League projections pick the results up, so online requests only look
+    them up. Each player's intervals stay valid until their own history rows
+    change.
+
+    Args:
+        season: The season year to project
+        replicates: Replicates per player
+        workers: Processes to use (None runs in this process, as the
+            server's nightly run does to leave its cores to requests)
+
+    Returns:
+        Number of players covered per group
+    """
+    from app.services.prediction_service import model_registry, build_feature_matrix, drop_projections
+
+    model = model_registry.active("performance")
+    covered = {}
+    for group in ("batting", "pitching"):
+        player_ids, features = build_feature_matrix(group, season)
+        # Read before the bootstrap, so a write during it makes the result stale
+        versions = history_versions(player_ids, season)
+        lower, upper = compute_intervals(model.model, group, features, replicates, workers)
+        with _intervals_lock:
+            for stale in [k for k in precomputed_intervals if k[:2] == (group, season)]:
+                del precomputed_intervals[stale]
+            precomputed_intervals[(group, season, model.name, model.version)] = (player_ids, versions, lower, upper)
+        # Cached projections carry the model-spread intervals; rebuild them on next use
+        drop_projections(group, season)
+        covered[group] = len(player_ids)
+    return covered
+
+
+def lookup_intervals(
+    group: str,
+    season: int,
+    model_name: str,
+    model_version: str,
+    player_ids: np.ndarray,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Return precomputed intervals for players whose history is unchanged since the run.
+
+    Args:
+        group: batting or pitching
+        season: The season year to project
+        model_name: Model the intervals must come from
+        model_version: Version of that model
+        player_ids: Sorted player IDs
+
+    Returns:
+        (lower, upper, current) where current marks the players whose rows
+        hold precomputed intervals, or None if there are none for this model
+    """
+    with _intervals_lock:
+        stored = precomputed_intervals.get((group, season, model_name, model_version))
+    if stored is None or not len(stored[0]):
+        return None
+    stored_ids, stored_versions, stored_lower, stored_upper = stored
+    position = np.minimum(np.searchsorted(stored_ids, player_ids), len(stored_ids) - 1)
+    current = (stored_ids[position] == player_ids) & (stored_versions[position] == history_versions(player_ids, season))
+    return stored_lower[position], stored_upper[position], current
+
+
+def _projection_season() -> Optional[int]:
+    """The season nightly runs project: the one after the latest season with stats."""
+    from app.services.stats_service import season_stats
+
+    if not season_stats.n_rows:
+        return None
+    return int(season_stats.season[: season_stats.n_rows].max()) + 1
+
+
+def _nightly_loop(hour: int) -> None:
+    while True:
+        season = _projection_season()
+        if season is not None:
+            try:
+                started = datetime.now()
+                # In-process, so the nightly run does not compete with requests for cores
+                covered = precompute_intervals(season, workers=None)
+                logger.info("Precomputed %s intervals for %s in %s", covered, season, datetime.now() - started)
+            except Exception:
+                logger.exception("Nightly interval precompute failed")
+        now = datetime.now()
+        next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        threading.Event().wait((next_run - now).total_seconds())
+
+
+def start_nightly_precompute(hour: int = NIGHTLY_HOUR) -> None:
+    """
+    Precompute intervals now in a background thread, then every night at the given hour.
+    """
+    global _nightly_thread
+    if _nightly_thread is None or not _nightly_thread.is_alive():
+        _nightly_thread = threading.Thread(target=_nightly_loop, args=(hour,), name="interval-precompute", daemon=True)
+        _nightly_thread.start()
@@ -0,0 +1,314 @@
+from typing import List, Optional, Dict, Any, Tuple
+import threading
+import numpy as np
+from app.models.player import PlayerValuation
+from app.services.player_age import season_age
+
+# Free-agent dollars per WAR by season; other seasons grow from the nearest one
+DOLLARS_PER_WAR = {
+    2020: 7_700_000,
+    2021: 7_900_000,
+    2022: 8_200_000,
+    2023: 8_500_000,
+    2024: 8_800_000,
+    2025: 9_100_000,
+}
+
+# Yearly growth of the dollars-per-WAR rate outside the table
+DOLLARS_PER_WAR_GROWTH = 0.03
+
+# Stars are paid a premium per win: price per WAR rises by this share per WAR above STAR_WAR
+STAR_PREMIUM = 0.04
+STAR_WAR = 3.0
+
+# League minimum salary by season (pre-arbitration pay)
+LEAGUE_MINIMUM = {2020: 563_500, 2021: 570_500, 2022: 700_000, 2023: 720_000, 2024: 740_000, 2025: 760_000}
+
+# Service-time thresholds (years) for salary arbitration and free agency
+ARBITRATION_YEARS = 3
+FREE_AGENCY_YEARS = 6
+
+# Arbitration pays this much per WAR at full arbitration seniority
+ARBITRATION_DOLLARS_PER_WAR = 2_500_000
+
+# Free-agent salary tiers in 2023 dollars: (minimum WAR, salary)
+FREE_AGENT_TIERS = [(-np.inf, 2_000_000), (1.0, 8_000_000), (3.0, 15_000_000), (5.0, 25_000_000)]
+
+# Service time assumed from age when a player has no debut date
+DEBUT_AGE = 23
+
+CONTRACT_STATUSES = ("pre-arbitration", "arbitration", "free agent")
+
+# Inputs of trained salary models, in column order (feature store columns)
+VALUATION_FEATURES = [
+    "war",
+    "service_years",
+    "age",
+    "batting.weighted_runs_created_plus",
+    "batting.on_base_percentage",
+    "batting.slugging_percentage",
+    "batting.home_runs",
+    "batting.games",
+]
+
+# Trained salary models predict in units of this many dollars
+SALARY_UNIT = 1_000_000
+
+# League-wide valuations per (season, stats version, performance model, salary model)
+_valuation_cache: Dict[Tuple[int, int, str, Optional[str]], Dict[str, Any]] = {}
+
+# Guards _valuation_cache across request threads
+_valuation_lock = threading.Lock()
+
+
+def _by_season(table: Dict[int, float], season: int) -> float:
+    """Look up a per-season dollar figure, growing it from the nearest listed season."""
+    if season in table:
+        return float(table[season])
+    nearest = min(table, key=lambda s: abs(s - season))
+    return float(table[nearest] * (1 + DOLLARS_PER_WAR_GROWTH) ** (season - nearest))
+
+
+def dollars_per_war(season: int) -> float:
+    """Return the free-agent price of one WAR in a season."""
+    return _by_season(DOLLARS_PER_WAR, season)
+
+
+def league_minimum(season: int) -> float:
+    """Return the league minimum salary in a season."""
+    return _by_season(LEAGUE_MINIMUM, season)
+
+
+def market_value(war: np.ndarray, season: int) -> np.ndarray:
+    """
+    Price WAR on the free-agent market.
+
+    The price per win is flat up to STAR_WAR and rises by STAR_PREMIUM for each
+    win beyond it; players below replacement are worth the league minimum.
+
+    Args:
+        war: WAR per player
+        season: Season the WAR is bought for
+
+    Returns:
+        Market values in dollars
+    """
+    war = np.asarray(war, dtype=np.float64)
+    premium = 1 + STAR_PREMIUM * np.maximum(war - STAR_WAR, 0)
+    value = np.maximum(war, 0) * dollars_per_war(season) * premium
+    return np.maximum(value, league_minimum(season))
+
+
+def service_years(player_ids: np.ndarray, season: int) -> np.ndarray:
+    """
+    Return each player's completed MLB service years entering a season.
+
+    Service time counts from the debut season; players without a debut date
+    use their recorded service time or, failing that, are assumed to have
+    debuted at DEBUT_AGE.
+    """
+    from app.services.player_service import players_db
+
+    years = np.zeros(len(player_ids), dtype=np.float64)
+    for i, player_id in enumerate(np.asarray(player_ids).tolist()):
+        player = players_db.get(player_id)
+        if player is None:
+            continue
+        if player.mlb_debut is not None:
+            years[i] = season - player.mlb_debut.year
+        elif player.mlb_service_time is not None:
+            years[i] = player.mlb_service_time
+        else:
+            years[i] = np.nan_to_num(season_age(player.birth_date, season) - DEBUT_AGE)
+    return np.maximum(years, 0)
+
+
+def contract_tiers(service: np.ndarray) -> np.ndarray:
+    """Return the service-time tier per player: 0 pre-arbitration, 1 arbitration, 2 free agent."""
+    return (service >= ARBITRATION_YEARS).astype(np.int64) + (service >= FREE_AGENCY_YEARS)
+
+
+def expected_salary(war: np.ndarray, service: np.ndarray, season: int) -> np.ndarray:
+    """
+    Estimate salaries from WAR and service time.
+
+    Pre-arbitration players earn the league minimum, arbitration salaries
+    scale with WAR and seniority, and free agents are paid by WAR tier.
+
+    Args:
+        war: WAR per player
+        service: Service years per player
+        season: Season year
+
+    Returns:
+        Salaries in dollars
+    """
+    war = np.asarray(war, dtype=np.float64)
+    minimum = league_minimum(season)
+    tier = contract_tiers(service)
+
+    seniority = (service - (ARBITRATION_YEARS - 1)) / (FREE_AGENCY_YEARS - ARBITRATION_YEARS)
+    arbitration = minimum + seniority * np.maximum(war, 0) * ARBITRATION_DOLLARS_PER_WAR
+
+    thresholds = np.array([t for t, _ in FREE_AGENT_TIERS[1:]])
+    salaries = np.array([s for _, s in FREE_AGENT_TIERS], dtype=np.float64)
+    free_agent = salaries[np.searchsorted(thresholds, war, side="right")]
+    free_agent *= dollars_per_war(season) / DOLLARS_PER_WAR[2023]
+
+    salary = np.select([tier == 0, tier == 1], [minimum, arbitration], free_agent)
+    return np.maximum(salary, minimum)
+
+
+def valuation_features(season: int, index: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Build the salary-model feature matrix of a season from the feature store.
+
+    Args:
+        season: Season year
+        index: Feature matrix rows (defaults to every player of the season)
+
+    Returns:
+        (players, features) float64 matrix in VALUATION_FEATURES order; missing stats are 0
+    """
+    from app.services.stats_service import feature_store
+
+    return np.nan_to_num(feature_store.matrix(season).raw_columns(VALUATION_FEATURES, index))
+
+
+def _salary_model() -> Optional[Any]:
+    """Return the active trained salary model, or None if none has been trained."""
+    from app.services.prediction_service import model_registry
+
+    try:
+        return model_registry.active("valuation")
+    except KeyError:
+        return None
+
+
+def value_league(season: int) -> Dict[str, Any]:
+    """
+    Value every player with stats in a season in one pass.
+
+    Salaries come from the active trained "valuation" model when one exists,
+    otherwise from the service-time tiers. Results are cached until the stats
+    table or either active model changes.
+
+    Args:
+        season: Season year
+
+    Returns:
+        Dictionary of per-player arrays (player_id, war, salary, market_value,
+        projected_war, projected_market_value, ...) and an index by player ID
+    """
+    from app.services.stats_service import season_stats, feature_store
+    from app.services.prediction_service import model_registry, predict_players_performance
+
+    model_version = model_registry.active("performance").version
+    salary_model = _salary_model()
+    key = (season, season_stats.version, model_version, salary_model.version if salary_model else None)
+    valuation = _valuation_cache.get(key)
+    if valuation is not None:
+        return valuation
+
+    matrix = feature_store.matrix(season)
+    player_id = matrix.player_id.astype(np.int64)
+    war, service = np.nan_to_num(matrix.raw_columns(["war", "service_years"])).T
+    tier = contract_tiers(service)
+    salary = expected_salary(war, service, season)
+    if salary_model is not None and len(player_id):
+        # A trained model replaces the tier formula for current salaries
+        predicted = salary_model.predict(valuation_features(season), rows=len(player_id)) * SALARY_UNIT
+        salary = np.maximum(np.asarray(predicted, dtype=np.float64), league_minimum(season))
+    value = market_value(war, season)
+
+    predictions = predict_players_performance(player_id.tolist(), season + 1, include_uncertainty=False)
+    projected_war = np.array([p["war"]["mean"] if p else np.nan for p in predictions], dtype=np.float64)
+    projected_value = market_value(np.nan_to_num(projected_war), season + 1)
+    next_salary = expected_salary(np.nan_to_num(projected_war), service + 1, season + 1)
+
+    valuation = {
+        "season": season,
+        "player_id": player_id,
+        "war": war,
+        "service_years": service,
+        "tier": tier,
+        "salary": salary,
+        "market_value": value,
+        "dollars_per_war": np.divide(value, war, out=np.full(len(war), np.nan), where=war > 0),
+        "value_above_salary": value - salary,
+        "free_agent_year": np.where(tier < 2, season + np.ceil(FREE_AGENCY_YEARS - service), -1).astype(np.int64),
+        "projected_war": projected_war,
+        "projected_market_value": np.where(np.isnan(projected_war), np.nan, projected_value),
+        "surplus_value": np.where(np.isnan(projected_war), np.nan, projected_value - next_salary),
+        "index": {pid: i for i, pid in enumerate(player_id.tolist())},
+    }
+
+    # Older versions of the season are never read again
+    with _valuation_lock:
+        for stale in [k for k in _valuation_cache if k[0] == season]:
+            del _valuation_cache[stale]
+        _valuation_cache[key] = valuation
+    return valuation
+
+
+def get_player_valuation(player_id: int, season: Optional[int] = None) -> Optional[PlayerValuation]:
+    """
+    Retrieve valuation metrics for a player.
+
+    Args:
+        player_id: The player's ID
+        season: The season year (defaults to the player's most recent season)
+
+    Returns:
+        PlayerValuation object if found, None otherwise
+    """
+    from app.services.stats_service import season_stats
+
+    seasons = season_stats.seasons_for(player_id)
+    if season is None:
+        if not seasons:
+            return None
+        season = seasons[-1]
+
+    valuation = value_league(season)
+    i = valuation["index"].get(player_id)
+    if i is None:
+        return None
+
+    def optional(name: str) -> Optional[float]:
+        value = float(valuation[name][i])
+        return None if np.isnan(value) else round(value, 1 if name == "projected_war" else 0)
+
+    free_agent_year = int(valuation["free_agent_year"][i])
+    return PlayerValuation(
+        player_id=player_id,
+        season=season,
+        salary=round(float(valuation["salary"][i])),
+        market_value=round(float(valuation["market_value"][i])),
+        war=round(float(valuation["war"][i]), 1),
+        dollars_per_war=optional("dollars_per_war") or 0.0,
+        value_above_salary=round(float(valuation["value_above_salary"][i])),
+        contract_status=CONTRACT_STATUSES[int(valuation["tier"][i])],
+        free_agent_year=free_agent_year if free_agent_year > 0 else None,
+        zips_projected_war=None,
+        steamer_projected_war=None,
+        projected_market_value=optional("projected_market_value"),
+        surplus_value=optional("surplus_value"),
+    )
+
+
+def get_player_valuations(season: int, player_ids: Optional[List[int]] = None) -> List[PlayerValuation]:
+    """
+    Retrieve valuations for many players from one league-wide pass.
+
+    Args:
+        season: Season year
+        player_ids: Players to return (defaults to everyone with stats in the season)
+
+    Returns:
+        List of PlayerValuation objects for the players found
+    """
+    valuation = value_league(season)
+    ids = valuation["player_id"].tolist() if player_ids is None else player_ids
+    found = [get_player_valuation(pid, season) for pid in ids if pid in valuation["index"]]
+    return [v for v in found if v is not None]
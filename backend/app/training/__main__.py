@@ -0,0 +1,28 @@
+import argparse
+from pathlib import Path
+
+from app.training.valuation import PARAM_GRIDS, train
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.training",
+        description="Train the player valuation (salary) model and save it to the model directory",
+    )
+    parser.add_argument("--seasons", type=int, nargs="*", help="Seasons to train on (default: all)")
+    parser.add_argument("--salaries", type=Path, help="CSV of player_id,season,salary labels")
+    parser.add_argument("--models", nargs="*", choices=list(PARAM_GRIDS), help="Candidates to try (default: all installed)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--activate", action="store_true", help="Make the trained version active")
+    args = parser.parse_args()
+
+    report = train(args.seasons, args.salaries, args.models, args.workers, args.activate)
+    best = report["best"]
+    print(f"Trained {report['name']} {report['version']} on {report['dataset']['rows']} rows "
+          f"(feature cache {'hit' if report['dataset']['cache_hit'] else 'miss'})")
+    print(f"Best: {best['model']} {best['params']}  R2={best['r2']}  RMSE=${best['rmse']:,.0f}")
+    print(report["timing_report"])
+
+
+if __name__ == "__main__":
+    main()
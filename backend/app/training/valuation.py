@@ -0,0 +1,338 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import product
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+import csv
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import joblib
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, Ridge
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.services.model_registry import MODEL_DIR, ModelRegistry
+from app.services.valuation_service import (
+    SALARY_UNIT,
+    VALUATION_FEATURES,
+    expected_salary,
+    valuation_features,
+)
+
+try:
+    from lightgbm import LGBMRegressor
+except ImportError:
+    LGBMRegressor = None
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+# Registry name the trained salary model is saved under
+MODEL_NAME = "valuation"
+
+# Cached feature matrices, keyed by a fingerprint of their inputs
+CACHE_DIR = Path(os.environ.get("MLB_TRAINING_CACHE", MODEL_DIR.parent / "training_cache"))
+
+# Cross-validation folds and split seed
+CV_FOLDS = 5
+CV_SEED = 42
+
+# Candidate estimators and their hyperparameter grids (the valuation notebook's models)
+PARAM_GRIDS: Dict[str, Dict[str, List[Any]]] = {
+    "ridge": {"alpha": [0.1, 1.0, 10.0, 100.0]},
+    "lasso": {"alpha": [0.001, 0.01, 0.1, 1.0]},
+    "random_forest": {"n_estimators": [100, 300], "max_depth": [None, 8]},
+    "gradient_boosting": {
+        "n_estimators": [50, 100, 200],
+        "learning_rate": [0.05, 0.1, 0.2],
+        "max_depth": [3, 5, 7],
+    },
+    "lightgbm": {"n_estimators": [100, 300], "learning_rate": [0.05, 0.1], "num_leaves": [15, 31]},
+    "xgboost": {"n_estimators": [100, 300], "learning_rate": [0.05, 0.1], "max_depth": [3, 6]},
+}
+
+# Candidates that take a thread count
+THREADED = {"random_forest", "lightgbm", "xgboost"}
+
+
+def make_estimator(name: str, params: Dict[str, Any], threads: int = 1) -> Pipeline:
+    """
+    Build a scaled pipeline for a candidate model.
+
+    Args:
+        name: Candidate name (a PARAM_GRIDS key)
+        params: Hyperparameters
+        threads: Threads for estimators that support them
+
+    Returns:
+        Unfitted sklearn Pipeline
+    """
+    extra = {"n_jobs": threads} if name in THREADED else {}
+    if name == "ridge":
+        model = Ridge(**params)
+    elif name == "lasso":
+        model = Lasso(max_iter=10000, **params)
+    elif name == "random_forest":
+        model = RandomForestRegressor(random_state=CV_SEED, **params, **extra)
+    elif name == "gradient_boosting":
+        model = GradientBoostingRegressor(random_state=CV_SEED, **params)
+    elif name == "lightgbm":
+        model = LGBMRegressor(random_state=CV_SEED, verbose=-1, **params, **extra)
+    elif name == "xgboost":
+        model = XGBRegressor(random_state=CV_SEED, **params, **extra)
+    else:
+        raise ValueError(f"Unknown candidate {name}")
+    return Pipeline([("scaler", StandardScaler()), ("model", model)])
+
+
+def available_candidates() -> List[str]:
+    """Return the candidates whose libraries are installed."""
+    missing = {"lightgbm": LGBMRegressor is None, "xgboost": XGBRegressor is None}
+    return [name for name in PARAM_GRIDS if not missing.get(name, False)]
+
+
+def grid_points(candidates: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Expand each candidate's grid into (name, params) points."""
+    points = []
+    for name in candidates:
+        grid = PARAM_GRIDS[name]
+        for values in product(*grid.values()):
+            points.append((name, dict(zip(grid.keys(), values))))
+    return points
+
+
+class StageTimer:
+    """Wall-clock timings of named pipeline stages."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(time.perf_counter() - start, 3)
+
+    def report(self) -> str:
+        width = max((len(name) for name in self.stages), default=0)
+        lines = [f"{name:<{width}}  {seconds:9.3f}s" for name, seconds in self.stages.items()]
+        lines.append(f"{'total':<{width}}  {sum(self.stages.values()):9.3f}s")
+        return "\n".join(lines)
+
+
+def _load_salaries(path: Path) -> Dict[Tuple[int, int], float]:
+    """Read (player_id, season) -> salary from a CSV with those three columns."""
+    with open(path, newline="") as f:
+        return {
+            (int(row["player_id"]), int(row["season"])): float(row["salary"])
+            for row in csv.DictReader(f)
+        }
+
+
+def build_dataset(
+    seasons: Optional[List[int]] = None,
+    salaries_path: Optional[Path] = None,
+) -> Tuple[Path, Dict[str, Any]]:
+    """
+    Build (or reuse) the cached training matrix.
+
+    The cache file is named after a hash of the feature store inputs, so it
+    is reused until the features, the seasons or the salary file change.
+
+    Args:
+        seasons: Seasons to train on (defaults to every season in the stats table)
+        salaries_path: CSV of player_id, season, salary labels; without one the
+            service-time tier salaries are used as labels
+
+    Returns:
+        (path of the .npz cache file, dataset description)
+    """
+    from app.services.stats_service import season_stats, feature_store
+
+    n = season_stats.n_rows
+    seasons = sorted(set(season_stats.season[:n].tolist())) if not seasons else sorted(seasons)
+    salaries = _load_salaries(salaries_path) if salaries_path else None
+
+    # Inputs come from the shared feature store, so hashing them covers stats and player changes
+    matrices = [feature_store.matrix(s) for s in seasons]
+    X = np.concatenate([valuation_features(m.season) for m in matrices]) if matrices else np.zeros((0, len(VALUATION_FEATURES)))
+    player_id = np.concatenate([m.player_id for m in matrices]).astype(np.int64) if matrices else np.zeros(0, dtype=np.int64)
+    season = np.concatenate([np.full(len(m), m.season, dtype=np.int64) for m in matrices]) if matrices else np.zeros(0, dtype=np.int64)
+
+    digest = hashlib.sha1()
+    digest.update(json.dumps([VALUATION_FEATURES, seasons]).encode())
+    digest.update(player_id.tobytes())
+    digest.update(X.tobytes())
+    if salaries_path:
+        digest.update(Path(salaries_path).read_bytes())
+    path = CACHE_DIR / f"valuation-{digest.hexdigest()[:16]}.npz"
+    description = {
+        "seasons": seasons,
+        "features": VALUATION_FEATURES,
+        "labels": "salaries file" if salaries_path else "service-time tier model",
+        "cache_file": str(path),
+    }
+    if path.is_file():
+        description["cache_hit"] = True
+        return path, description
+
+    if salaries is not None:
+        y = np.array([salaries.get((p, s), np.nan) for p, s in zip(player_id.tolist(), season.tolist())])
+    else:
+        war_column = VALUATION_FEATURES.index("war")
+        service_column = VALUATION_FEATURES.index("service_years")
+        y = np.empty(len(season))
+        for year in np.unique(season).tolist():
+            in_year = season == year
+            y[in_year] = expected_salary(X[in_year, war_column], X[in_year, service_column], year)
+    labelled = np.isfinite(y)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    scratch = path.with_suffix(".tmp.npz")
+    np.savez(scratch, X=X[labelled], y=y[labelled] / SALARY_UNIT, player_id=player_id[labelled], season=season[labelled])
+    os.replace(scratch, path)
+    description["cache_hit"] = False
+    return path, description
+
+
+# Training matrix of a worker process, mapped once per process
+_worker_data: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(path: str) -> None:
+    data = np.load(path, mmap_mode="r")
+    _worker_data.update(X=np.asarray(data["X"]), y=np.asarray(data["y"]))
+
+
+def _score_fold(task: Tuple[str, Dict[str, Any], np.ndarray, np.ndarray, int]) -> Tuple[float, float]:
+    """Process-pool task: fit one grid point on one fold and score it."""
+    name, params, train, test, threads = task
+    X, y = _worker_data["X"], _worker_data["y"]
+    estimator = make_estimator(name, params, threads).fit(X[train], y[train])
+    predicted = estimator.predict(X[test])
+    return float(r2_score(y[test], predicted)), float(np.sqrt(mean_squared_error(y[test], predicted)))
+
+
+def cross_validate(
+    path: Path,
+    candidates: List[str],
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """
+    Score every grid point of every candidate with k-fold cross-validation.
+
+    All (grid point, fold) fits run as independent tasks on a process pool;
+    threaded estimators split the remaining cores.
+
+    Args:
+        path: Cached training matrix
+        candidates: Candidate names
+        workers: Worker processes
+
+    Returns:
+        One result per grid point (name, params, mean R², RMSE in dollars),
+        best first
+    """
+    data = np.load(path)
+    n = len(data["y"])
+    folds = min(CV_FOLDS, n)
+    if folds < 2:
+        raise ValueError(f"Need at least 2 labelled rows to cross-validate, found {n}")
+    splits = list(KFold(folds, shuffle=True, random_state=CV_SEED).split(np.arange(n)))
+    points = grid_points(candidates)
+    threads = max(1, (os.cpu_count() or 1) // max(workers, 1))
+    tasks = [(name, params, train, test, threads) for name, params in points for train, test in splits]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(path),)) as pool:
+            scores = list(pool.map(_score_fold, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        _init_worker(str(path))
+        scores = [_score_fold(task) for task in tasks]
+
+    results = []
+    for p, (name, params) in enumerate(points):
+        fold_scores = scores[p * folds : (p + 1) * folds]
+        results.append({
+            "model": name,
+            "params": params,
+            "r2": round(float(np.mean([r2 for r2, _ in fold_scores])), 4),
+            "rmse": round(float(np.mean([rmse for _, rmse in fold_scores])) * SALARY_UNIT, 0),
+        })
+    results.sort(key=lambda r: -r["r2"])
+    return results
+
+
+def train(
+    seasons: Optional[List[int]] = None,
+    salaries_path: Optional[Path] = None,
+    candidates: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    activate: bool = False,
+    registry: Optional[ModelRegistry] = None,
+) -> Dict[str, Any]:
+    """
+    Run the full training pipeline and save the winning model.
+
+    Stages: build (or load) the cached feature matrix, cross-validate every
+    grid point in parallel, refit the best on all rows, and write it to
+    <model dir>/valuation/<version>/model.joblib with a training report.
+
+    Args:
+        seasons: Seasons to train on
+        salaries_path: CSV of salary labels
+        candidates: Candidates to try (defaults to every installed one)
+        workers: Worker processes (defaults to the CPU count)
+        activate: Make the new version the active one
+        registry: Model registry to save into
+
+    Returns:
+        Training report
+    """
+    registry = registry or ModelRegistry()
+    workers = workers or os.cpu_count() or 1
+    candidates = candidates or available_candidates()
+    timer = StageTimer()
+
+    with timer.stage("features"):
+        path, dataset = build_dataset(seasons, salaries_path)
+    with timer.stage("cross_validation"):
+        results = cross_validate(path, candidates, workers)
+    best = results[0]
+    with timer.stage("refit"):
+        data = np.load(path)
+        threads = os.cpu_count() or 1
+        model = make_estimator(best["model"], best["params"], threads).fit(data["X"], data["y"])
+
+    version = time.strftime("%Y%m%d%H%M%S")
+    report = {
+        "name": MODEL_NAME,
+        "version": version,
+        "dataset": {**dataset, "rows": int(len(data["y"]))},
+        "workers": workers,
+        "best": best,
+        "results": results,
+        "target_unit": SALARY_UNIT,
+    }
+    with timer.stage("save"):
+        directory = registry.model_dir / MODEL_NAME / version
+        directory.mkdir(parents=True, exist_ok=True)
+        joblib.dump(model, directory / "model.joblib")
+        if activate:
+            registry.activate(MODEL_NAME, version)
+    report["timings"] = timer.stages
+    with open(directory / "training_report.json", "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    report["timing_report"] = timer.report()
+    return report
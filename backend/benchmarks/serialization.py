@@ -0,0 +1,137 @@
+"""
+Per-request serialization cost of the API's heavy responses, before and after
+the fast response path.
+
+    cd backend
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --players 5000 --repeat 50
+
+"before" is the previous request path: the service builds a validated model,
+then FastAPI validates it against the route's response_model and serializes
+it, and routes without a response_model go through jsonable_encoder and
+json.dumps. "after" is the current path: precompiled serializers for the list
+responses, model_construct for Statcast pitch rows, orjson for plain dicts, and
+the leaderboard and performance prediction validated once, in the service, then
+dumped without the route's second validation (both timed from the service's fields).
+"""
+from typing import Any, Callable, List, Tuple
+import argparse
+import json
+import time
+import warnings
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+
+
+def _route(router: Any, path: str, method: str = "GET") -> APIRoute:
+    for route in router.routes:
+        if isinstance(route, APIRoute) and route.path == path and method in route.methods:
+            return route
+    raise KeyError(path)
+
+
+def _fastapi_path(router: Any, path: str) -> Callable[[Any], bytes]:
+    """What FastAPI does with a route's return value: validate, then dump_json."""
+    field = _route(router, path).response_field
+
+    def respond(content: Any) -> bytes:
+        value, _ = field.validate(content, {}, loc=("response",))
+        return field.serialize_json(value, by_alias=True)
+    return respond
+
+
+def _json_dumps(content: Any) -> bytes:
+    """What a JSONResponse renders for a route without a response_model."""
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    """Median wall time of fn in milliseconds."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def workloads(players: int) -> List[Tuple[str, Callable[[], bytes], Callable[[], bytes]]]:
+    """Return (name, before, after) request paths for each benchmarked response."""
+    from app.api.endpoints import players as player_routes, teams, statistics, predictions as prediction_routes
+    from app.api.endpoints.predictions import _ndjson_lines
+    from app.api.responses import PLAYER_LIST, TEAM_ROSTER, PERFORMANCE_PREDICTION, serializer, dumps
+    from app.models.prediction import PerformancePrediction
+    from app.models.statistics import StatcastMetrics, StatisticalLeaders
+    from app.services.player_service import players_db
+    from app.services.team_service import get_team_roster
+    from app.services.stats_service import get_statcast_metrics, get_statistical_leaders
+    from app.services.prediction_service import predict_players_performance, predict_player_performance, get_season_odds
+
+    stored = list(players_db.values())
+    player_list = [stored[i % len(stored)].model_copy(update={"id": i + 1}) for i in range(players)]
+    roster = get_team_roster("NYY", 2024)
+    leaders = get_statistical_leaders(2024, "HR", 50).model_dump()
+    performance = predict_player_performance(stored[0].id, 2025).model_dump(exclude_unset=True)
+    statcast = dict(get_statcast_metrics(season=2024, metric_type="pitching"))
+    odds = get_season_odds(2024, 1000)
+    player_ids = [player.id for player in stored] * max(players // len(stored), 1)
+    predictions = predict_players_performance(player_ids, 2025)
+
+    players_route = _fastapi_path(player_routes.router, "/")
+    roster_route = _fastapi_path(teams.router, "/{team_id}/roster")
+    leaders_route = _fastapi_path(statistics.router, "/leaders")
+    performance_route = _fastapi_path(prediction_routes.router, "/player/{player_id}/performance")
+    statcast_route = _fastapi_path(statistics.router, "/statcast")
+
+    def ndjson_before() -> bytes:
+        lines = [json.dumps(p, separators=(",", ":")) for p in predictions]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    return [
+        (f"List[Player] ({players})",
+         lambda: players_route(player_list),
+         lambda: PLAYER_LIST.dump_json(player_list)),
+        (f"TeamRoster ({len(roster.players)} players)",
+         lambda: roster_route(roster),
+         lambda: TEAM_ROSTER.dump_json(roster)),
+        (f"StatisticalLeaders ({len(leaders['leaders'])})",
+         lambda: leaders_route(StatisticalLeaders(**leaders)),
+         lambda: serializer(StatisticalLeaders).dump_json(StatisticalLeaders(**leaders))),
+        ("PerformancePrediction",
+         lambda: performance_route(PerformancePrediction(**performance)),
+         lambda: PERFORMANCE_PREDICTION.dump_json(PerformancePrediction(**performance))),
+        (f"StatcastMetrics ({len(statcast['metrics'])} pitches)",
+         lambda: statcast_route(StatcastMetrics(**statcast)),
+         lambda: serializer(StatcastMetrics).dump_json(StatcastMetrics.model_construct(**statcast))),
+        ("season odds (dict)",
+         lambda: _json_dumps(odds),
+         lambda: dumps(odds)),
+        (f"batch predictions ({len(predictions)} lines)",
+         ndjson_before,
+         lambda: b"".join(_ndjson_lines(player_ids, predictions))),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.serialization",
+        description="Compare per-request serialization cost before and after the fast response path",
+    )
+    parser.add_argument("--players", type=int, default=1000, help="Players in the list and batch responses")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per path (median reported)")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    print(f"{'response':<36}{'before ms':>11}{'after ms':>11}{'speedup':>9}")
+    for name, before, after in workloads(args.players):
+        if before() != after():
+            print(f"{name}: before and after bodies differ")
+        slow, fast = _time(before, args.repeat), _time(after, args.repeat)
+        print(f"{name:<36}{slow:>11.3f}{fast:>11.3f}{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from app.services.name_index import NameSearchIndex
+
+
+def _index() -> NameSearchIndex:
+    index = NameSearchIndex()
+    for player_id, name in enumerate(["Mike Trout", "Shohei Ohtani", "Aaron Judge", "Mookie Betts", "Juan Soto"], start=1):
+        index.add(player_id, name)
+    return index
+
+
+def _top(index: NameSearchIndex, query: str) -> int:
+    results = index.search(query, 5)
+    assert results, f"no match for {query!r}"
+    return results[0][0]
+
+
+def test_one_character_substitution():
+    index = _index()
+    assert _top(index, "Ohtami") == 2
+    assert _top(index, "Trost") == 1
+    assert _top(index, "mike trost") == 1
+
+
+def test_transposition():
+    index = _index()
+    assert _top(index, "Ohtain") == 2
+    assert _top(index, "Trotu") == 1
+    assert _top(index, "aaron jduge") == 3
+
+
+def test_dropped_character():
+    assert _top(_index(), "trot") == 1
+
+
+def test_unrelated_query_has_no_match():
+    assert _index().search("xyz", 5) == []
+
+
+def test_removed_name_is_not_matched():
+    index = _index()
+    index.remove(1)
+    assert all(player_id != 1 for player_id, _, _ in index.search("trot", 5))